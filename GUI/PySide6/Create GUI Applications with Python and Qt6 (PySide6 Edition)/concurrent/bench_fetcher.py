@@ -0,0 +1,215 @@
+"""
+Fetch 10,000 pages from a local stand-in HTTP server, with the original
+per-URL Worker (requests.get + regexes on a QThreadPool thread) and with
+the Fetcher (asyncio, keep-alive pool, streaming parser), checking the
+title, h1 and h2 extracted from every page.
+
+The server runs in its own process. Pages are a mix of Content-Length
+and chunked responses, and every FAIL_EVERY'th page fails with a 503 the
+first time it is requested, to exercise the Fetcher's retries (the
+original Worker has none, so it parses the error page instead).
+"""
+import json
+import multiprocessing
+import re
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from PySide6.QtCore import (
+    QCoreApplication,
+    QObject,
+    QRunnable,
+    QThreadPool,
+    Signal,
+    Slot,
+)
+
+from fetcher import Fetcher
+
+N_PAGES = 10_000
+FAIL_EVERY = 500
+PADDING = "<p>Lorem ipsum dolor sit amet, consectetur adipiscing.</p>\n" * 80
+
+
+def page(n):
+    return (
+        "<!DOCTYPE html>\n<html><head><meta charset='utf-8'>"
+        "<title>Page {n}</title></head>\n<body>\n{padding}"
+        "<h1 class='big'>Heading {n}</h1>\n{padding}"
+        "<h2>Subheading {n}</h2>\n{padding}</body></html>\n"
+    ).format(n=n, padding=PADDING)
+
+
+def expected(n):
+    return {
+        "title": "Page %d" % n,
+        "h1": "Heading %d" % n,
+        "h2": "Subheading %d" % n,
+    }
+
+
+class Server(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # Clients closing keep-alive connections is expected.
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive.
+    # As real servers do; otherwise small writes on a kept-alive
+    # connection wait on the client's delayed ACK.
+    disable_nagle_algorithm = True
+    stats = {"connections": 0, "requests": 0}
+    failed = set()
+
+    def setup(self):
+        super().setup()
+        self.stats["connections"] += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.stats["requests"] += 1
+        if self.path == "/stats":
+            self.send_body(json.dumps(self.stats).encode())
+            return
+
+        n = int(self.path.rsplit("/", 1)[1])
+        if n % FAIL_EVERY == 0 and n not in self.failed:
+            self.failed.add(n)
+            self.send_body(b"<title>Unavailable</title>", status=503)
+            return
+
+        body = page(n).encode("utf8")
+        if n % 2:
+            self.send_body(body)
+        else:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for i in range(0, len(body), 4096):
+                chunk = body[i : i + 4096]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+
+    def send_body(self, body, status=200):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(port):
+    Server(("127.0.0.1", port), Handler).serve_forever()
+
+
+class WorkerSignals(QObject):
+    data = Signal(tuple)
+
+
+class Worker(QRunnable):
+    """
+    The original Worker, from qrunnable_io_parser.py.
+    """
+
+    def __init__(self, id, url, parsers):
+        super().__init__()
+        self.id = id
+        self.url = url
+        self.parsers = parsers
+
+        self.signals = WorkerSignals()
+
+    @Slot()
+    def run(self):
+        r = requests.get(self.url)
+
+        data = {}
+        for name, parser in self.parsers.items():
+            m = parser.search(r.text)
+            if m:
+                data[name] = m.group(1).strip()
+
+        self.signals.data.emit((self.id, data))
+
+
+parsers = {
+    "title": re.compile(r"<title.*?>(.*?)<\/title>", re.M | re.S),
+    "h1": re.compile(r"<h1.*?>(.*?)<\/h1>", re.M | re.S),
+    "h2": re.compile(r"<h2.*?>(.*?)<\/h2>", re.M | re.S),
+}
+
+
+def run(app, base, start_all):
+    results = {}
+
+    def receive(data):
+        id, result = data
+        results[id] = result
+        if len(results) == N_PAGES:
+            app.quit()
+
+    connections = requests.get(base + "/stats").json()["connections"]
+    start = time.perf_counter()
+    start_all(receive)
+    app.exec()
+    elapsed = time.perf_counter() - start
+    connections = requests.get(base + "/stats").json()["connections"] - (
+        connections + 1
+    )
+
+    correct = sum(1 for n, r in results.items() if r == expected(n))
+    return elapsed, correct, connections
+
+
+if __name__ == "__main__":
+    port = 8765
+    base = "http://127.0.0.1:%d" % port
+    server = multiprocessing.get_context("spawn").Process(
+        target=serve, args=(port,), daemon=True
+    )
+    server.start()
+    for _ in range(50):
+        try:
+            requests.get(base + "/stats")
+            break
+        except requests.ConnectionError:
+            time.sleep(0.1)
+
+    app = QCoreApplication(sys.argv)
+
+    def start_workers(receive):
+        threadpool = QThreadPool.globalInstance()
+        for n in range(N_PAGES):
+            worker = Worker(n, "%s/page/%d" % (base, n), parsers)
+            worker.signals.data.connect(receive)
+            threadpool.start(worker)
+
+    fetcher = Fetcher(limit_per_host=8, timeout=10, retries=2, backoff=0.1)
+    signals = WorkerSignals()
+
+    def start_fetcher(receive):
+        signals.data.connect(receive)
+        # Different pages, so they fail the first time too.
+        for n in range(N_PAGES, 2 * N_PAGES):
+            fetcher.fetch(n, "%s/page/%d" % (base, n), signals)
+
+    print("%d pages, %d bytes each" % (N_PAGES, len(page(0))))
+    for name, start_all in [
+        ("Worker (requests)", start_workers),
+        ("Fetcher (asyncio)", start_fetcher),
+    ]:
+        elapsed, correct, connections = run(app, base, start_all)
+        print(
+            "%-18s %.2fs  %.0f pages/s  %d correct  %d connections"
+            % (name, elapsed, N_PAGES / elapsed, correct, connections)
+        )
+
+    fetcher.close()
+    server.terminate()
@@ -0,0 +1,118 @@
+"""
+Measure CPU use while 32 workers are paused, and how long a kill takes
+to be acknowledged, comparing the original spin-wait pause (from
+qrunner_pause.py) with JobControl.
+
+CPU use is the process CPU time over a wall-clock interval, while every
+worker is paused. With the spin-wait this is close to 100% of a core
+(or more); with JobControl it should be close to 0%.
+"""
+import statistics
+import time
+
+from PySide6.QtCore import QRunnable, QThreadPool, Slot
+
+from jobcontrol import JobControl, WorkerKilledException
+
+N_WORKERS = 32
+MEASURE = 2  # seconds
+
+
+class SpinRunner(QRunnable):
+    """
+    The original JobRunner pause and kill.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.is_paused = False
+        self.is_killed = False
+        self.kill_requested_at = None
+        self.kill_latency = None
+
+    @Slot()
+    def run(self):
+        try:
+            for n in range(1000):
+                time.sleep(0.01)
+
+                while self.is_paused:
+                    time.sleep(0)
+
+                if self.is_killed:
+                    raise WorkerKilledException
+
+        except WorkerKilledException:
+            self.kill_latency = time.perf_counter() - self.kill_requested_at
+
+    def pause(self):
+        self.is_paused = True
+
+    def kill(self):
+        self.kill_requested_at = time.perf_counter()
+        self.is_killed = True
+        # The original never leaves the pause loop once killed, so unpause.
+        self.is_paused = False
+
+
+class ControlRunner(QRunnable):
+    def __init__(self):
+        super().__init__()
+        self.control = JobControl()
+
+    @Slot()
+    def run(self):
+        with self.control:
+            for n in range(1000):
+                self.control.sleep(0.01)
+
+    def pause(self):
+        self.control.pause()
+
+    def kill(self):
+        self.control.kill()
+
+    @property
+    def kill_latency(self):
+        return self.control.kill_latency
+
+
+def run_benchmark(runner_class):
+    threadpool = QThreadPool()
+    threadpool.setMaxThreadCount(N_WORKERS)
+
+    runners = [runner_class() for _ in range(N_WORKERS)]
+    for runner in runners:
+        runner.setAutoDelete(False)
+        threadpool.start(runner)
+
+    # Let them all start, then pause.
+    time.sleep(0.5)
+    for runner in runners:
+        runner.pause()
+    time.sleep(0.1)
+
+    start_cpu = time.process_time()
+    start_wall = time.perf_counter()
+    time.sleep(MEASURE)
+    cpu = time.process_time() - start_cpu
+    wall = time.perf_counter() - start_wall
+
+    for runner in runners:
+        runner.kill()
+    threadpool.waitForDone()
+
+    latencies = [r.kill_latency * 1000 for r in runners]
+    return 100 * cpu / wall, latencies
+
+
+print("%d workers paused for %d seconds" % (N_WORKERS, MEASURE))
+for name, runner_class in [
+    ("spin-wait", SpinRunner),
+    ("JobControl", ControlRunner),
+]:
+    cpu, latencies = run_benchmark(runner_class)
+    print(
+        "%-10s CPU %6.1f%%  kill latency median %.2f ms, max %.2f ms"
+        % (name, cpu, statistics.median(latencies), max(latencies))
+    )
@@ -0,0 +1,49 @@
+"""
+Cost of recording 100,000 jobs in a JobStore: the time spent in
+submit() and complete() on the calling (GUI) thread, the time until
+everything has been written and compacted, and the time to open the
+store again (loading the results and unfinished jobs).
+
+One in ten jobs is left unfinished, as if the app had exited.
+"""
+import os
+import tempfile
+import time
+
+from jobstore import JobStore, job_key
+
+N_JOBS = 100_000
+
+
+if __name__ == "__main__":
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+
+    start = time.perf_counter()
+    store = JobStore(path)
+    for n in range(N_JOBS):
+        job_id = "job-%d" % n
+        key = job_key([n, n + 1], {})
+        store.submit(job_id, key, {"args": [n, n + 1], "kwargs": {}})
+        if n % 10:
+            store.complete(job_id, key, [n / 3] * 10)
+    calls = time.perf_counter() - start
+
+    store.close()
+    written = time.perf_counter() - start
+
+    start = time.perf_counter()
+    store = JobStore(path)
+    loaded = time.perf_counter() - start
+    unfinished = len(store.unfinished())
+    cached = len(store.results)
+    store.close()
+
+    print("%d jobs" % N_JOBS)
+    print(
+        "GUI thread:  %.2fs  (%.1f us per job)" % (calls, 1e6 * calls / N_JOBS)
+    )
+    print("Written and compacted after %.2fs" % written)
+    print(
+        "Reopened in %.2fs: %d unfinished, %d results, %.1f MB"
+        % (loaded, unfinished, cached, os.path.getsize(path) / 1e6)
+    )
@@ -0,0 +1,155 @@
+"""
+Benchmark the job table model against the original layoutChanged model.
+
+A background thread plays the part of 1,000 workers, each reporting
+progress twice a second. We measure how much CPU time the GUI thread
+spends per second of wall time handling those updates and repainting
+the view.
+
+Run with QT_QPA_PLATFORM=offscreen to benchmark without a display.
+"""
+import random
+import sys
+import threading
+import time
+
+from PySide6.QtCore import (
+    QAbstractListModel,
+    QObject,
+    QRect,
+    Qt,
+    QTimer,
+    Signal,
+)
+from PySide6.QtGui import QBrush, QColor
+from PySide6.QtWidgets import QApplication, QListView, QStyledItemDelegate
+
+from jobtable import JobTableModel
+
+N_WORKERS = 1000
+TICKS_PER_SECOND = 2
+DURATION = 5  # seconds
+
+
+class LayoutChangedModel(QAbstractListModel):
+    """
+    The original WorkerManager model: layoutChanged on every update,
+    and the job list rebuilt on every call to data().
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._state = {}
+
+    def add_job(self, job_id, state):
+        self._state[job_id] = state
+        self.layoutChanged.emit()
+
+    def update_job(self, job_id, **values):
+        self._state[job_id].update(values)
+        self.layoutChanged.emit()
+
+    def data(self, index, role):
+        if role == Qt.DisplayRole:
+            job_ids = list(self._state.keys())
+            job_id = job_ids[index.row()]
+            return job_id, self._state[job_id]
+
+    def rowCount(self, index):
+        return len(self._state)
+
+
+class ProgressBarDelegate(QStyledItemDelegate):
+    def paint(self, painter, option, index):
+        job_id, data = index.model().data(index, Qt.DisplayRole)
+        rect = QRect(option.rect)
+        rect.setWidth(option.rect.width() * data["progress"] / 100)
+        painter.fillRect(rect, QBrush(QColor("#33a02c")))
+        painter.drawText(option.rect, Qt.AlignLeft, job_id)
+
+
+class SimulatedWorkers(QObject):
+    """
+    Emits progress for N_WORKERS jobs from a background thread, as the
+    QRunnable workers would.
+    """
+
+    progress = Signal(str, int)
+
+    def __init__(self, job_ids):
+        super().__init__()
+        self.job_ids = job_ids
+        self.running = False
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.thread.join()
+
+    def run(self):
+        interval = 1 / TICKS_PER_SECOND
+        progress = 0
+        while self.running:
+            t0 = time.perf_counter()
+            progress = (progress + 1) % 101
+            for job_id in self.job_ids:
+                self.progress.emit(job_id, progress)
+            time.sleep(max(0, interval - (time.perf_counter() - t0)))
+
+
+def run_benchmark(app, model):
+    view = QListView()
+    view.setModel(model)
+    view.setItemDelegate(ProgressBarDelegate())
+    view.resize(400, 800)
+    view.show()
+
+    job_ids = ["job-%04d" % n for n in range(N_WORKERS)]
+    for job_id in job_ids:
+        model.add_job(job_id, {"progress": random.randint(0, 100)})
+
+    workers = SimulatedWorkers(job_ids)
+    workers.progress.connect(
+        lambda job_id, progress: model.update_job(
+            job_id, progress=progress
+        )
+    )
+
+    # Drain anything left from setup before we start measuring.
+    app.processEvents()
+
+    start_cpu = time.thread_time()
+    start_wall = time.perf_counter()
+
+    workers.start()
+    QTimer.singleShot(DURATION * 1000, app.quit)
+    app.exec()
+    workers.stop()
+
+    cpu = time.thread_time() - start_cpu
+    wall = time.perf_counter() - start_wall
+
+    # Discard any updates still queued for the GUI thread.
+    workers.progress.disconnect()
+    app.processEvents()
+    view.close()
+
+    return cpu / wall
+
+
+app = QApplication(sys.argv)
+
+print(
+    "%d simulated workers, %d updates/second, %d seconds per run"
+    % (N_WORKERS, N_WORKERS * TICKS_PER_SECOND, DURATION)
+)
+for name, model in [
+    ("layoutChanged", LayoutChangedModel()),
+    ("JobTableModel", JobTableModel()),
+]:
+    busy = run_benchmark(app, model)
+    print("%-14s GUI thread busy %.3f s per second" % (name, busy))
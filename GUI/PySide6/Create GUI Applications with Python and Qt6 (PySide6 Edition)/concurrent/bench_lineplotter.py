@@ -0,0 +1,110 @@
+"""
+GUI thread time to plot 10 workers' data, 1,000 points each, as in
+qrunnable_calculator.py, delivered in ProgressBus-style batches (the
+points from every worker since the last tick, N_TICKS ticks):
+
+  per point    the old receive_data: append each point to Python lists
+               and setData the whole line, for every point.
+  LinePlotter  add() each worker's batch to its NumPy buffer, and one
+               setData per changed line each frame.
+
+The plot is drawn (grab()) once per tick either way, as Qt would only
+repaint once for all the setData calls before it. Then the same again
+with workers sending 10x as many points, to show LinePlotter's memory
+staying at its window while the lists keep growing.
+
+Run with QT_QPA_PLATFORM=offscreen to benchmark without a display.
+"""
+import sys
+import time
+
+import numpy as np
+from PySide6.QtWidgets import QApplication
+
+import pyqtgraph as pg
+
+from lineplotter import LinePlotter
+
+N_WORKERS = 10
+N_TICKS = 33  # ~1 second of a worker at 1 ms per point, at 30 fps.
+WINDOW = 1000
+
+
+def batches(n_points):
+    """
+    The bus data dicts, as the GUI thread would receive them.
+    """
+    rng = np.random.default_rng(0)
+    values = np.cumsum(rng.integers(-10, 10, (N_WORKERS, n_points)), 1)
+    edges = np.linspace(0, n_points, N_TICKS + 1).astype(int)
+    for start, end in zip(edges[:-1], edges[1:]):
+        yield {
+            worker_id: [
+                (worker_id, n, int(values[worker_id, n]))
+                for n in range(start, end)
+            ]
+            for worker_id in range(N_WORKERS)
+        }
+
+
+def per_point(widget, data):
+    x = {}
+    y = {}
+    lines = {}
+    calls = 0
+    for batch in data:
+        for points in batch.values():
+            for worker_id, px, py in points:
+                if worker_id not in lines:
+                    x[worker_id] = [px]
+                    y[worker_id] = [py]
+                    lines[worker_id] = widget.plot(
+                        x[worker_id], y[worker_id]
+                    )
+                    continue
+                x[worker_id].append(px)
+                y[worker_id].append(py)
+                lines[worker_id].setData(x[worker_id], y[worker_id])
+                calls += 1
+        widget.grab()
+    kept = sum(len(v) for v in x.values())
+    return calls, kept
+
+
+def plotter(widget, data):
+    plotter = LinePlotter(widget, window=WINDOW)
+    calls = 0
+    for batch in data:
+        for worker_id, points in batch.items():
+            _, px, py = zip(*points)
+            plotter.add(worker_id, px, py)
+        calls += len(plotter._changed)
+        plotter.flush()
+        widget.grab()
+    plotter.timer.stop()
+    kept = sum(len(s) for s in plotter.series.values())
+    return calls, kept
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+
+    for n_points in (1000, 10000):
+        print(
+            "%d workers x %d points, %d ticks"
+            % (N_WORKERS, n_points, N_TICKS)
+        )
+        data = list(batches(n_points))
+        methods = [("per point", per_point), ("LinePlotter", plotter)]
+        for name, fn in methods:
+            widget = pg.PlotWidget()
+            widget.resize(800, 500)
+            start = time.perf_counter()
+            calls, kept = fn(widget, data)
+            elapsed = time.perf_counter() - start
+            print(
+                "  %-12s %8.2fs  %6d setData  %6.1f ms per tick"
+                "  %7d points kept"
+                % (name, elapsed, calls, elapsed / N_TICKS * 1000, kept)
+            )
+            widget.deleteLater()
@@ -0,0 +1,199 @@
+"""
+Benchmark the streaming parser pipeline against the original parsers,
+on a synthetic 100 MB stderr stream read in arbitrary-sized chunks
+(as QProcess delivers it, with lines split across reads).
+
+The original per-chunk parsers are run over the whole stream, and we
+count the variables they return corrupted, from lines split across
+reads. The original time_to_percent_parser re-joins and re-scans all
+output on every line, so it is only run on the first STREAM_SMALL
+bytes.
+
+First, check_close() checks that output left without a trailing
+newline on both stdout and stderr is parsed per channel at close().
+"""
+import random
+import re
+import time
+
+from parsers import (
+    ParserPipeline,
+    PercentParser,
+    TimePercentParser,
+    VarsParser,
+)
+
+STREAM_SIZE = 100 * 1024 * 1024
+STREAM_SMALL = 256 * 1024
+CHUNK_MIN, CHUNK_MAX = 1024, 64 * 1024
+
+
+def make_stream(size):
+    random.seed(0)
+    lines = [b"Total time: 10:00:00\n"]
+    n = 0
+    total = 0
+    while total < size:
+        n += 1
+        kind = n % 4
+        if kind == 0:
+            line = b"Total complete: %d%%\n" % (n % 101)
+        elif kind == 1:
+            line = b"Elapsed time: %02d:%02d:%02d\n" % (
+                n // 3600 % 10,
+                n // 60 % 60,
+                n % 60,
+            )
+        elif kind == 2:
+            line = b"name%d=value%d\n" % (n, n)
+        else:
+            line = b"Some other output, line %d\n" % n
+        lines.append(line)
+        total += len(line)
+    return b"".join(lines)
+
+
+def chunks(stream):
+    pos = 0
+    while pos < len(stream):
+        size = random.randint(CHUNK_MIN, CHUNK_MAX)
+        yield stream[pos : pos + size]
+        pos += size
+
+
+# The original parsers, from qprocess_manager.py and
+# qrunnable_process_parser_elapsed.py.
+progress_re = re.compile(r"Total complete: (\d+)%", re.M)
+total_re = re.compile(r"Total time: (\d\d:\d\d:\d\d)")
+elapsed_re = re.compile(r"Elapsed time: (\d\d:\d\d:\d\d)")
+
+
+def simple_percent_parser(output):
+    m = progress_re.search(output)
+    if m:
+        return int(m.group(1))
+
+
+def extract_vars(output):
+    data = {}
+    for s in output.splitlines():
+        if "=" in s:
+            name, value = s.split("=", 1)
+            data[name] = value
+    return data
+
+
+def timestr_to_seconds(s):
+    hours, minutes, seconds = s.split(":")
+    return int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+
+
+def time_to_percent_parser(line):
+    total_time = None
+    elapsed_time = None
+    output = "".join(line)
+    m = total_re.findall(output)
+    if m:
+        total_time = timestr_to_seconds(m[0])
+    m = elapsed_re.findall(output)
+    if m:
+        elapsed_time = timestr_to_seconds(m[-1])
+    if total_time and elapsed_time:
+        return int(100 * elapsed_time / total_time)
+
+
+def count_vars(results):
+    # Returns (correct, corrupted) variables, outside of the timing.
+    good = bad = 0
+    for data in results:
+        for name, value in data.items():
+            if name.startswith("name") and name[4:] == value[5:]:
+                good += 1
+            else:
+                bad += 1
+    return good, bad
+
+
+def run_original(stream):
+    results = []
+    for chunk in chunks(stream):
+        # Decoded once per parser, as in JobManager.handle_output.
+        for parser in (simple_percent_parser, extract_vars):
+            output = chunk.decode("utf8", errors="replace")
+            result = parser(output)
+            if result and parser is extract_vars:
+                results.append(result)
+    return results
+
+
+def run_pipeline(stream):
+    pipeline = ParserPipeline(
+        [(PercentParser, "progress"), (VarsParser, "result")]
+    )
+    results = []
+    for chunk in chunks(stream):
+        for name, result in pipeline.feed(chunk, "stderr"):
+            if name == "result":
+                results.append(result)
+    return results
+
+
+def run_elapsed_original(stream):
+    result = []
+    value = None
+    for line in stream.decode("utf8").splitlines(keepends=True):
+        result.append(line)
+        value = time_to_percent_parser(result)
+    return value
+
+
+def run_elapsed_incremental(stream):
+    parser = TimePercentParser()
+    value = None
+    for line in stream.decode("utf8").splitlines(keepends=True):
+        value = parser.parse(line) or value
+    return value
+
+
+def check_close():
+    pipeline = ParserPipeline(
+        [(PercentParser, "progress"), (VarsParser, "result")]
+    )
+    assert pipeline.feed(b"x=5", "stdout") == []
+    assert pipeline.feed(b"Total complete: 100%", "stderr") == []
+    results = sorted(pipeline.close())
+    assert results == [("progress", 100), ("result", {"x": "5"})], results
+    print("Unterminated stdout and stderr parsed separately at close")
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+check_close()
+
+stream = make_stream(STREAM_SIZE)
+mb = len(stream) / 1024 / 1024
+expected_vars = stream.count(b"=")
+
+print("Stream %.0f MB" % mb)
+
+for name, fn in [("original", run_original), ("pipeline", run_pipeline)]:
+    t, results = timed(fn, stream)
+    good, bad = count_vars(results)
+    print(
+        "%-9s %.2fs  %.1f MB/s  %d of %d variables, %d corrupted"
+        % (name, t, mb / t, good, expected_vars, bad)
+    )
+
+small = stream[:STREAM_SMALL]
+small = small[: small.rfind(b"\n") + 1]
+mb_small = len(small) / 1024 / 1024
+print("Elapsed-time parser, first %.2f MB" % mb_small)
+t, v1 = timed(run_elapsed_original, small)
+print("original     %.2fs  %.2f MB/s" % (t, mb_small / t))
+t, v2 = timed(run_elapsed_incremental, small)
+print("incremental  %.2fs  %.2f MB/s" % (t, mb_small / t))
+assert v1 == v2
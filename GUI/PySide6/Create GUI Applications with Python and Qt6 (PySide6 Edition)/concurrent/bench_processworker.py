@@ -0,0 +1,136 @@
+"""
+Compare a CPU-bound callback run with the thread pool Worker (limited
+by the GIL) against the ProcessWorker (one process per core).
+
+The callback is a pure-Python numeric loop, like the one in
+qrunner_manager.py's Worker.run but without the sleeps. The speed-up
+you see depends on the number of cores available; on a single core
+the process pool can only add overhead.
+
+The script is guarded with `if __name__ == "__main__":` because the
+pool processes re-import it.
+"""
+import os
+import sys
+import time
+import traceback
+
+from PySide6.QtCore import (
+    QCoreApplication,
+    QObject,
+    QRunnable,
+    QThreadPool,
+    QTimer,
+    Signal,
+    Slot,
+)
+
+from processworker import ProcessPool, ProcessWorker
+
+N_JOBS = 2 * (os.cpu_count() or 1)
+N_ITERATIONS = 2_000_000
+
+
+def crunch(x, signals):
+    value = float(x)
+    total = 0.0
+    step = N_ITERATIONS // 10
+    for n in range(N_ITERATIONS):
+        value = (value * 1.000001 + n) % 1000.0
+        total += value
+        if n % step == 0:
+            signals.progress.emit(100 * n // N_ITERATIONS)
+    return total
+
+
+class WorkerSignals(QObject):
+    finished = Signal()
+    error = Signal(tuple)
+    result = Signal(object)
+    progress = Signal(int)
+
+
+class Worker(QRunnable):
+    """
+    The generic thread pool Worker, from qrunnable_generic_callback.py.
+    """
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        kwargs["signals"] = self.signals
+
+    @Slot()
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception:
+            traceback.print_exc()
+            exctype, value = sys.exc_info()[:2]
+            self.signals.error.emit(
+                (exctype, value, traceback.format_exc())
+            )
+        else:
+            self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+
+def run_benchmark(app, make_worker):
+    threadpool = QThreadPool()
+    threadpool.setMaxThreadCount(N_JOBS)
+
+    results = []
+    progress = []
+
+    start = time.perf_counter()
+    for n in range(N_JOBS):
+        worker = make_worker(n)
+        worker.signals.result.connect(results.append)
+        worker.signals.progress.connect(progress.append)
+        threadpool.start(worker)
+
+    def check_done():
+        if len(results) == N_JOBS:
+            app.quit()
+
+    timer = QTimer()
+    timer.setInterval(10)
+    timer.timeout.connect(check_done)
+    timer.start()
+    app.exec()
+
+    return time.perf_counter() - start, len(progress)
+
+
+if __name__ == "__main__":
+    app = QCoreApplication(sys.argv)
+
+    pool = ProcessPool()
+    # Start the pool processes up front, so we don't time their startup.
+    list(pool.executor.map(abs, range(os.cpu_count() or 1)))
+
+    print(
+        "%d jobs x %d iterations, %d cores"
+        % (N_JOBS, N_ITERATIONS, os.cpu_count() or 1)
+    )
+    thread_time, n_progress = run_benchmark(
+        app, lambda n: Worker(crunch, n)
+    )
+    print(
+        "Worker (threads)          %.2fs  %d progress signals"
+        % (thread_time, n_progress)
+    )
+    process_time, n_progress = run_benchmark(
+        app, lambda n: ProcessWorker(crunch, n, pool=pool)
+    )
+    print(
+        "ProcessWorker (processes) %.2fs  %d progress signals"
+        % (process_time, n_progress)
+    )
+    print("Speed-up %.2fx" % (thread_time / process_time))
+
+    pool.shutdown()
@@ -0,0 +1,160 @@
+"""
+Measure the GUI event queue depth with and without the ProgressBus.
+
+Workers produce 1,000 data points each, as in qrunnable_calculator.py.
+With plain signals every point is a queued cross-thread event for the
+GUI thread. With the bus, workers write to their slot and the GUI
+thread drains all slots ~30 times per second.
+
+Each delivery to the GUI thread costs GUI_COST seconds of work, as a
+call to setData on a plot line would. Queue depth is sampled from a
+separate thread (the GUI thread may be too busy to sample itself) as
+the number of updates sent by workers but not yet handled on the GUI
+thread.
+
+Run with QT_QPA_PLATFORM=offscreen to benchmark without a display.
+"""
+import sys
+import threading
+import time
+
+from PySide6.QtCore import (
+    QObject,
+    QRunnable,
+    QThreadPool,
+    QTimer,
+    Signal,
+    Slot,
+)
+from PySide6.QtWidgets import QApplication
+
+from progressbus import ProgressBus
+
+N_WORKERS = 10
+N_POINTS = 1000
+DELAY = 0.001  # Between points, in each worker.
+GUI_COST = 0.0002  # Per delivery, on the GUI thread.
+SAMPLE_INTERVAL = 0.01
+
+
+class WorkerSignals(QObject):
+    data = Signal(tuple)
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class Counter:
+    def __init__(self, n):
+        # Count per worker, so each count has a single writer.
+        self.sent = [0] * n
+        self.handled = 0  # Updates handled on the GUI thread.
+        self.deliveries = 0  # Calls into the GUI thread.
+
+
+class Worker(QRunnable):
+    def __init__(self, worker_id, counter):
+        super().__init__()
+        self.worker_id = worker_id
+        self.counter = counter
+        self.signals = WorkerSignals()
+        self.progress_slot = None
+
+    @Slot()
+    def run(self):
+        for n in range(N_POINTS):
+            self.counter.sent[self.worker_id] += 1
+            if self.progress_slot is None:
+                self.signals.data.emit((self.worker_id, n, n))
+            else:
+                self.progress_slot.data((self.worker_id, n, n))
+            time.sleep(DELAY)
+
+        if self.progress_slot is not None:
+            self.progress_slot.finish()
+
+
+def run_benchmark(app, use_bus):
+    counter = Counter(N_WORKERS)
+    threadpool = QThreadPool()
+    threadpool.setMaxThreadCount(N_WORKERS)
+    bus = ProgressBus()
+
+    def receive_data(data):
+        busy(GUI_COST)
+        counter.handled += 1
+        counter.deliveries += 1
+
+    def receive_batch(batch):
+        for items in batch.values():
+            busy(GUI_COST)
+            counter.deliveries += 1
+            counter.handled += len(items)
+
+    bus.data.connect(receive_batch)
+
+    depths = []
+    sampling = True
+
+    def sample():
+        while sampling:
+            depths.append(sum(counter.sent) - counter.handled)
+            time.sleep(SAMPLE_INTERVAL)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+
+    start = time.perf_counter()
+    workers = []
+    for n in range(N_WORKERS):
+        worker = Worker(n, counter)
+        if use_bus:
+            worker.progress_slot = bus.register(n)
+        else:
+            worker.signals.data.connect(receive_data)
+        workers.append(worker)
+        threadpool.start(worker)
+
+    def check_done():
+        if counter.handled >= N_WORKERS * N_POINTS:
+            app.quit()
+
+    timer = QTimer()
+    timer.setInterval(50)
+    timer.timeout.connect(check_done)
+    timer.start()
+    app.exec()
+    timer.stop()
+
+    elapsed = time.perf_counter() - start
+    sampling = False
+    sampler.join()
+    threadpool.waitForDone()
+
+    return {
+        "max depth": max(depths),
+        "mean depth": sum(depths) / len(depths),
+        "deliveries": counter.deliveries,
+        "elapsed": elapsed,
+    }
+
+
+app = QApplication(sys.argv)
+
+print("%d workers x %d points" % (N_WORKERS, N_POINTS))
+for name, use_bus in [("signals", False), ("ProgressBus", True)]:
+    r = run_benchmark(app, use_bus)
+    print(
+        "%-12s max depth %6d  mean depth %8.1f  "
+        "GUI deliveries %6d  elapsed %.2fs"
+        % (
+            name,
+            r["max depth"],
+            r["mean depth"],
+            r["deliveries"],
+            r["elapsed"],
+        )
+    )
@@ -0,0 +1,195 @@
+"""
+Latency and throughput of the long-running QThread in qthread_6.py,
+for 100,000 submissions, against the original polling thread.
+
+The queued thread is fed from the GUI thread as fast as it will accept
+inputs (SUBMIT_CHUNK per event loop pass, backing off while the queue is
+full). Latency is from put() to the processed signal arriving back on
+the GUI thread.
+
+The original thread can only hold one input, so it is measured two
+ways: submitting and waiting for each result in turn (latency), and
+submitting 100,000 inputs without waiting (how many are lost).
+"""
+import collections
+import statistics
+import sys
+import time
+
+from PySide6.QtCore import QCoreApplication, QThread, QTimer, Signal, Slot
+
+from qthread_6 import Thread
+
+N_SUBMISSIONS = 100_000
+SUBMIT_CHUNK = 500
+N_POLLING_LATENCY = 20
+
+
+class PollingThread(QThread):
+    """
+    The original Thread, from qthread_6.py.
+    """
+
+    result = Signal(str)
+
+    def __init__(self, initial_counter):
+        super().__init__()
+        self.counter = initial_counter
+
+    @Slot()
+    def run(self):
+        self.is_running = True
+        self.waiting_for_data = True
+        while True:
+            while self.waiting_for_data:
+                if not self.is_running:
+                    return
+                time.sleep(0.1)
+
+            self.counter += self.input_add
+            self.counter *= self.input_multiply
+            self.result.emit(f"The cumulative total is {self.counter}")
+            self.waiting_for_data = True
+
+    def send_data(self, add, multiply):
+        self.input_add = add
+        self.input_multiply = multiply
+        self.waiting_for_data = False
+
+    def stop(self):
+        self.is_running = False
+
+
+def percentiles(latencies):
+    latencies = sorted(latencies)
+    n = len(latencies)
+    return (
+        1000 * latencies[n // 2],
+        1000 * latencies[int(n * 0.99)],
+        1000 * latencies[-1],
+    )
+
+
+def run_queued(app):
+    thread = Thread(0)
+    submitted = collections.deque()  # put() times, in order.
+    latencies = []
+    counts = {"sent": 0, "batches": 0}
+
+    def submit():
+        for _ in range(SUBMIT_CHUNK):
+            if counts["sent"] == N_SUBMISSIONS:
+                timer.stop()
+                return
+            if not thread.put(1, 1):
+                return  # Full, try again on the next pass.
+            submitted.append(time.perf_counter())
+            counts["sent"] += 1
+
+    def processed(n):
+        now = time.perf_counter()
+        for _ in range(n):
+            latencies.append(now - submitted.popleft())
+        counts["batches"] += 1
+        if len(latencies) == N_SUBMISSIONS:
+            app.quit()
+
+    thread.processed.connect(processed)
+    thread.start()
+
+    timer = QTimer()
+    timer.timeout.connect(submit)
+
+    start = time.perf_counter()
+    timer.start(0)
+    app.exec()
+    elapsed = time.perf_counter() - start
+
+    thread.stop()
+    thread.wait()
+    assert thread.counter == N_SUBMISSIONS
+    return elapsed, latencies, counts["batches"]
+
+
+def run_polling_latency(app):
+    thread = PollingThread(0)
+    latencies = []
+    sent_at = []
+
+    def submit():
+        sent_at.append(time.perf_counter())
+        thread.send_data(1, 1)
+
+    def result(s):
+        latencies.append(time.perf_counter() - sent_at[-1])
+        if len(latencies) == N_POLLING_LATENCY:
+            app.quit()
+        else:
+            submit()
+
+    thread.result.connect(result)
+    thread.start()
+    # run() resets waiting_for_data as it starts, losing anything sent
+    # before then, so give it time to start.
+    QTimer.singleShot(200, submit)
+    app.exec()
+
+    thread.stop()
+    thread.wait()
+    return latencies
+
+
+def run_polling_lost(app):
+    thread = PollingThread(0)
+    results = []
+    thread.result.connect(results.append)
+    thread.start()
+
+    def submit():
+        for _ in range(N_SUBMISSIONS):
+            thread.send_data(1, 1)
+        # Give it time to pick up whatever it is going to.
+        QTimer.singleShot(500, app.quit)
+
+    QTimer.singleShot(200, submit)
+    app.exec()
+
+    thread.stop()
+    thread.wait()
+    return len(results)
+
+
+if __name__ == "__main__":
+    app = QCoreApplication(sys.argv)
+
+    print("%d submissions" % N_SUBMISSIONS)
+
+    elapsed, latencies, batches = run_queued(app)
+    p50, p99, worst = percentiles(latencies)
+    print(
+        "Queued thread:  %.2fs  %.0f submissions/s  %d results (batches)"
+        % (elapsed, N_SUBMISSIONS / elapsed, batches)
+    )
+    print(
+        "  latency  p50 %.2f ms  p99 %.2f ms  max %.2f ms"
+        % (p50, p99, worst)
+    )
+
+    latencies = run_polling_latency(app)
+    mean = statistics.mean(latencies)
+    p50, p99, worst = percentiles(latencies)
+    print(
+        "Polling thread: %.1f submissions/s, waiting for each result"
+        " (%d submissions would take %.0fs)"
+        % (1 / mean, N_SUBMISSIONS, N_SUBMISSIONS * mean)
+    )
+    print(
+        "  latency  p50 %.2f ms  p99 %.2f ms  max %.2f ms"
+        % (p50, p99, worst)
+    )
+
+    handled = run_polling_lost(app)
+    print(
+        "Polling thread, without waiting: %d of %d handled, %d lost"
+        % (handled, N_SUBMISSIONS, N_SUBMISSIONS - handled)
+    )
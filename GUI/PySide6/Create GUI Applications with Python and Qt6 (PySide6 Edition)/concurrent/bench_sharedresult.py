@@ -0,0 +1,113 @@
+"""
+Move 500 MB of float64 results from a worker process to this process,
+three ways, each timed from starting the process to holding a NumPy
+array of the values, and excluding the time the worker spends
+generating them (which leaves process startup, and the transfer):
+
+  text    printed one per line as value=..., found with a regex and
+          converted with float(), as a VarsParser-style parser would.
+          Measured on TEXT_BYTES of values and scaled up, as the full
+          500 MB as Python floats would not fit in memory here.
+  pipe    the raw bytes written to stdout and read back, two copies.
+  shared  written into a SharedArray, only its name printed.
+
+Each result is checked against values regenerated from the same seed.
+"""
+import re
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from sharedresult import SharedArray, SharedArrayParser
+
+TOTAL_BYTES = 500 * 1024 * 1024
+TEXT_BYTES = 25 * 1024 * 1024
+SEED = 1234
+
+value_re = re.compile(r"^value=(.*)$", re.M)
+
+
+def generate(n):
+    return np.random.default_rng(SEED).random(n)
+
+
+def child(method, n):
+    start = time.perf_counter()
+    if method == "shared":
+        shared = SharedArray.create((n,), np.float64)
+        np.random.default_rng(SEED).random(out=shared.array)
+    else:
+        values = generate(n)
+    generated = time.perf_counter() - start
+    sys.stderr.write("%f\n" % generated)
+
+    if method == "text":
+        sys.stdout.writelines("value=%r\n" % v for v in values.tolist())
+    elif method == "pipe":
+        sys.stdout.buffer.write(values.data)
+    else:
+        print(shared.line())
+        shared.close()
+
+
+def run(method, n):
+    start = time.perf_counter()
+    p = subprocess.run(
+        [sys.executable, __file__, "child", method, str(n)],
+        capture_output=True,
+    )
+
+    if method == "text":
+        output = p.stdout.decode("utf8")
+        values = np.array([float(v) for v in value_re.findall(output)])
+        shared = None
+    elif method == "pipe":
+        values = np.frombuffer(p.stdout, dtype=np.float64)
+        shared = None
+    else:
+        (shared,) = SharedArrayParser().parse(p.stdout.decode("utf8"))
+        values = shared.array
+    elapsed = time.perf_counter() - start
+
+    generated = float(p.stderr)
+    correct = np.array_equal(values, generate(n))
+    del values
+    if shared is not None:
+        shared.release()
+    return elapsed, generated, correct
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["child"]:
+        child(sys.argv[2], int(sys.argv[3]))
+        sys.exit()
+
+    n_total = TOTAL_BYTES // 8
+    n_text = TEXT_BYTES // 8
+    print("%d MB of float64 (%d values)" % (TOTAL_BYTES >> 20, n_total))
+
+    methods = [("text", n_text), ("pipe", n_total), ("shared", n_total)]
+    for method, n in methods:
+        elapsed, generated, correct = run(method, n)
+        transfer = elapsed - generated
+        scale = n_total / n
+        note = ""
+        if scale != 1:
+            note = "  (measured on %d MB, scaled x%d)" % (
+                TEXT_BYTES >> 20,
+                scale,
+            )
+        print(
+            "%-7s %8.2fs total  %8.2fs excluding generation  %7.1f MB/s"
+            "  correct=%s%s"
+            % (
+                method,
+                elapsed * scale,
+                transfer * scale,
+                (n * 8 >> 20) / transfer,
+                correct,
+                note,
+            )
+        )
@@ -0,0 +1,147 @@
+"""
+Compare jobs per second for 1,000 short Python jobs, started as a new
+`python` process each (ProcessQueue, as JobManager.execute), against
+the same jobs run in a WarmPool of long-lived worker processes.
+
+Both run with the same number of processes at once, and feed their
+output through a ParserPipeline, as in JobManager. The short job only
+prints a few lines, so the time is almost all process startup.
+"""
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+from PySide6.QtCore import QCoreApplication, QProcess
+
+from parsers import ParserPipeline, PercentParser, VarsParser
+from processqueue import ProcessQueue
+from warmpool import WarmPool
+
+N_JOBS = 1000
+MAX_PROCESSES = os.cpu_count() or 1
+
+SHORT_JOB = """
+import json
+import sys
+
+sys.stdout.write("name=job\\n")
+sys.stdout.write("data=%s\\n" % json.dumps(sys.argv[1:]))
+sys.stderr.write("Total complete: 100%\\n")
+"""
+
+PARSERS = [(PercentParser, "progress"), (VarsParser, "result")]
+
+
+class Runner:
+    """
+    Collects output and parsed variables for each job, and quits the app once
+    all the jobs have finished.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.pipelines = {}
+        self.n_finished = 0
+        self.n_vars = 0
+        self.n_failed = 0
+
+    def new_job(self):
+        job_id = uuid.uuid4().hex
+        self.pipelines[job_id] = ParserPipeline(PARSERS)
+        return job_id
+
+    def handle_output(self, job_id, data, channel):
+        self.count(self.pipelines[job_id].feed(data, channel))
+
+    def count(self, results):
+        for name, result in results:
+            if name == "result":
+                self.n_vars += len(result)
+
+    def done(self, job_id, exit_code, exit_status):
+        self.count(self.pipelines.pop(job_id).close())
+        if exit_code or exit_status != QProcess.NormalExit:
+            self.n_failed += 1
+        self.n_finished += 1
+        if self.n_finished == N_JOBS:
+            self.app.quit()
+
+
+def run_cold(app, script):
+    runner = Runner(app)
+    queue = ProcessQueue(MAX_PROCESSES)
+    processes = {}
+
+    def read(job_id):
+        p = processes[job_id]
+        runner.handle_output(
+            job_id, bytes(p.readAllStandardOutput()), "stdout"
+        )
+        runner.handle_output(
+            job_id, bytes(p.readAllStandardError()), "stderr"
+        )
+
+    def finished(job_id, *args):
+        read(job_id)
+        processes.pop(job_id).deleteLater()
+
+    # Connected first, so the output is read before runner.done.
+    queue.finished.connect(finished)
+    queue.finished.connect(runner.done)
+
+    start = time.perf_counter()
+    for n in range(N_JOBS):
+        job_id = runner.new_job()
+        p = processes[job_id] = QProcess(queue)
+        p.readyReadStandardOutput.connect(
+            lambda job_id=job_id: read(job_id)
+        )
+        p.readyReadStandardError.connect(
+            lambda job_id=job_id: read(job_id)
+        )
+        queue.submit(job_id, p, sys.executable, [script, str(n)])
+
+    app.exec()
+    return time.perf_counter() - start, runner
+
+
+def run_warm(app, script):
+    runner = Runner(app)
+    pool = WarmPool(MAX_PROCESSES)
+    pool.output.connect(runner.handle_output)
+    pool.finished.connect(runner.done)
+
+    start = time.perf_counter()
+    for n in range(N_JOBS):
+        pool.submit(runner.new_job(), script, [str(n)])
+
+    app.exec()
+    elapsed = time.perf_counter() - start
+    pool.shutdown()
+    return elapsed, runner
+
+
+if __name__ == "__main__":
+    app = QCoreApplication(sys.argv)
+
+    with tempfile.TemporaryDirectory() as path:
+        script = os.path.join(path, "short_job.py")
+        with open(script, "w") as f:
+            f.write(SHORT_JOB)
+
+        print("%d short jobs, %d processes" % (N_JOBS, MAX_PROCESSES))
+        for name, fn in [("cold spawn", run_cold), ("warm pool", run_warm)]:
+            elapsed, runner = fn(app, script)
+            print(
+                "%-10s  %.2fs  %.1f jobs/s  %d of %d variables, %d failed"
+                % (
+                    name,
+                    elapsed,
+                    N_JOBS / elapsed,
+                    runner.n_vars,
+                    2 * N_JOBS,
+                    runner.n_failed,
+                )
+            )
@@ -0,0 +1,317 @@
+import sys
+import threading
+import time
+import traceback
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+
+class Task:
+    """
+    A function to run in a TaskGraph, and the names of the tasks whose
+    results it is passed. If future is set, the function only starts
+    the work, returning a concurrent.futures.Future for the result.
+    """
+
+    __slots__ = ("name", "fn", "args", "kwargs", "deps", "future")
+
+    def __init__(self, name, fn, args, kwargs, deps, future=False):
+        self.name = name
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.deps = deps
+        self.future = future
+
+
+class TaskRunnable(QRunnable):
+    """
+    Runs one task of a graph on a pool thread.
+    """
+
+    def __init__(self, graph, name, ready):
+        super().__init__()
+        self.graph = graph
+        self.name = name
+        self.ready = ready  # When the task's dependencies were done.
+
+    @Slot()
+    def run(self):
+        self.graph.execute(self.name, self.ready)
+
+
+class RunReport:
+    """
+    Results and timing of one run of a TaskGraph.
+
+    The critical path is the chain of tasks which decided how long the
+    run took: the last task to finish, its dependency which finished
+    last, and so on back to the start. For each task on it, the
+    time spent waiting for a free thread (once its dependencies were
+    done) and running is given, as a list of (name, wait, duration).
+    """
+
+    def __init__(self, graph, elapsed, times, results, errors):
+        self.elapsed = elapsed
+        self.results = results
+        self.errors = errors  # name -> (exctype, value, traceback)
+        self.skipped = [name for name in graph.tasks if name not in times]
+
+        # Total time spent running tasks, over the elapsed time.
+        busy = sum(end - start for _, start, end in times.values())
+        self.parallelism = busy / elapsed if elapsed else 0
+
+        self.critical_path = []
+        name = max(times, key=lambda name: times[name][2], default=None)
+        while name is not None:
+            ready, start, end = times[name]
+            self.critical_path.append((name, start - ready, end - start))
+            ran = [dep for dep in graph.tasks[name].deps if dep in times]
+            name = max(ran, key=lambda dep: times[dep][2], default=None)
+        self.critical_path.reverse()
+
+    def __str__(self):
+        waiting = sum(wait for _, wait, _ in self.critical_path)
+        running = sum(duration for _, _, duration in self.critical_path)
+        lines = [
+            "Run took {:.3f}s, {:.1f} tasks running on average".format(
+                self.elapsed, self.parallelism
+            ),
+            "Critical path {:.3f}s running + {:.3f}s waiting:".format(
+                running, waiting
+            ),
+        ]
+        for name, wait, duration in self.critical_path:
+            lines.append(
+                "  {:<20} {:.3f}s  (waited {:.3f}s)".format(
+                    name, duration, wait
+                )
+            )
+        for name, (_, value, _) in self.errors.items():
+            lines.append("  {} failed: {}".format(name, value))
+        if self.skipped:
+            lines.append("  Skipped: {}".format(", ".join(self.skipped)))
+        return "\n".join(lines)
+
+
+class TaskGraph(QObject):
+    """
+    Runs a graph of tasks on a QThreadPool, each task starting as soon
+    as all the tasks it depends on have finished, so independent tasks
+    run in parallel.
+
+    Each task is a function, called with its own arguments followed by
+    the results of its dependencies (in the order given). The results
+    are handed from task to task on the pool threads: when a task
+    finishes, the thread it ran on starts any tasks which are now ready,
+    without going through the GUI thread.
+
+    Tasks added with add_future() start work which runs elsewhere (e.g.
+    on an asyncio event loop) and return a Future, so no pool thread is
+    held while it waits: the task is done when its Future is, and the
+    tasks depending on it are started from the Future's done callback.
+
+    A task's dependencies must be added before it, so the graph can't
+    have cycles. If a task raises an exception, the tasks depending on
+    it (directly or not) are skipped, and the rest carry on.
+
+    Supported signals are:
+
+    result
+        `str` task name, `object` result of the task
+
+    error
+        `str` task name, `tuple` (exctype, value, traceback.format_exc())
+
+    finished
+        `RunReport` with the results and critical-path timing of the run
+
+    """
+
+    result = Signal(str, object)
+    error = Signal(str, tuple)
+    finished = Signal(object)
+
+    def __init__(self, threadpool=None):
+        super().__init__()
+        self.threadpool = threadpool or QThreadPool.globalInstance()
+        self.tasks = {}  # name -> Task, in the order added.
+        self._dependents = {}  # name -> names of tasks which depend on it.
+
+        self._lock = threading.Lock()
+        self.running = False
+
+    def add(self, name, fn, *args, deps=(), **kwargs):
+        """
+        Add a task, named name, to call fn(*args, *dep_results, **kwargs).
+        """
+        if name in self.tasks:
+            raise ValueError("Task {!r} already added".format(name))
+        for dep in deps:
+            if dep not in self.tasks:
+                raise ValueError(
+                    "Task {!r} depends on {!r}, which must be added "
+                    "first".format(name, dep)
+                )
+
+        self.tasks[name] = Task(name, fn, args, kwargs, tuple(deps))
+        self._dependents[name] = []
+        for dep in deps:
+            self._dependents[dep].append(name)
+
+    def add_future(self, name, fn, *args, deps=(), **kwargs):
+        """
+        Add a task, named name, to call fn(*args, *dep_results, **kwargs)
+        from whichever thread finished its last dependency. fn must not
+        block: it returns a concurrent.futures.Future, and the task's
+        result is the Future's.
+        """
+        self.add(name, fn, *args, deps=deps, **kwargs)
+        self.tasks[name].future = True
+
+    def run(self):
+        """
+        Start the tasks with no dependencies. The finished signal is
+        emitted once every task has finished or been skipped.
+        """
+        if self.running:
+            raise RuntimeError("The graph is already running")
+        self.running = True
+
+        self._results = {}
+        self._errors = {}
+        self._failed = set()  # Failed or skipped.
+        self._times = {}  # name -> (ready, start, end)
+        self._waiting = {name: len(t.deps) for name, t in self.tasks.items()}
+        self._remaining = len(self.tasks)
+        self._started = time.perf_counter()
+
+        if not self.tasks:
+            self.finish()
+            return
+
+        # Found first, as tasks may finish (and start others) meanwhile.
+        roots = [name for name, task in self.tasks.items() if not task.deps]
+        for name in roots:
+            self.schedule(name, self._started)
+
+    def schedule(self, name, ready):
+        if self.tasks[name].future:
+            self.start_future(name, ready)
+        else:
+            self.threadpool.start(TaskRunnable(self, name, ready))
+
+    def execute(self, name, ready):
+        """
+        Run a task, on a pool thread, then start any tasks it was the
+        last dependency of.
+        """
+        task = self.tasks[name]
+        # Set before this task was scheduled, under the lock.
+        dep_results = [self._results[dep] for dep in task.deps]
+
+        start = time.perf_counter()
+        try:
+            result = task.fn(*task.args, *dep_results, **task.kwargs)
+        except Exception:
+            self.task_done(name, ready, start, error=exc_info())
+        else:
+            self.task_done(name, ready, start, result)
+
+    def start_future(self, name, ready):
+        """
+        Start a task added with add_future(), on the calling thread. It
+        is done when the Future it returns is.
+        """
+        task = self.tasks[name]
+        dep_results = [self._results[dep] for dep in task.deps]
+
+        start = time.perf_counter()
+        try:
+            future = task.fn(*task.args, *dep_results, **task.kwargs)
+        except Exception:
+            self.task_done(name, ready, start, error=exc_info())
+            return
+
+        def done(future):
+            try:
+                result = future.result()
+            except Exception:
+                self.task_done(name, ready, start, error=exc_info())
+            else:
+                self.task_done(name, ready, start, result)
+
+        future.add_done_callback(done)
+
+    def task_done(self, name, ready, start, result=None, error=None):
+        """
+        Record a task's result (or error, from exc_info()), then start
+        any tasks it was the last dependency of.
+        """
+        end = time.perf_counter()
+        failed = error is not None
+
+        if failed:
+            self.error.emit(name, error)
+        else:
+            self.result.emit(name, result)
+
+        with self._lock:
+            self._times[name] = (ready, start, end)
+            if failed:
+                self._errors[name] = error
+                self._failed.add(name)
+            else:
+                self._results[name] = result
+            ready_tasks = self.complete(name)
+            done = not self._remaining
+
+        for ready_name in ready_tasks:
+            self.schedule(ready_name, end)
+        if done:
+            self.finish()
+
+    def complete(self, name):
+        """
+        Mark a task as done, with the lock held. Returns the names of
+        the tasks which are now ready to run. Tasks depending on a
+        failed task are skipped (and so complete too).
+        """
+        ready = []
+        done = [name]
+        while done:
+            name = done.pop()
+            self._remaining -= 1
+            for dependent in self._dependents[name]:
+                self._waiting[dependent] -= 1
+                if self._waiting[dependent]:
+                    continue
+
+                deps = self.tasks[dependent].deps
+                if any(dep in self._failed for dep in deps):
+                    self._failed.add(dependent)
+                    done.append(dependent)
+                else:
+                    ready.append(dependent)
+        return ready
+
+    def finish(self):
+        report = RunReport(
+            self,
+            time.perf_counter() - self._started,
+            self._times,
+            self._results,
+            self._errors,
+        )
+        self.running = False
+        self.finished.emit(report)
+
+
+def exc_info():
+    """
+    The exception being handled, printed, as (exctype, value, traceback)
+    for the error signal.
+    """
+    traceback.print_exc()
+    exctype, value = sys.exc_info()[:2]
+    return (exctype, value, traceback.format_exc())
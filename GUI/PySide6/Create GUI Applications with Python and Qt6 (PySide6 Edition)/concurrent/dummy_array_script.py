@@ -0,0 +1,19 @@
+"""
+Generates a large array of results, and hands it back to the parent
+process in shared memory, printing only its name.
+"""
+import sys
+
+import numpy as np
+
+from sharedresult import SharedArray
+
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+result = SharedArray.create((n,), np.float64)
+# Written straight into the shared memory, no copy.
+np.random.default_rng().random(out=result.array)
+
+print("number_of_values=%d" % n)
+print(result.line())
+result.close()
@@ -0,0 +1,427 @@
+import asyncio
+import codecs
+import html
+import re
+import ssl
+import threading
+from urllib.parse import urljoin, urlsplit
+
+DEFAULT_TAGS = ("title", "h1", "h2")
+CHUNK_SIZE = 64 * 1024
+# Characters of an element held over waiting for its closing tag,
+# before giving up on it as never closed.
+MAX_ELEMENT = 64 * 1024
+REDIRECTS = {301, 302, 303, 307, 308}
+
+
+class HTTPError(Exception):
+    pass
+
+
+class PageParser:
+    """
+    Streaming parser, collecting the text of the first of each of the
+    given tags. It is fed the page a chunk at a time as it arrives, and
+    one regex finds the opening tags of all those not yet found, so
+    each page is scanned once, rather than once per tag over the whole
+    page.
+
+    Only an element which is still open is held over to the next chunk:
+    its content so far is set aside, and the search for its closing tag
+    carries on from the last "<", so a long element arriving in many
+    chunks is neither scanned nor copied again for each one. An element
+    still open after MAX_ELEMENT characters, or at close(), is given up
+    on, and its content searched for the other tags instead.
+    """
+
+    def __init__(self, tags=DEFAULT_TAGS):
+        self.tags = set(tags)
+        self.data = {}
+
+        self._close_res = {
+            tag.lower(): re.compile(r"</{}\s*>".format(re.escape(tag)), re.I)
+            for tag in tags
+        }
+        self._longest = max(len(tag) for tag in tags) + 1
+        self._buffer = ""
+        self._pos = 0  # Where to carry on scanning _buffer from.
+        self._tag = None  # The element we are in, if any.
+        self._content = None  # Start of its content in _buffer.
+        self._parts = []  # Its content from earlier chunks.
+        self._held = 0  # Total length of _parts.
+        self.update_open_re()
+
+    @property
+    def done(self):
+        return len(self.data) == len(self.tags)
+
+    def update_open_re(self):
+        # Only the tags still to be found.
+        names = "|".join(
+            re.escape(tag) for tag in self.tags if tag not in self.data
+        )
+        self._open_re = re.compile(r"<({})\b".format(names), re.I)
+
+    def feed(self, text):
+        if self.done:
+            return
+
+        buffer = self._buffer + text
+        pos = self._pos
+        while True:
+            if self._tag is None:
+                m = self._open_re.search(buffer, pos)
+                if m is None or m.end() == len(buffer):
+                    # Keep the last few characters, in case a tag is
+                    # split across chunks.
+                    if m is None:
+                        start = max(pos, len(buffer) - self._longest)
+                        lt = buffer.find("<", start)
+                    else:
+                        lt = m.start()
+                    buffer = buffer[lt:] if lt != -1 else ""
+                    pos = 0
+                    break
+                self._tag = m.group(1).lower()
+                buffer, pos = buffer[m.end() :], 0
+
+            if self._content is None:
+                # The end of the opening tag, after any attributes.
+                end = buffer.find(">", pos)
+                if end == -1:
+                    pos = len(buffer)
+                    break
+                self._content = pos = end + 1
+
+            m = self._close_res[self._tag].search(buffer, pos)
+            if m is None:
+                # Carry on from the last "<", which may start the
+                # closing tag.
+                lt = buffer.rfind("<", self._content)
+                if lt == -1:
+                    lt = len(buffer)
+                self._parts.append(buffer[self._content : lt])
+                self._held += lt - self._content
+                buffer, pos = buffer[lt:], 0
+                self._content = 0
+                if self._held <= MAX_ELEMENT:
+                    break
+                buffer = self.abandon(buffer)
+                continue
+
+            self._parts.append(buffer[self._content : m.start()])
+            self.data[self._tag] = strip_tags("".join(self._parts))
+            buffer, pos = buffer[m.end() :], 0
+            self._tag = self._content = None
+            self._parts = []
+            self._held = 0
+            if self.done:
+                buffer = ""
+                break
+            self.update_open_re()
+
+        self._buffer, self._pos = buffer, pos
+
+    def abandon(self, buffer):
+        """
+        Give up on the open element, returning its content so far and
+        the rest of buffer, to be scanned again for opening tags.
+        """
+        buffer = "".join(self._parts) + buffer
+        self._tag = self._content = None
+        self._parts = []
+        self._held = 0
+        return buffer
+
+    def close(self):
+        # The page has ended, so an element still open never will be
+        # closed, but may hold some of the other tags.
+        while self._tag is not None and not self.done:
+            buffer = self.abandon(self._buffer)
+            self._buffer, self._pos = "", 0
+            self.feed(buffer)
+
+        self._buffer = ""
+        self._pos = 0
+        self._tag = self._content = None
+        self._parts = []
+        self._held = 0
+
+
+def strip_tags(s):
+    return html.unescape(re.sub(r"<[^>]*>", "", s)).strip()
+
+
+class HostPool:
+    """
+    Idle keep-alive connections to one host, and a semaphore limiting
+    the number of requests to it at once.
+    """
+
+    def __init__(self, limit):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.idle = []  # (reader, writer)
+
+    def close(self):
+        for _, writer in self.idle:
+            writer.close()
+        self.idle = []
+
+
+class Fetcher:
+    """
+    Fetches pages with asyncio, on an event loop running in a background
+    thread, in place of a blocking requests.get on a pool thread per URL.
+
+    Connections are kept alive and reused, with at most limit_per_host
+    requests to each host at once. Each request has a timeout (seconds),
+    and is retried (with backoff) on connection errors, timeouts and
+    5xx responses. The title, h1 and h2 are extracted from the page as
+    it streams in, by a PageParser.
+
+    Results are emitted as (id, data) through the data signal of the
+    signals object passed to fetch() -- or (id, {"error": ...}) if the
+    fetch failed.
+    """
+
+    def __init__(
+        self,
+        limit_per_host=6,
+        timeout=10,
+        retries=2,
+        backoff=0.5,
+        tags=DEFAULT_TAGS,
+        max_redirects=5,
+    ):
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.tags = tags
+        self.max_redirects = max_redirects
+
+        self._hosts = {}  # (scheme, host, port) -> HostPool
+        self._ssl = ssl.create_default_context()
+
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(
+            target=self.loop.run_forever, daemon=True
+        )
+        self.thread.start()
+
+    def fetch(self, id, url, signals):
+        """
+        Fetch url in the background, and emit signals.data when done.
+        Can be called from any thread. Returns a concurrent.futures
+        Future for the data.
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self._fetch(id, url, signals), self.loop
+        )
+
+    def close(self):
+        """
+        Close all the idle connections, and stop the loop thread.
+        """
+
+        async def close_all():
+            for pool in self._hosts.values():
+                pool.close()
+
+        asyncio.run_coroutine_threadsafe(close_all(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+    async def _fetch(self, id, url, signals):
+        try:
+            data = await self.get(url)
+        except Exception as e:
+            data = {"error": str(e) or type(e).__name__}
+        signals.data.emit((id, data))
+        return data
+
+    async def get(self, url):
+        """
+        Return a dict of the text of the tags found in the page at url.
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                return await self._get(url)
+            except (OSError, EOFError, asyncio.TimeoutError, HTTPError):
+                if attempt == self.retries:
+                    raise
+                await asyncio.sleep(self.backoff * 2**attempt)
+
+    async def _get(self, url):
+        for _ in range(self.max_redirects + 1):
+            status, headers, data = await self._request(url)
+            if status in REDIRECTS and "location" in headers:
+                url = urljoin(url, headers["location"])
+                continue
+            if status >= 500:
+                raise HTTPError("HTTP {} from {}".format(status, url))
+            return data
+        raise HTTPError("Too many redirects from {}".format(url))
+
+    async def _request(self, url):
+        parts = urlsplit(url)
+        https = parts.scheme == "https"
+        port = parts.port or (443 if https else 80)
+        key = parts.scheme, parts.hostname, port
+
+        pool = self._hosts.get(key)
+        if pool is None:
+            pool = self._hosts[key] = HostPool(self.limit_per_host)
+
+        # The timeout starts once we have a slot, not while queued.
+        async with pool.semaphore:
+            return await asyncio.wait_for(
+                self._request_on(pool, parts, port), self.timeout
+            )
+
+    async def _request_on(self, pool, parts, port):
+        while True:
+            reused = bool(pool.idle)
+            if reused:
+                reader, writer = pool.idle.pop()
+            else:
+                reader, writer = await asyncio.open_connection(
+                    parts.hostname,
+                    port,
+                    ssl=self._ssl if parts.scheme == "https" else None,
+                )
+
+            try:
+                keep_alive, status, headers, data = await self._exchange(
+                    reader, writer, parts
+                )
+            except (OSError, EOFError):
+                writer.close()
+                if reused:
+                    # The server closed an idle connection, try again on
+                    # another (or a new) one.
+                    continue
+                raise
+            except BaseException:
+                # Timed out, or something else went wrong part way
+                # through, so this connection is no good.
+                writer.close()
+                raise
+            break
+
+        if keep_alive:
+            pool.idle.append((reader, writer))
+        else:
+            writer.close()
+
+        return status, headers, data
+
+    async def _exchange(self, reader, writer, parts):
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        writer.write(
+            (
+                "GET {} HTTP/1.1\r\n"
+                "Host: {}\r\n"
+                "Accept: text/html\r\n"
+                "Connection: keep-alive\r\n"
+                "\r\n"
+            )
+            .format(path, parts.netloc.rpartition("@")[2])
+            .encode("latin-1")
+        )
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed")
+        version, status = status_line.split()[:2]
+        status = int(status)
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = (
+            version == b"HTTP/1.1"
+            and headers.get("connection", "").lower() != "close"
+        )
+
+        # Only parse pages we will return, but always read the body so
+        # the connection can be used again.
+        parser = None
+        if status not in REDIRECTS and status < 500:
+            parser = PageParser(self.tags)
+            decoder = codecs.getincrementaldecoder(charset(headers))(
+                errors="replace"
+            )
+
+        if status in (204, 304) or status < 200:
+            chunks = read_length(reader, 0)  # No body.
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = read_chunked(reader)
+        elif "content-length" in headers:
+            chunks = read_length(reader, int(headers["content-length"]))
+        else:
+            # Delimited by the server closing the connection.
+            chunks = read_to_close(reader)
+            keep_alive = False
+
+        async for chunk in chunks:
+            if parser is not None and not parser.done:
+                parser.feed(decoder.decode(chunk))
+
+        data = None
+        if parser is not None:
+            parser.close()
+            data = parser.data
+        return keep_alive, status, headers, data
+
+
+def charset(headers):
+    """
+    Charset from the Content-Type header, if it is one we know.
+    """
+    for param in headers.get("content-type", "").split(";")[1:]:
+        name, _, value = param.strip().partition("=")
+        if name.lower() == "charset":
+            try:
+                return codecs.lookup(value.strip("\"'")).name
+            except LookupError:
+                break
+    return "utf8"
+
+
+async def read_chunked(reader):
+    while True:
+        size = int((await reader.readline()).split(b";")[0], 16)
+        if not size:
+            # Skip any trailers, up to the blank line.
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            return
+        yield await reader.readexactly(size)
+        await reader.readexactly(2)  # CRLF after the chunk.
+
+
+async def read_length(reader, length):
+    while length:
+        chunk = await reader.read(min(length, CHUNK_SIZE))
+        if not chunk:
+            raise asyncio.IncompleteReadError(b"", length)
+        length -= len(chunk)
+        yield chunk
+
+
+async def read_to_close(reader):
+    while True:
+        chunk = await reader.read(CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
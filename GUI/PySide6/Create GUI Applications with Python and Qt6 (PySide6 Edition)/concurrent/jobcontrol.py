@@ -0,0 +1,94 @@
+import threading
+import time
+
+
+class WorkerKilledException(Exception):
+    pass
+
+
+class JobControl:
+    """
+    Cancellation token and pause gate, shared between the GUI thread
+    (which calls pause, resume and kill) and a worker (which calls
+    checkpoint and sleep from its run loop).
+
+    Both are built on threading.Event, so a paused worker is blocked
+    waiting on the event and uses no CPU, rather than spinning in a
+    loop. Killing a job also wakes it if it is paused or sleeping.
+
+    Use as a context manager around the body of run(), or call done()
+    when the job stops -- the job is marked as done, and any kill is
+    acknowledged.
+
+    """
+
+    def __init__(self):
+        self._resumed = threading.Event()
+        self._resumed.set()
+        self._killed = threading.Event()
+
+        self.kill_requested_at = None
+        self.kill_latency = None  # Seconds from kill() to the worker stopping.
+        self.is_done = False
+
+    @property
+    def is_paused(self):
+        return not self._resumed.is_set()
+
+    @property
+    def is_killed(self):
+        return self._killed.is_set()
+
+    # Called from the GUI thread.
+    def pause(self):
+        # Once killed, the gate stays open so the worker can stop.
+        if not (self.is_done or self.is_killed):
+            self._resumed.clear()
+
+    def resume(self):
+        self._resumed.set()
+
+    def kill(self):
+        if self.is_done or self.is_killed:
+            return
+        self.kill_requested_at = time.perf_counter()
+        self._killed.set()
+        self._resumed.set()  # Wake the worker if paused.
+
+    # Called from the worker.
+    def checkpoint(self):
+        """
+        Block while paused, and raise WorkerKilledException if the job
+        has been killed.
+        """
+        # Checked first too, in case pause() closed the gate again
+        # just after kill() opened it.
+        if self._killed.is_set():
+            raise WorkerKilledException
+        self._resumed.wait()
+        if self._killed.is_set():
+            raise WorkerKilledException
+
+    def sleep(self, seconds):
+        """
+        Sleep for the given time, returning early if the job is killed,
+        then checkpoint.
+        """
+        self._killed.wait(seconds)
+        self.checkpoint()
+
+    def done(self):
+        if self.kill_requested_at is not None:
+            self.kill_latency = time.perf_counter() - self.kill_requested_at
+
+        # Nothing can be waiting on us now, leave the gate open.
+        self.is_done = True
+        self._resumed.set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.done()
+        # Swallow the kill, but let any other errors through.
+        return exc_type is WorkerKilledException
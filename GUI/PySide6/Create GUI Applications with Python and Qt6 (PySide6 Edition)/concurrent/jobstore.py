@@ -0,0 +1,197 @@
+import hashlib
+import json
+import queue
+import sqlite3
+import threading
+
+# Compact the log once this many events have been written to it.
+COMPACT_EVERY = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    event TEXT NOT NULL,
+    data TEXT
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    seq INTEGER PRIMARY KEY,
+    job_id TEXT NOT NULL UNIQUE,
+    key TEXT NOT NULL,
+    spec TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    result TEXT
+);
+"""
+
+
+def job_key(*args):
+    """
+    Hash of a job's arguments, identifying jobs which will give the
+    same result. The arguments must be JSON serializable.
+    """
+    data = json.dumps(args, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(data.encode("utf8")).hexdigest()
+
+
+class JobStore:
+    """
+    Persistent record of jobs and their results, in an SQLite database,
+    so unfinished jobs can be run again after the app exits (or
+    crashes), and completed results are kept.
+
+    Each change is appended to a log table -- a job being submitted,
+    completing (with its result) or failing. Appending is done on a
+    background thread, with everything waiting converted to JSON and
+    written together in one transaction, so the GUI thread never waits
+    on the disk. Once the log has grown by COMPACT_EVERY events, the
+    same thread folds it into the jobs table (unfinished jobs only) and
+    the results table (by job key), and empties it. Any log left from
+    the last run is compacted on startup.
+
+    Results are also held in memory, in the results dict (job key ->
+    result), so checking for a cached result is a dict lookup. Jobs
+    and results must be JSON serializable.
+    """
+
+    def __init__(self, path, compact_every=COMPACT_EVERY):
+        self.path = path
+        self.compact_every = compact_every
+
+        conn = self.connect()
+        conn.executescript(SCHEMA)
+        compact(conn)
+
+        self.results = {
+            key: json.loads(result)
+            for key, result in conn.execute("SELECT key, result FROM results")
+        }
+        self._unfinished = [
+            (job_id, json.loads(spec))
+            for job_id, spec in conn.execute(
+                "SELECT job_id, spec FROM jobs ORDER BY seq"
+            )
+        ]
+        conn.close()
+
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self.write_loop, daemon=True)
+        self._thread.start()
+
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        # Lets compaction return the space freed from the log to the OS
+        # (only takes effect when the database is created).
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        # SQLite's own write-ahead log, so writes only append to a file,
+        # and without a sync on every commit (still safe if we crash).
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def unfinished(self):
+        """
+        List of (job_id, spec) for the jobs which had not finished when
+        the store was last closed, in the order they were submitted.
+        """
+        return list(self._unfinished)
+
+    def submit(self, job_id, key, spec):
+        """
+        Record a new job. spec is whatever is needed to run it again.
+        """
+        self._queue.put((job_id, "submit", [key, spec]))
+
+    def complete(self, job_id, key, result):
+        """
+        Record a job as complete, and keep its result for the key.
+        """
+        self.results[key] = result
+        self._queue.put((job_id, "complete", [key, result]))
+
+    def fail(self, job_id):
+        """
+        Record a job as finished without a result, so it is not run
+        again.
+        """
+        self._queue.put((job_id, "fail", None))
+
+    def close(self):
+        """
+        Write everything waiting, compact the log and stop the thread.
+        """
+        self._queue.put(None)
+        self._thread.join()
+
+    def write_loop(self):
+        conn = self.connect()
+        (logged,) = conn.execute("SELECT COUNT(*) FROM log").fetchone()
+
+        running = True
+        while running:
+            events = [self._queue.get()]
+            # Take everything else waiting, to write in one transaction.
+            while True:
+                try:
+                    events.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if None in events:
+                running = False
+                events = [e for e in events if e is not None]
+
+            with conn:
+                conn.executemany(
+                    "INSERT INTO log (job_id, event, data) VALUES (?, ?, ?)",
+                    [
+                        (job_id, event, json.dumps(data))
+                        for job_id, event, data in events
+                    ],
+                )
+            logged += len(events)
+
+            if logged >= self.compact_every or not running:
+                compact(conn)
+                logged = 0
+
+        conn.close()
+
+
+def compact(conn):
+    """
+    Apply the events in the log to the jobs and results tables, and
+    empty the log, in one transaction. Then frees the space the log
+    used, and shrinks SQLite's WAL file.
+    """
+    with conn:
+        events = conn.execute(
+            "SELECT seq, job_id, event, data FROM log ORDER BY seq"
+        ).fetchall()
+        for seq, job_id, event, data in events:
+            if event == "submit":
+                key, spec = json.loads(data)
+                conn.execute(
+                    "INSERT OR REPLACE INTO jobs (seq, job_id, key, spec) "
+                    "VALUES (?, ?, ?, ?)",
+                    (seq, job_id, key, json.dumps(spec)),
+                )
+                continue
+
+            conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+            if event == "complete":
+                key, result = json.loads(data)
+                conn.execute(
+                    "INSERT OR REPLACE INTO results (key, result) "
+                    "VALUES (?, ?)",
+                    (key, json.dumps(result)),
+                )
+
+        if events:
+            conn.execute("DELETE FROM log WHERE seq <= ?", (events[-1][0],))
+
+    # With execute() this would only free one page.
+    conn.executescript("PRAGMA incremental_vacuum;")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
@@ -0,0 +1,122 @@
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, QTimer
+
+# Updates arriving within one frame (~60 Hz) are coalesced into one repaint.
+FRAME_INTERVAL = 16
+
+
+class JobTableModel(QAbstractListModel):
+    """
+    List model holding the state of a set of jobs, one job per row.
+
+    Rows are kept in an ordered list, with a dictionary mapping each
+    job_id to its row, so looking up a row (or a job) is O(1). Updates
+    only mark the changed row as dirty; the dirty rows are sent to the
+    view with dataChanged once per frame, rather than a layoutChanged
+    for every single update.
+
+    """
+
+    def __init__(self, interval=FRAME_INTERVAL):
+        super().__init__()
+
+        self._state = {}
+        self._rows = []  # job_id for each row, in display order.
+        self._row_index = {}  # job_id -> row number.
+        self._dirty = set()
+
+        self.flush_timer = QTimer()
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(interval)
+        self.flush_timer.timeout.connect(self.flush)
+
+    def add_job(self, job_id, state):
+        """
+        Append a new job (and its state dict) as the last row.
+        """
+        row = len(self._rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.append(job_id)
+        self._row_index[job_id] = row
+        self._state[job_id] = state
+        self.endInsertRows()
+
+    def update_job(self, job_id, **values):
+        """
+        Update values in the job state. The view is notified of the
+        change on the next frame.
+        """
+        state = self._state.get(job_id)
+        if state is None:
+            return
+        state.update(values)
+        self._dirty.add(self._row_index[job_id])
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush(self):
+        """
+        Notify the view of all rows changed since the last flush,
+        one dataChanged per contiguous run of rows.
+        """
+        self.flush_timer.stop()
+        if not self._dirty:
+            return
+
+        rows = sorted(self._dirty)
+        self._dirty.clear()
+
+        start = end = rows[0]
+        for row in rows[1:]:
+            if row != end + 1:
+                self.dataChanged.emit(self.index(start), self.index(end))
+                start = row
+            end = row
+        self.dataChanged.emit(self.index(start), self.index(end))
+
+    def remove_jobs(self, job_ids):
+        """
+        Remove the given jobs, one beginRemoveRows per contiguous run,
+        working backwards so earlier row numbers stay valid.
+        """
+        rows = sorted(
+            (
+                self._row_index[job_id]
+                for job_id in job_ids
+                if job_id in self._row_index
+            ),
+            reverse=True,
+        )
+        if not rows:
+            return
+
+        # Send any pending updates first, as row numbers are about to change.
+        self.flush()
+
+        end = start = rows[0]
+        for row in rows[1:] + [None]:
+            if row is not None and row == start - 1:
+                start = row
+                continue
+
+            self.beginRemoveRows(QModelIndex(), start, end)
+            for job_id in self._rows[start : end + 1]:
+                del self._state[job_id]
+            del self._rows[start : end + 1]
+            self.endRemoveRows()
+
+            end = start = row
+
+        # Renumber the remaining rows.
+        self._row_index = {job_id: n for n, job_id in enumerate(self._rows)}
+
+    def job_state(self, job_id):
+        return self._state[job_id]
+
+    # Model interface
+    def data(self, index, role):
+        if role == Qt.DisplayRole:
+            job_id = self._rows[index.row()]
+            return job_id, self._state[job_id]
+
+    def rowCount(self, index=None):
+        return len(self._rows)
@@ -0,0 +1,114 @@
+import numpy as np
+from PySide6.QtCore import QObject, QTimer
+
+# Redraw at most roughly 30 times per second.
+DEFAULT_INTERVAL = 33
+
+
+class Series:
+    """
+    The last `window` points of one line, in NumPy arrays of twice that
+    length. Points are appended at the end, and when it's full the
+    most recent are copied to the start of new arrays: one copy per
+    `window` points, rather than one per point.
+
+    view() is handed to setData, which keeps the arrays without copying
+    them, so points already in a view are never written over.
+    """
+
+    __slots__ = ("window", "x", "y", "start", "end")
+
+    def __init__(self, window):
+        self.window = window
+        self.x = np.empty(2 * window)
+        self.y = np.empty(2 * window)
+        self.start = 0
+        self.end = 0
+
+    def __len__(self):
+        return self.end - self.start
+
+    def extend(self, x, y):
+        x = np.asarray(x, np.float64)[-self.window :]
+        y = np.asarray(y, np.float64)[-self.window :]
+        n = len(x)
+        if self.end + n > len(self.x):
+            keep = min(len(self), self.window - n)
+            self.x = self._moved(self.x, keep)
+            self.y = self._moved(self.y, keep)
+            self.start, self.end = 0, keep
+        self.x[self.end : self.end + n] = x
+        self.y[self.end : self.end + n] = y
+        self.end += n
+        self.start = max(self.start, self.end - self.window)
+
+    def _moved(self, a, keep):
+        # The last `keep` points of a, at the start of a new array.
+        moved = np.empty_like(a)
+        moved[:keep] = a[self.end - keep : self.end]
+        return moved
+
+    def view(self):
+        return self.x[self.start : self.end], self.y[self.start : self.end]
+
+
+class LinePlotter(QObject):
+    """
+    Buffers points for many lines on a pyqtgraph plot, and updates them
+    on a frame timer: each line that received points since the last
+    frame gets a single setData, however many points arrived. Lines
+    are created when their first points are added.
+
+    Each line keeps only its last `window` points. make_pen, if given,
+    is called for the pen of each new line.
+    """
+
+    def __init__(
+        self,
+        plot_widget,
+        window=1000,
+        make_pen=None,
+        interval=DEFAULT_INTERVAL,
+    ):
+        super().__init__()
+        self.plot_widget = plot_widget
+        self.window = window
+        self.make_pen = make_pen
+
+        self.series = {}  # line_id -> Series
+        self.lines = {}  # line_id -> PlotDataItem
+        self._changed = set()
+
+        self.timer = QTimer()
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.flush)
+
+    def add(self, line_id, x, y):
+        """
+        Add points (sequences of x and y values) to a line. They are
+        shown on the next frame.
+        """
+        series = self.series.get(line_id)
+        if series is None:
+            series = self.series[line_id] = Series(self.window)
+        series.extend(x, y)
+        self._changed.add(line_id)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        """
+        Update every line changed since the last frame.
+        """
+        changed, self._changed = self._changed, set()
+        for line_id in changed:
+            x, y = self.series[line_id].view()
+            line = self.lines.get(line_id)
+            if line is None:
+                pen = self.make_pen() if self.make_pen else None
+                self.lines[line_id] = self.plot_widget.plot(x, y, pen=pen)
+            else:
+                line.setData(x, y)
+
+        if not changed:
+            self.timer.stop()  # Idle, restarted by the next add.
@@ -0,0 +1,169 @@
+import collections
+import time
+
+from PySide6.QtCore import QObject, QThreadPool, QTimer, Signal, Slot
+
+DEFAULT_MAXSIZE = 128
+
+
+def call_key(fn, args, kwargs):
+    """
+    Key for a call of fn with the given arguments, or None if the
+    arguments can't be hashed (so the call can't be cached).
+    """
+    key = (fn, args, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+class Flight(QObject):
+    """
+    One run of a function, shared by all the workers asking for the
+    same call while it runs. Receives the running worker's signals on
+    the GUI thread, and passes them on to the waiting workers.
+    """
+
+    def __init__(self, executor, key, worker):
+        super().__init__(executor)
+        self.executor = executor
+        self.key = key
+        self.waiters = []
+
+        worker.signals.result.connect(self.receive_result)
+        worker.signals.error.connect(self.receive_error)
+        worker.signals.finished.connect(self.receive_finished)
+
+    @Slot(object)
+    def receive_result(self, result):
+        self.executor.store(self.key, result)
+        for worker in self.waiters:
+            worker.signals.result.emit(result)
+
+    @Slot(tuple)
+    def receive_error(self, error):
+        # Errors aren't cached, the next call will run again.
+        for worker in self.waiters:
+            worker.signals.error.emit(error)
+
+    @Slot()
+    def receive_finished(self):
+        for worker in self.waiters:
+            worker.signals.finished.emit()
+        self.executor.landed(self)
+        self.deleteLater()
+
+
+class MemoExecutor(QObject):
+    """
+    Runs generic Workers (fn, *args, **kwargs) on a thread pool,
+    remembering their results, so calling the same function with the
+    same arguments again is answered from the cache without running it.
+
+    The cache holds at most maxsize results, dropping the least recently
+    used, and each result expires ttl seconds after it was stored (None,
+    never). Only successful results are cached, and arguments must be
+    hashable (calls with unhashable arguments are always run).
+
+    If a call is already running, a worker for the same call waits for
+    it and gets the same result, rather than running it again.
+
+    Cached results are delivered through the worker's own signals, from
+    the GUI thread, on the next pass of the event loop, so a worker's
+    connections work the same whether it ran or not.
+
+    Supported signals are:
+
+    status
+        `str` summary of the hits, misses and shared calls
+
+    """
+
+    status = Signal(str)
+
+    def __init__(self, threadpool=None, maxsize=DEFAULT_MAXSIZE, ttl=None):
+        super().__init__()
+        self.threadpool = threadpool or QThreadPool.globalInstance()
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self._cache = collections.OrderedDict()  # key -> (expires, result)
+        self._flights = {}  # key -> Flight, for calls running now.
+
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+
+    def start(self, worker):
+        """
+        Start the worker, unless its result is cached or the same call
+        is already running.
+        """
+        key = call_key(worker.fn, worker.args, worker.kwargs)
+        if key is None:
+            self.misses += 1
+            self.notify_status()
+            self.threadpool.start(worker)
+            return
+
+        found, result = self.lookup(key)
+        if found:
+            self.hits += 1
+            QTimer.singleShot(0, lambda: self.deliver(worker, result))
+
+        elif key in self._flights:
+            self.shared += 1
+            self._flights[key].waiters.append(worker)
+
+        else:
+            self.misses += 1
+            self._flights[key] = Flight(self, key, worker)
+            self.threadpool.start(worker)
+
+        self.notify_status()
+
+    def lookup(self, key):
+        """
+        Return (True, result) if the key is in the cache and has not
+        expired, otherwise (False, None).
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            return False, None
+
+        expires, result = entry
+        if expires is not None and expires < time.monotonic():
+            del self._cache[key]
+            return False, None
+
+        self._cache.move_to_end(key)
+        return True, result
+
+    def store(self, key, result):
+        expires = None
+        if self.ttl is not None:
+            expires = time.monotonic() + self.ttl
+
+        self._cache[key] = expires, result
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+    def landed(self, flight):
+        del self._flights[flight.key]
+
+    def deliver(self, worker, result):
+        worker.signals.result.emit(result)
+        worker.signals.finished.emit()
+
+    def clear(self):
+        self._cache.clear()
+
+    def notify_status(self):
+        self.status.emit(
+            "Cache: {} hits, {} misses, {} shared".format(
+                self.hits, self.misses, self.shared
+            )
+        )
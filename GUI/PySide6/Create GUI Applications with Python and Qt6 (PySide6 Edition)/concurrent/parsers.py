@@ -0,0 +1,207 @@
+import codecs
+import importlib
+import re
+
+progress_re = re.compile(r"Total complete: (\d+)%")
+total_re = re.compile(r"Total time: (\d\d:\d\d:\d\d)")
+elapsed_re = re.compile(r"Elapsed time: (\d\d:\d\d:\d\d)")
+
+
+def timestr_to_seconds(s):
+    """
+    Convert a string in the format 00:00:00 into seconds.
+    """
+    hours, minutes, seconds = s.split(":")
+    hours = int(hours) * 3600
+    minutes = int(minutes) * 60
+    seconds = int(seconds)
+    return hours + minutes + seconds
+
+
+# Parsers are passed blocks of output containing only complete lines,
+# and make a single pass over each block.
+
+
+class PercentParser:
+    """
+    Matches lines using the progress_re regex, returning a single
+    integer for the latest % progress.
+    """
+
+    def parse(self, output):
+        m = progress_re.findall(output)
+        if m:
+            # Get the last match (latest result) using -1 on the list.
+            return int(m[-1])
+
+
+class VarsParser:
+    """
+    Extracts variables from lines, looking for lines containing an
+    equals, and splitting into key=value.
+    """
+
+    def parse(self, output):
+        return dict(
+            s.split("=", 1) for s in output.splitlines() if "=" in s
+        )
+
+
+class TimePercentParser:
+    """
+    Tracks the total time and the latest elapsed time across calls, and
+    uses them to calculate a % complete. Output is only seen once, so
+    the work done per call depends only on the new output.
+    """
+
+    def __init__(self):
+        self.total_time = None
+        self.elapsed_time = None
+
+    def parse(self, output):
+        if self.total_time is None:
+            m = total_re.search(output)
+            if m:
+                # Should only be one of these.
+                self.total_time = timestr_to_seconds(m.group(1))
+
+        m = elapsed_re.findall(output)
+        if m:
+            self.elapsed_time = timestr_to_seconds(m[-1])
+
+        # If we have both the latest, and the target, we can calculate %.
+        if self.total_time and self.elapsed_time:
+            return int(100 * self.elapsed_time / self.total_time)
+
+
+class FunctionParser:
+    """
+    Wraps a plain parser function, which takes a string of output.
+    """
+
+    def __init__(self, fn):
+        self.fn = fn
+
+    def parse(self, output):
+        return self.fn(output)
+
+
+def parser_names(parsers):
+    """
+    Convert a list of (parser, signal_name) tuples to names, so a job's
+    parsers can be saved and found again with load_parsers. Parsers
+    must be importable, i.e. classes or functions defined in a module.
+    """
+    names = []
+    for parser, signal_name in parsers or []:
+        if isinstance(parser, FunctionParser):
+            parser = parser.fn
+        elif not isinstance(parser, type) and hasattr(parser, "parse"):
+            parser = type(parser)
+        name = "{}:{}".format(parser.__module__, parser.__qualname__)
+        names.append((name, signal_name))
+    return names
+
+
+def load_parsers(names):
+    """
+    Reverse of parser_names, importing each parser by name.
+    """
+    parsers = []
+    for name, signal_name in names:
+        module, _, qualname = name.partition(":")
+        parser = importlib.import_module(module)
+        for attr in qualname.split("."):
+            parser = getattr(parser, attr)
+        parsers.append((parser, signal_name))
+    return parsers
+
+
+class LineBuffer:
+    """
+    Decodes a stream of bytes incrementally, returning only complete
+    lines. A partial line is held until the rest arrives. Each byte is
+    only decoded once, and the search for a newline only looks back
+    from the end of each new chunk.
+    """
+
+    def __init__(self, encoding="utf8"):
+        self._decoder = codecs.getincrementaldecoder(encoding)(
+            errors="replace"
+        )
+        self._partial = []  # Pieces of the current incomplete line.
+
+    def feed(self, data):
+        text = self._decoder.decode(data)
+        end = text.rfind("\n") + 1
+        if not end:
+            if text:
+                self._partial.append(text)
+            return ""
+
+        self._partial.append(text[:end])
+        output = "".join(self._partial)
+
+        rest = text[end:]
+        self._partial = [rest] if rest else []
+        return output
+
+    def close(self):
+        """
+        Return whatever is left, as a final line.
+        """
+        self._partial.append(self._decoder.decode(b"", final=True))
+        output = "".join(self._partial)
+        self._partial = []
+        return output
+
+
+class ParserPipeline:
+    """
+    Per-job pipeline: a line buffer for each output channel, feeding the
+    complete lines to each parser in turn.
+
+    :param parsers: list of (parser, signal_name) tuples. A parser is
+        either a class with a parse(output) method, instantiated for the
+        job so it can hold state, or a plain function taking a string.
+
+    feed() and close() return a list of (signal_name, result) tuples
+    for each parser which produced a result.
+    """
+
+    def __init__(self, parsers, encoding="utf8"):
+        self.encoding = encoding
+        self.parsers = []
+        for parser, signal_name in parsers:
+            if isinstance(parser, type):
+                parser = parser()
+            elif not hasattr(parser, "parse"):
+                parser = FunctionParser(parser)
+            self.parsers.append((parser, signal_name))
+
+        self._buffers = {}  # channel -> LineBuffer
+
+    def feed(self, data, channel=None):
+        buffer = self._buffers.get(channel)
+        if buffer is None:
+            buffer = self._buffers[channel] = LineBuffer(self.encoding)
+        return self._parse(buffer.feed(data))
+
+    def close(self):
+        # Each channel's unterminated last line is parsed on its own, so
+        # the tails of stdout and stderr aren't run together.
+        results = []
+        for buffer in self._buffers.values():
+            results.extend(self._parse(buffer.close()))
+        return results
+
+    def _parse(self, output):
+        results = []
+        if not output:
+            return results
+
+        for parser, signal_name in self.parsers:
+            result = parser.parse(output)
+            if result:
+                results.append((signal_name, result))
+        return results
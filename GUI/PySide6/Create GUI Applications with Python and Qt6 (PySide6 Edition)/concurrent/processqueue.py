@@ -0,0 +1,311 @@
+import collections
+import os
+import time
+
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QModelIndex,
+    QObject,
+    QProcess,
+    Qt,
+    QTimer,
+    Signal,
+)
+
+KILL_GRACE = 2000  # msecs between asking a process to stop, and killing it.
+
+
+class ProcessMetrics(QAbstractTableModel):
+    """
+    Table model of (metric, value) rows, for displaying the state of a
+    ProcessQueue in a QTableView. Rows are added the first time a metric
+    is set (e.g. for each new exit code), and after that only the value
+    cell is updated.
+    """
+
+    headers = ["Metric", "Value"]
+
+    def __init__(self):
+        super().__init__()
+        self._rows = []  # [name, value]
+        self._row_index = {}  # name -> row
+
+    def set(self, name, value):
+        row = self._row_index.get(name)
+        if row is None:
+            row = len(self._rows)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._rows.append([name, value])
+            self._row_index[name] = row
+            self.endInsertRows()
+
+        elif self._rows[row][1] != value:
+            self._rows[row][1] = value
+            index = self.index(row, 1)
+            self.dataChanged.emit(index, index)
+
+    def value(self, name, default=None):
+        row = self._row_index.get(name)
+        if row is None:
+            return default
+        return self._rows[row][1]
+
+    # Model interface
+    def data(self, index, role):
+        if role == Qt.DisplayRole:
+            value = self._rows[index.row()][index.column()]
+            if isinstance(value, float):
+                return "%.1f" % value
+            return value
+
+    def headerData(self, section, orientation, role):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+
+    def rowCount(self, index=None):
+        return len(self._rows)
+
+    def columnCount(self, index=None):
+        return len(self.headers)
+
+
+class ProcessQueue(QObject):
+    """
+    Starts QProcess jobs, with at most max_processes running at once.
+    Other jobs wait in a first-in first-out pending queue, and are
+    started as running processes finish.
+
+    A job may have a timeout (in seconds, counted from when the process
+    is started). A job which runs over is asked to terminate, and if it
+    is still running KILL_GRACE msecs later, it is killed.
+
+    Metrics (queue depth, spawn latency, exit codes...) are kept in a
+    ProcessMetrics model, in .metrics.
+
+    Supported signals are:
+
+    started
+        `str` job_id, the process has started
+
+    finished
+        `str` job_id, `int` exit code, `QProcess.ExitStatus` exit status.
+        Also emitted (with exit code -1) for a process which failed to
+        start, so every job submitted finishes exactly once.
+
+    timed_out
+        `str` job_id, the process ran over its timeout and is being
+        stopped
+
+    """
+
+    started = Signal(str)
+    finished = Signal(str, int, object)
+    timed_out = Signal(str)
+
+    def __init__(self, max_processes=None):
+        super().__init__()
+
+        self.max_processes = max_processes or os.cpu_count() or 1
+
+        # (job_id, process, command, arguments, timeout)
+        self._pending = collections.deque()
+        self._running = {}  # job_id -> QProcess
+        self._timers = {}  # job_id -> timeout QTimer
+
+        self._enqueued_at = {}
+        self._spawned_at = {}
+        self._started_at = {}  # Tracer times, only while tracing.
+
+        # Optional profiler.Tracer, to record queue wait, spawn and run
+        # times.
+        self.tracer = None
+
+        self._n_started = 0
+        self._total_wait = 0.0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+        self._max_depth = 0
+        self._exit_codes = collections.Counter()  # metric name -> count
+
+        self.metrics = ProcessMetrics()
+        for name in [
+            "Pending",
+            "Running",
+            "Max processes",
+            "Max queue depth",
+            "Started",
+            "Queue wait (ms, mean)",
+            "Spawn latency (ms, mean)",
+            "Spawn latency (ms, max)",
+            "Timed out",
+            "Failed to start",
+        ]:
+            self.metrics.set(name, 0)
+        self.update_metrics()
+
+    def resize(self, n):
+        """
+        Change the number of processes allowed to run at once. If it
+        grows, pending jobs are started immediately; if it shrinks,
+        running processes are left to finish.
+        """
+        self.max_processes = max(1, n)
+        self.dispatch()
+
+    def submit(self, job_id, process, command, arguments, timeout=None):
+        """
+        Queue a (not yet started) QProcess to run command with arguments.
+        """
+        process.started.connect(lambda: self.job_started(job_id))
+        process.finished.connect(
+            lambda exit_code, exit_status: self.job_finished(
+                job_id, exit_code, exit_status
+            )
+        )
+        process.errorOccurred.connect(
+            lambda error: self.job_error(job_id, error)
+        )
+
+        self._pending.append((job_id, process, command, arguments, timeout))
+        self._enqueued_at[job_id] = time.monotonic()
+        self._max_depth = max(self._max_depth, len(self._pending))
+        self.dispatch()
+
+    def dispatch(self):
+        """
+        Start pending jobs while there are free process slots.
+        """
+        while self._pending and len(self._running) < self.max_processes:
+            job_id, process, command, arguments, timeout = (
+                self._pending.popleft()
+            )
+            self._running[job_id] = process
+
+            if timeout:
+                timer = QTimer()
+                timer.setSingleShot(True)
+                timer.timeout.connect(
+                    lambda job_id=job_id: self.expire(job_id)
+                )
+                timer.start(int(timeout * 1000))
+                self._timers[job_id] = timer
+
+            self._spawned_at[job_id] = time.monotonic()
+            process.start(command, arguments)
+
+        self.update_metrics()
+
+    def job_started(self, job_id):
+        now = time.monotonic()
+        wait = self._spawned_at[job_id] - self._enqueued_at.pop(job_id)
+        latency = now - self._spawned_at.pop(job_id)
+
+        self._n_started += 1
+        self._total_wait += wait
+        self._total_latency += latency
+        self._max_latency = max(self._max_latency, latency)
+
+        if self.tracer is not None:
+            end = self._started_at[job_id] = self.tracer.now()
+            self.tracer.record(
+                "queue wait",
+                "job",
+                end - latency - wait,
+                end - latency,
+                job=job_id,
+            )
+            self.tracer.record("spawn", "job", end - latency, end, job=job_id)
+
+        self.started.emit(job_id)
+        self.update_metrics()
+
+    def job_error(self, job_id, error):
+        # A process which fails to start never emits finished.
+        if error == QProcess.FailedToStart and job_id in self._running:
+            self.metrics.set(
+                "Failed to start", self.metrics.value("Failed to start") + 1
+            )
+            self.job_finished(job_id, -1, QProcess.CrashExit)
+
+    def job_finished(self, job_id, exit_code, exit_status):
+        if self._running.pop(job_id, None) is None:
+            return
+
+        timer = self._timers.pop(job_id, None)
+        if timer:
+            timer.stop()
+        self._enqueued_at.pop(job_id, None)
+        self._spawned_at.pop(job_id, None)
+
+        start = self._started_at.pop(job_id, None)
+        if self.tracer is not None and start is not None:
+            end = self.tracer.now()
+            self.tracer.record("run", "job", start, end, job=job_id)
+
+        if exit_status == QProcess.CrashExit:
+            self._exit_codes["Crashed"] += 1
+        else:
+            self._exit_codes["Exit code {}".format(exit_code)] += 1
+
+        self.finished.emit(job_id, exit_code, exit_status)
+        self.dispatch()
+
+    def expire(self, job_id):
+        if job_id not in self._running:
+            return
+
+        self.metrics.set("Timed out", self.metrics.value("Timed out") + 1)
+        self.timed_out.emit(job_id)
+        self.kill(job_id)
+
+    def kill(self, job_id):
+        """
+        Stop a job. A pending job is dropped from the queue, a running
+        process is asked to terminate, then killed if it is hung.
+        """
+        for n, job in enumerate(self._pending):
+            if job[0] == job_id:
+                del self._pending[n]
+                self._enqueued_at.pop(job_id, None)
+                self.finished.emit(job_id, -1, QProcess.CrashExit)
+                self.update_metrics()
+                return
+
+        process = self._running.get(job_id)
+        if process is None:
+            return
+
+        process.terminate()
+
+        def kill_if_hung():
+            if self._running.get(job_id) is process:
+                process.kill()
+
+        QTimer.singleShot(KILL_GRACE, kill_if_hung)
+
+    # Introspection
+    def running_count(self):
+        return len(self._running)
+
+    def waiting_count(self):
+        return len(self._pending)
+
+    def update_metrics(self):
+        metrics = self.metrics
+        metrics.set("Pending", len(self._pending))
+        metrics.set("Running", len(self._running))
+        metrics.set("Max processes", self.max_processes)
+        metrics.set("Max queue depth", self._max_depth)
+        metrics.set("Started", self._n_started)
+        if self._n_started:
+            metrics.set(
+                "Queue wait (ms, mean)",
+                1000 * self._total_wait / self._n_started,
+            )
+            metrics.set(
+                "Spawn latency (ms, mean)",
+                1000 * self._total_latency / self._n_started,
+            )
+            metrics.set("Spawn latency (ms, max)", 1000 * self._max_latency)
+        for name, count in self._exit_codes.items():
+            metrics.set(name, count)
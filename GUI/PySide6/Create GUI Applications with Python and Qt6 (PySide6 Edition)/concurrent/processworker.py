@@ -0,0 +1,220 @@
+import multiprocessing
+import queue
+import sys
+import threading
+import traceback
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from PySide6.QtCore import QObject, QRunnable, Signal, Slot
+
+# Set in each pool process by _init_process.
+_queue = None
+
+
+class WorkerSignals(QObject):
+    """
+    Defines the signals available from a running worker thread.
+
+    Supported signals are:
+
+    finished
+        No data
+
+    error
+        `tuple` (exctype, value, traceback.format_exc() )
+
+    result
+        `object` data returned from processing, anything
+
+    progress
+        `int` indicating % progress
+
+    """
+
+    finished = Signal()
+    error = Signal(tuple)
+    result = Signal(object)
+    progress = Signal(int)
+
+
+class RemoteSignal:
+    """
+    Stands in for a Signal inside a pool process. emit() sends the
+    values back to the GUI process over the pool's queue.
+    """
+
+    def __init__(self, key, name):
+        self.key = key
+        self.name = name
+
+    def emit(self, *args):
+        _queue.put((self.key, self.name, args))
+
+
+class RemoteSignals:
+    """
+    Passed to the callback as `signals` inside the pool process, so the
+    same callback works with both Worker and ProcessWorker.
+    """
+
+    def __init__(self, key):
+        self.progress = RemoteSignal(key, "progress")
+
+
+def _init_process(queue):
+    global _queue
+    _queue = queue
+
+
+def _ran(future):
+    """
+    Whether the job got as far as _call in a pool process, which sends
+    its own done marker. Any other exception (the callback or its
+    arguments couldn't be pickled, the process crashed) means it never
+    ran, and no marker is coming.
+    """
+    if future.cancelled():
+        return False
+    exception = future.exception()
+    return exception is None or getattr(exception, "job_ran", False)
+
+
+def _call(key, fn, args, kwargs):
+    kwargs["signals"] = RemoteSignals(key)
+    try:
+        return fn(*args, **kwargs)
+    except BaseException as e:
+        e.job_ran = True  # Pickled back with the exception.
+        raise
+    finally:
+        # Sent after all progress from this job, on the same queue.
+        _queue.put((key, None, None))
+
+
+class ProcessPool:
+    """
+    A ProcessPoolExecutor, plus a queue and relay thread to pass
+    progress from the pool processes back to the job which sent it.
+
+    Processes are started with "spawn", as forking a process which is
+    running Qt threads is not safe. This means the callback must be
+    importable -- a module-level function -- and the script starting
+    the pool should be guarded with `if __name__ == "__main__":`.
+    """
+
+    def __init__(self, max_workers=None):
+        context = multiprocessing.get_context("spawn")
+        self.queue = context.Queue()
+        self.executor = ProcessPoolExecutor(
+            max_workers,
+            mp_context=context,
+            initializer=_init_process,
+            initargs=(self.queue,),
+        )
+        self._messages = {}  # key -> local queue of (name, args)
+
+        self.relay = threading.Thread(
+            target=self.relay_signals, daemon=True
+        )
+        self.relay.start()
+
+    def submit(self, fn, args, kwargs):
+        """
+        Submit a job, returning the future for its result and a queue
+        of (name, args) signal messages, ending with (None, None).
+        """
+        key = uuid.uuid4().hex
+        messages = self._messages[key] = queue.SimpleQueue()
+        future = self.executor.submit(_call, key, fn, args, kwargs)
+
+        def check_ran(future):
+            # Otherwise the runnable would wait for the marker forever.
+            if not _ran(future):
+                self._messages.pop(key, None)
+                messages.put((None, None))
+
+        future.add_done_callback(check_ran)
+        return future, messages
+
+    def relay_signals(self):
+        while True:
+            message = self.queue.get()
+            if message is None:
+                break
+            key, name, args = message
+            messages = self._messages.get(key)
+            if messages is None:
+                continue
+            if name is None:
+                del self._messages[key]
+            messages.put((name, args))
+
+    def shutdown(self):
+        self.executor.shutdown()
+        self.queue.put(None)
+        self.relay.join()
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def default_pool():
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ProcessPool()
+    return _default_pool
+
+
+class ProcessWorker(QRunnable):
+    """
+    Drop-in replacement for Worker, which runs the callback in a
+    separate process, so CPU-bound callbacks are not held up by the GIL.
+
+    The callback, its arguments and its result must be picklable. The
+    QRunnable itself only waits for the result on a pool thread.
+
+    :param callback: The function callback to run in a process. Supplied
+                     args and kwargs will be passed through to the runner.
+    :type callback: function
+    :param args: Arguments to pass to the callback function
+    :param kwargs: Keywords to pass to the callback function
+    :param pool: ProcessPool to use, defaults to a shared pool.
+
+    Progress is emitted from this runnable's thread (not the relay),
+    so it always arrives before the result and finished signals.
+    """
+
+    def __init__(self, fn, *args, pool=None, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.pool = pool
+        self.signals = WorkerSignals()
+
+    @Slot()
+    def run(self):
+        pool = self.pool or default_pool()
+        future, messages = pool.submit(self.fn, self.args, self.kwargs)
+
+        while True:
+            name, args = messages.get()
+            if name is None:
+                break
+            getattr(self.signals, name).emit(*args)
+
+        try:
+            result = future.result()
+        except Exception:
+            traceback.print_exc()
+            exctype, value = sys.exc_info()[:2]
+            self.signals.error.emit(
+                (exctype, value, traceback.format_exc())
+            )
+        else:
+            self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
@@ -0,0 +1,372 @@
+import collections
+import functools
+import json
+import os
+import threading
+import time
+
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QColor, QPainter
+from PySide6.QtWidgets import (
+    QDockWidget,
+    QFileDialog,
+    QHBoxLayout,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+# Events kept for exporting, older events are dropped.
+MAX_EVENTS = 200_000
+
+# Histogram buckets are powers of two in microseconds, up to ~35 minutes.
+N_BUCKETS = 32
+
+
+class SpanStats:
+    """
+    Count, total, maximum and a log2 histogram of the durations of one
+    kind of span. Adding a duration is O(1), so these are kept for every
+    span, even once its event has been dropped.
+    """
+
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * N_BUCKETS
+
+    def add(self, duration):
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        bucket = min(int(duration * 1e6).bit_length(), N_BUCKETS - 1)
+        self.buckets[bucket] += 1
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    def percentile(self, pc):
+        """
+        Upper bound of the bucket holding the given percentile.
+        """
+        target = self.count * pc / 100
+        seen = 0
+        for bucket, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= target:
+                return min((1 << bucket) / 1e6, self.max)
+        return self.max
+
+
+class Tracer:
+    """
+    Records spans (a name, a category, a start and end time, and the
+    thread) from any thread: per job, e.g. the time waiting in a queue
+    and running, and per slot, e.g. time spent in a slot or paint on
+    the GUI thread.
+
+    Statistics are kept per span name for the profiler panel, and the
+    most recent max_events spans can be exported as Chrome trace-event
+    JSON, to load into chrome://tracing or Perfetto.
+
+    Signal delivery latency is recorded by calling emitted(channel) just
+    before emitting, and delivered(channel, name) in the slot. Queued
+    signals from one sender arrive in order, so each delivery is matched
+    with the oldest emit on the same channel.
+    """
+
+    def __init__(self, max_events=MAX_EVENTS):
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._events = collections.deque(maxlen=max_events)
+        self._threads = {}  # thread ident -> name
+        self._emitted = {}  # channel -> deque of emit times.
+        self.stats = {}  # name -> SpanStats
+
+    now = staticmethod(time.perf_counter)
+
+    def record(self, name, category, start, end, **args):
+        """
+        Record a span, with times from now().
+        """
+        thread = threading.current_thread()
+        with self._lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = SpanStats()
+            stats.add(end - start)
+            self._events.append(
+                (name, category, start, end - start, thread.ident, args)
+            )
+            if thread.ident not in self._threads:
+                self._threads[thread.ident] = thread.name
+
+    def span(self, name, category, **args):
+        """
+        Context manager recording the time spent in a with block.
+        """
+        return Span(self, name, category, args)
+
+    def emitted(self, channel):
+        emitted = self._emitted.get(channel)
+        if emitted is None:
+            with self._lock:
+                emitted = self._emitted.setdefault(
+                    channel, collections.deque()
+                )
+        emitted.append(self.now())
+
+    def delivered(self, channel, name, **args):
+        emitted = self._emitted.get(channel)
+        if not emitted:
+            return
+        self.record(name, "signal", emitted.popleft(), self.now(), **args)
+
+    def forget(self, channel):
+        """
+        Drop a finished channel (e.g. when its job is done).
+        """
+        with self._lock:
+            self._emitted.pop(channel, None)
+
+    def reset(self):
+        with self._lock:
+            self._events.clear()
+            self.stats = {}
+
+    def export(self, path):
+        """
+        Write the recorded events as Chrome trace-event JSON.
+        """
+        pid = os.getpid()
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+
+        trace = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in threads.items()
+        ]
+        for name, category, start, duration, tid, args in events:
+            trace.append(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": (start - self._origin) * 1e6,
+                    "dur": duration * 1e6,
+                    "pid": pid,
+                    "tid": tid,
+                    "args": args,
+                }
+            )
+
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+
+
+class Span:
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = self.tracer.now()
+        return self
+
+    def __exit__(self, *exc):
+        end = self.tracer.now()
+        self.tracer.record(
+            self.name, self.category, self.start, end, **self.args
+        )
+
+
+def traced(method):
+    """
+    Decorator for methods of objects with a tracer attribute, recording
+    the time spent in each call (e.g. a slot or paint, on the GUI
+    thread). Does nothing extra while the tracer is None.
+    """
+    name = method.__qualname__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        tracer = self.tracer
+        if tracer is None:
+            return method(self, *args, **kwargs)
+
+        start = tracer.now()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            tracer.record(name, "gui", start, tracer.now())
+
+    return wrapper
+
+
+def format_time(seconds):
+    if seconds >= 1:
+        return "%.2f s" % seconds
+    if seconds >= 1e-3:
+        return "%.2f ms" % (seconds * 1e3)
+    return "%.0f us" % (seconds * 1e6)
+
+
+class Histogram(QWidget):
+    """
+    Bar chart of the log2 buckets of a SpanStats.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.stats = None
+        self.setMinimumHeight(120)
+
+    def set_stats(self, stats):
+        self.stats = stats
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), Qt.white)
+        if self.stats is None or not self.stats.count:
+            return
+
+        buckets = self.stats.buckets
+        used = [n for n, count in enumerate(buckets) if count]
+        first, last = used[0], used[-1]
+        n_bars = last - first + 1
+        tallest = max(buckets)
+
+        label_height = painter.fontMetrics().height()
+        height = self.height() - label_height
+        width = self.width() / n_bars
+
+        for i, bucket in enumerate(range(first, last + 1)):
+            bar = height * buckets[bucket] / tallest
+            painter.fillRect(
+                int(i * width) + 1,
+                int(height - bar),
+                max(1, int(width) - 2),
+                int(bar),
+                QColor("#1f78b4"),
+            )
+
+        # Label the smallest and largest buckets with their upper bound.
+        painter.setPen(Qt.black)
+        painter.drawText(0, self.height() - 2, format_time((1 << first) / 1e6))
+        right = format_time((1 << last) / 1e6)
+        painter.drawText(
+            self.width() - painter.fontMetrics().horizontalAdvance(right),
+            self.height() - 2,
+            right,
+        )
+
+
+class ProfilerPanel(QDockWidget):
+    """
+    Dockable panel showing the statistics of each kind of span recorded
+    by a tracer, refreshed twice a second, with a histogram of the
+    durations of the selected one. The recorded events can be exported
+    as a Chrome trace.
+    """
+
+    COLUMNS = ["Span", "Count", "Mean", "p50", "p95", "Max"]
+
+    def __init__(self, tracer, parent=None):
+        super().__init__("Profiler", parent)
+        self.tracer = tracer
+        self.selected = None
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.verticalHeader().hide()
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.itemSelectionChanged.connect(self.select)
+
+        self.histogram = Histogram()
+
+        export = QPushButton("Export trace...")
+        export.pressed.connect(self.export)
+        reset = QPushButton("Reset")
+        reset.pressed.connect(self.reset)
+
+        buttons = QHBoxLayout()
+        buttons.addWidget(export)
+        buttons.addWidget(reset)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.table)
+        layout.addWidget(self.histogram)
+        layout.addLayout(buttons)
+
+        w = QWidget()
+        w.setLayout(layout)
+        self.setWidget(w)
+
+        self.timer = QTimer()
+        self.timer.setInterval(500)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start()
+
+    def refresh(self):
+        if not self.isVisible():
+            return
+
+        stats = sorted(self.tracer.stats.items())
+        self.table.blockSignals(True)
+        self.table.setRowCount(len(stats))
+        for row, (name, s) in enumerate(stats):
+            values = [
+                name,
+                str(s.count),
+                format_time(s.mean),
+                format_time(s.percentile(50)),
+                format_time(s.percentile(95)),
+                format_time(s.max),
+            ]
+            for column, value in enumerate(values):
+                item = self.table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    self.table.setItem(row, column, item)
+                item.setText(value)
+            if name == self.selected:
+                self.table.selectRow(row)
+        self.table.blockSignals(False)
+
+        self.histogram.set_stats(self.tracer.stats.get(self.selected))
+
+    def select(self):
+        items = self.table.selectedItems()
+        if items:
+            self.selected = self.table.item(items[0].row(), 0).text()
+            self.histogram.set_stats(self.tracer.stats.get(self.selected))
+
+    def reset(self):
+        self.tracer.reset()
+        self.refresh()
+
+    def export(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export trace", "trace.json", "Trace files (*.json)"
+        )
+        if path:
+            self.tracer.export(path)
@@ -0,0 +1,131 @@
+from collections import deque
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+# Drain the bus roughly 30 times per second.
+DEFAULT_INTERVAL = 33
+
+
+class ProgressSlot:
+    """
+    Per-worker slot on the ProgressBus, written to from the worker thread.
+
+    Each slot has a single writer (the worker) and a single reader (the
+    GUI thread). Assigning an attribute and appending to a deque are
+    atomic in Python, so no locking is needed on either side.
+
+    """
+
+    __slots__ = ("value", "items", "finished")
+
+    def __init__(self):
+        self.value = None  # Latest progress value, older values dropped.
+        self.items = deque()  # Data items, all delivered in order.
+        self.finished = False
+
+    def progress(self, value):
+        self.value = value
+
+    def data(self, item):
+        self.items.append(item)
+
+    def finish(self):
+        self.finished = True
+
+
+class ProgressBus(QObject):
+    """
+    Collects progress and data from many workers, delivering them to the
+    GUI thread in batches on a timer, rather than one queued signal per
+    update.
+
+    Supported signals are:
+
+    progress
+        `dict` of job_id: latest progress, for jobs changed since last tick
+
+    data
+        `dict` of job_id: list of data items received since last tick
+
+    If a worker's WorkerSignals are passed to register, the bus will also
+    emit their progress, data and finished signals (from the GUI thread),
+    so existing connections to those signals keep working.
+
+    """
+
+    # Sent as object, as a dict signal would be converted to a QVariantMap.
+    progress = Signal(object)
+    data = Signal(object)
+
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        super().__init__()
+
+        self._slots = {}  # job_id -> (slot, signals)
+        self._last = {}  # job_id -> last delivered progress value.
+
+        self.timer = QTimer()
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.drain)
+
+    def register(self, job_id, signals=None):
+        """
+        Create a slot for a new job. Must be called from the GUI thread,
+        before the worker is started. The worker should write to the
+        returned slot, and call finish() on it when done.
+        """
+        slot = ProgressSlot()
+        self._slots[job_id] = slot, signals
+        if not self.timer.isActive():
+            self.timer.start()
+        return slot
+
+    def drain(self):
+        """
+        Read all slots and emit the changes as a single batch. Finished
+        jobs have their final values delivered, and are then removed.
+        """
+        progress = {}
+        data = {}
+        finished = []
+
+        for job_id, (slot, signals) in self._slots.items():
+            # Read finished first, so anything written before it is seen.
+            is_finished = slot.finished
+
+            value = slot.value
+            if value is not None and value != self._last.get(job_id):
+                progress[job_id] = self._last[job_id] = value
+
+            # Only take the items present now; the worker may be adding more.
+            n = len(slot.items)
+            if n:
+                data[job_id] = [slot.items.popleft() for _ in range(n)]
+
+            if is_finished:
+                finished.append(job_id)
+
+        if progress:
+            self.progress.emit(progress)
+        if data:
+            self.data.emit(data)
+
+        # Relay to the per-worker signals, for any existing connections.
+        for job_id, value in progress.items():
+            signals = self._slots[job_id][1]
+            if signals is not None and hasattr(signals, "progress"):
+                signals.progress.emit(job_id, value)
+
+        for job_id, items in data.items():
+            signals = self._slots[job_id][1]
+            if signals is not None and hasattr(signals, "data"):
+                for item in items:
+                    signals.data.emit(item)
+
+        for job_id in finished:
+            _, signals = self._slots.pop(job_id)
+            self._last.pop(job_id, None)
+            if signals is not None and hasattr(signals, "finished"):
+                signals.finished.emit(job_id)
+
+        if not self._slots:
+            self.timer.stop()
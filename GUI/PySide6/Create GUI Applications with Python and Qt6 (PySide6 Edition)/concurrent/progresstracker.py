@@ -0,0 +1,90 @@
+import collections
+import time
+
+
+class ProgressTracker:
+    """
+    Running total of the progress of a batch of jobs.
+
+    Each job has a weight (e.g. its expected amount of work), and the
+    total progress is the weighted mean of the jobs' progress. The sum
+    is kept up to date as each progress update arrives, by adding the
+    change for that job, so the cost of an update or of reading the
+    total does not depend on the number of jobs.
+
+    Finished jobs are dropped, but still count as complete towards the
+    batch, so the total never goes backwards. A new batch starts with
+    the first job added after every job has finished.
+
+    The ETA is based on the rate of progress over the last `window`
+    seconds.
+    """
+
+    def __init__(self, window=5.0):
+        self.window = window
+
+        self._jobs = {}  # job_id -> [weight, progress]
+        self._total = 0  # Sum of weights in the batch.
+        self._done = 0  # Sum of weight * progress / 100 in the batch.
+        self._samples = collections.deque()  # (time, done)
+
+    def add(self, job_id, weight=1):
+        if not self._jobs:
+            # All previous jobs have finished, start a new batch.
+            self._total = 0
+            self._done = 0
+            self._samples.clear()
+
+        self._jobs[job_id] = [weight, 0]
+        self._total += weight
+
+    def update(self, job_id, progress):
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        weight, previous = job
+        job[1] = progress
+        self._done += weight * (progress - previous) / 100
+
+    def finish(self, job_id):
+        """
+        Mark the job complete, and stop tracking it.
+        """
+        self.update(job_id, 100)
+        self._jobs.pop(job_id, None)
+        if not self._jobs:
+            self._done = self._total  # Drop any rounding error.
+
+    def __len__(self):
+        return len(self._jobs)
+
+    @property
+    def progress(self):
+        """
+        Total progress of the batch, from 0-100.
+        """
+        if not self._total:
+            return 0
+        return 100 * self._done / self._total
+
+    def eta(self):
+        """
+        Estimated seconds until the batch is complete, or None if there
+        is no recent progress to base it on. Call regularly (e.g. from
+        a timer) as each call also records a sample of the progress.
+        """
+        now = time.monotonic()
+        samples = self._samples
+        samples.append((now, self._done))
+        while now - samples[0][0] > self.window:
+            samples.popleft()
+
+        if not self._jobs:
+            return 0
+
+        start, done = samples[0]
+        if now == start or self._done == done:
+            return None
+
+        rate = (self._done - done) / (now - start)
+        return (self._total - self._done) / rate
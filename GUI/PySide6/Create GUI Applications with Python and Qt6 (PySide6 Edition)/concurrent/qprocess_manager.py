@@ -1,11 +1,14 @@
-import re
+import os
 import sys
 import uuid
 
 from PySide6.QtCore import (
+    SIGNAL,
     QAbstractListModel,
     QProcess,
+    QProcessEnvironment,
     QRect,
+    QStandardPaths,
     Qt,
     QTimer,
     Signal,
@@ -13,55 +16,50 @@ from PySide6.QtCore import (
 from PySide6.QtGui import QBrush, QColor, QPen
 from PySide6.QtWidgets import (
     QApplication,
+    QCheckBox,
     QListView,
     QMainWindow,
     QPlainTextEdit,
     QPushButton,
+    QSpinBox,
     QStyledItemDelegate,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
 
+from jobstore import JobStore, job_key
+from parsers import (
+    ParserPipeline,
+    PercentParser,
+    VarsParser,
+    load_parsers,
+    parser_names,
+)
+from processqueue import ProcessQueue
+from profiler import ProfilerPanel, Tracer, traced
+from sharedresult import PREFIX_ENV, SharedArrayParser, release_unclaimed
+from warmpool import WarmPool
+
+
+# Status of a job waiting in the queue, before its process is started.
+QUEUED = "queued"
+
 STATUS_COLORS = {
+    QUEUED: "#a6cee3",
     QProcess.NotRunning: "#b2df8a",
     QProcess.Starting: "#fdbf6f",
     QProcess.Running: "#33a02c",
 }
 
 STATES = {
+    QUEUED: "Queued",
     QProcess.NotRunning: "Not running",
     QProcess.Starting: "Starting...",
     QProcess.Running: "Running...",
 }
 
-DEFAULT_STATE = {"progress": 0, "status": QProcess.Starting}
-
-progress_re = re.compile("Total complete: (\d+)%", re.M)
-
-
-def simple_percent_parser(output):
-    """
-    Matches lines using the progress_re regex,
-    returning a single integer for the % progress.
-    """
-    m = progress_re.search(output)
-    if m:
-        pc_complete = m.group(1)
-        return int(pc_complete)
-
-
-def extract_vars(output):
-    """
-    Extracts variables from lines, looking for lines
-    containing an equals, and splitting into key=value.
-    """
-    data = {}
-    for s in output.splitlines():
-        if "=" in s:
-            name, value = s.split("=")
-            data[name] = value
-    return data
-
+DEFAULT_STATE = {"progress": 0, "status": QUEUED}
 
 
 class JobManager(QAbstractListModel):
@@ -70,19 +68,69 @@ class JobManager(QAbstractListModel):
     and progress parsers.
     Also functions as a Qt data model for a view
     displaying progress for each process.
-    """
 
-    _jobs = {}
-    _state = {}
-    _parsers = {}
+    Processes are started through a ProcessQueue, so at most
+    max_processes (default, the number of cores) run at once.
+
+    With warm enabled, Python scripts started with run_script are run
+    in a WarmPool of long-lived worker processes instead, skipping
+    interpreter startup. Their output goes through the same parsers.
+
+    If a JobStore is given, jobs are recorded in it as they are started
+    and finish, and resume() runs the jobs left unfinished when the
+    app exited again. A job started with cache=True, which must give
+    the same results for the same command (or script) and arguments,
+    is not run again if one which matches completed before: its
+    results are taken from the store.
+
+    Each job is told (through PREFIX_ENV) how to name any SharedArray
+    it creates, so that when it ends, those which weren't handed over
+    through the array signal are freed, e.g. if it was killed after
+    creating one but before printing its name. Arrays are freed at
+    once if nothing else is connected to the array signal.
+
+    With a profiler.Tracer, the queue wait and run time of each job,
+    and the time spent in the slots (including parsing output) and
+    painting, are recorded. Output is read from the process on the GUI
+    thread, and all the signals here are delivered directly, so unlike
+    WorkerManager there is no signal delivery latency to record.
+    """
 
     status = Signal(str)
     result = Signal(str, object)
+    # List of SharedArray, from a SharedArrayParser. The receiver owns
+    # the shared memory, and must release() it.
+    array = Signal(str, object)
     progress = Signal(str, int)
 
-    def __init__(self):
+    def __init__(
+        self, max_processes=None, warm=False, store=None, tracer=None
+    ):
         super().__init__()
 
+        self._jobs = {}
+        self._state = {}
+        self._parsers = {}
+
+        self.store = store
+        self._keys = {}  # job_id -> job key, for jobs in the store.
+        self._results = {}  # job_id -> list of results, while running.
+        self._claimed = {}  # job_id -> names of arrays handed over.
+
+        # Jobs wait in the queue until a process slot is free.
+        self.queue = ProcessQueue(max_processes)
+        self.queue.finished.connect(self.done)
+        self.queue.timed_out.connect(self.handle_timeout)
+
+        # Optional profiler.Tracer, recording job and slot timings.
+        self.tracer = tracer
+        self.queue.tracer = tracer
+
+        # Created when first enabled, as it starts its processes at once.
+        self.warm_pool = None
+        self.warm = False
+        self.set_warm(warm)
+
         self.status_timer = QTimer()
         self.status_timer.setInterval(100)
         self.status_timer.timeout.connect(self.notify_status)
@@ -90,18 +138,191 @@ class JobManager(QAbstractListModel):
 
         # Internal signal, to trigger update of progress via parser.
         self.progress.connect(self.handle_progress)
+        self.result.connect(self.handle_result)
+        self.array.connect(self.handle_array)
+
+    def set_warm(self, enabled):
+        if enabled and self.warm_pool is None:
+            self.warm_pool = WarmPool(self.queue.max_processes)
+            self.warm_pool.started.connect(self.handle_started)
+            self.warm_pool.output.connect(self.handle_output)
+            self.warm_pool.finished.connect(self.done)
+            self.warm_pool.timed_out.connect(self.handle_timeout)
+            self.warm_pool.tracer = self.tracer
+        self.warm = enabled
+
+    @property
+    def metrics(self):
+        return self.warm_pool.metrics if self.warm else self.queue.metrics
+
+    def resize(self, n):
+        """
+        Change the number of processes which can run at once.
+        """
+        self.queue.resize(n)
+        if self.warm_pool:
+            self.warm_pool.resize(n)
+
+    def shutdown(self):
+        if self.warm_pool:
+            self.warm_pool.shutdown()
 
     def notify_status(self):
-        n_jobs = len(self._jobs)
-        self.status.emit("{} jobs".format(n_jobs))
+        queues = [self.queue]
+        if self.warm_pool:
+            queues.append(self.warm_pool)
+        running = sum(q.running_count() for q in queues)
+        waiting = sum(q.waiting_count() for q in queues)
+        self.status.emit(
+            "{} running, {} waiting, {} processes".format(
+                running, waiting, self.queue.max_processes
+            )
+        )
 
-    def execute(self, command, arguments, parsers=None):
+    def new_job(self, parsers, spec=None, job_id=None):
         """
-        Execute a command by starting a new process.
+        Set up the state for a new job, and record it in the store.
+        Returns the job_id, or None if the job's results were in the
+        store, so there is nothing to run.
         """
+        job_id = job_id or uuid.uuid4().hex
+
+        if self.store is not None and spec is not None:
+            key = job_key(
+                spec.get("script"), spec.get("command"), spec["arguments"]
+            )
+            if spec["cache"] and key in self.store.results:
+                self.skip(job_id, key)
+                return None
+
+            self._keys[job_id] = key
+            if spec["cache"]:
+                self._results[job_id] = []  # Collected, to be kept.
+            spec["parsers"] = parser_names(parsers)
+            self.store.submit(job_id, key, spec)
 
-        job_id = uuid.uuid4().hex
+        # Anything left from an earlier run of the job (if resumed after
+        # the app was killed) would stop it creating its arrays.
+        release_unclaimed(array_prefix(job_id))
 
+        # Each job gets its own parsers, which keep state between reads.
+        self._parsers[job_id] = ParserPipeline(parsers or [])
+
+        # Set default status to waiting, 0 progress.
+        self._state[job_id] = DEFAULT_STATE.copy()
+
+        self.layoutChanged.emit()
+        return job_id
+
+    def skip(self, job_id, key):
+        """
+        Show a job as done, and emit its results from the store,
+        instead of running it.
+        """
+        results = self.store.results[key]
+        # Also clears the job from the store, if it is being resumed.
+        self.store.complete(job_id, key, results)
+
+        self._state[job_id] = {
+            "progress": 100,
+            "status": QProcess.NotRunning,
+            "cached": True,
+        }
+        self.layoutChanged.emit()
+        for result in results:
+            self.result.emit(job_id, result)
+
+    def resume(self):
+        """
+        Run the jobs in the store which were unfinished when the app
+        last exited again.
+        """
+        for job_id, spec in self.store.unfinished():
+            parsers = load_parsers(spec["parsers"])
+            if "script" in spec:
+                self.run_script(
+                    spec["script"],
+                    spec["arguments"],
+                    parsers,
+                    spec["timeout"],
+                    job_id=job_id,
+                    cache=spec.get("cache", False),
+                )
+            else:
+                self.execute(
+                    spec["command"],
+                    spec["arguments"],
+                    parsers,
+                    spec["timeout"],
+                    job_id=job_id,
+                    cache=spec.get("cache", False),
+                )
+
+    def run_script(
+        self,
+        script,
+        arguments=(),
+        parsers=None,
+        timeout=None,
+        job_id=None,
+        cache=False,
+    ):
+        """
+        Run a Python script, in the warm pool if enabled, otherwise in
+        a new `python` process. With cache, the results may be those of
+        an earlier run with the same arguments.
+        """
+        spec = {
+            "script": script,
+            "arguments": list(arguments),
+            "timeout": timeout,
+            "cache": cache,
+        }
+        job_id = self.new_job(parsers, spec, job_id)
+        if job_id is None:
+            return
+
+        if self.warm:
+            self.warm_pool.submit(
+                job_id,
+                script,
+                arguments,
+                timeout,
+                env={PREFIX_ENV: array_prefix(job_id)},
+            )
+        else:
+            self.start_process(
+                job_id, "python", [script, *arguments], timeout
+            )
+
+    def execute(
+        self,
+        command,
+        arguments,
+        parsers=None,
+        timeout=None,
+        job_id=None,
+        cache=False,
+    ):
+        """
+        Execute a command in a new process, once a process slot is free.
+        If timeout (seconds) is given, the process is stopped if it has
+        not finished in that time. With cache, the results may be those
+        of an earlier run with the same arguments.
+        """
+        spec = {
+            "command": command,
+            "arguments": list(arguments),
+            "timeout": timeout,
+            "cache": cache,
+        }
+        job_id = self.new_job(parsers, spec, job_id)
+        if job_id is None:
+            return
+
+        self.start_process(job_id, command, arguments, timeout)
+
+    def start_process(self, job_id, command, arguments, timeout):
         # By default, the signals do not have access to any information about
         # the process that sent it. So we use this constructor to annotate
         # each signal with a job_id.
@@ -109,58 +330,118 @@ class JobManager(QAbstractListModel):
         def fwd_signal(target):
             return lambda *args: target(job_id, *args)
 
-        self._parsers[job_id] = parsers or []
-
-        # Set default status to waiting, 0 progress.
-        self._state[job_id] = DEFAULT_STATE.copy()
-
-        p = QProcess()
+        # Parented, so it is not deleted when we drop it in done(), while
+        # still emitting the signal which called done().
+        p = QProcess(self)
+        env = QProcessEnvironment.systemEnvironment()
+        env.insert(PREFIX_ENV, array_prefix(job_id))
+        p.setProcessEnvironment(env)
         p.readyReadStandardOutput.connect(
-            fwd_signal(self.handle_output)
+            fwd_signal(self.handle_stdout)
         )
-        p.readyReadStandardError.connect(fwd_signal(self.handle_output))
+        p.readyReadStandardError.connect(fwd_signal(self.handle_stderr))
         p.stateChanged.connect(fwd_signal(self.handle_state))
-        p.finished.connect(fwd_signal(self.done))
 
         self._jobs[job_id] = p
 
-        p.start(command, arguments)
+        # The queue starts the process, and tells us when it is done.
+        self.queue.submit(job_id, p, command, arguments, timeout)
 
-        self.layoutChanged.emit()
+    def handle_stdout(self, job_id):
+        p = self._jobs[job_id]
+        data = bytes(p.readAllStandardOutput())
+        self.handle_output(job_id, data, "stdout")
 
-    def handle_output(self, job_id):
+    def handle_stderr(self, job_id):
         p = self._jobs[job_id]
-        stderr = bytes(p.readAllStandardError()).decode("utf8")
-        stdout = bytes(p.readAllStandardOutput()).decode("utf8")
-        output = stderr + stdout
-
-        parsers = self._parsers.get(job_id)
-        for parser, signal_name in parsers:
-            # Parse the data using each parser in turn.
-            result = parser(output)
-            if result:
-                # Look up the signal by name (using signal_name), and
-                # emit the parsed result.
-                signal = getattr(self, signal_name)
-                signal.emit(job_id, result)
+        data = bytes(p.readAllStandardError())
+        self.handle_output(job_id, data, "stderr")
+
+    @traced
+    def handle_output(self, job_id, data, channel):
+        # The pipeline buffers partial lines, parsing only complete ones.
+        results = self._parsers[job_id].feed(data, channel)
+        self.emit_results(job_id, results)
+
+    def emit_results(self, job_id, results):
+        for signal_name, result in results:
+            # Look up the signal by name (using signal_name), and
+            # emit the parsed result.
+            signal = getattr(self, signal_name)
+            signal.emit(job_id, result)
+
+    @traced
+    def handle_result(self, job_id, result):
+        results = self._results.get(job_id)
+        if results is not None:
+            results.append(result)
+
+    @traced
+    def handle_array(self, job_id, arrays):
+        # Shared memory can only be handed over once, so a job returning
+        # arrays can't be cached.
+        self._results.pop(job_id, None)
+        self._claimed.setdefault(job_id, set()).update(
+            shared.name for shared in arrays
+        )
+        # This slot is the first receiver; if it's the only one, nothing
+        # else will release them.
+        if self.receivers(SIGNAL("array(QString,PyObject)")) < 2:
+            for shared in arrays:
+                shared.release()
 
+    @traced
     def handle_progress(self, job_id, progress):
         self._state[job_id]["progress"] = progress
         self.layoutChanged.emit()
 
+    @traced
     def handle_state(self, job_id, state):
         self._state[job_id]["status"] = state
         self.layoutChanged.emit()
 
+    def handle_started(self, job_id):
+        # Jobs in the warm pool have no QProcess of their own.
+        self.handle_state(job_id, QProcess.Running)
+
+    @traced
+    def handle_timeout(self, job_id):
+        self._state[job_id]["timed_out"] = True
+        self.layoutChanged.emit()
+
+    @traced
     def done(self, job_id, exit_code, exit_status):
         """
         Task/worker complete. Remove it from the active workers
         dictionary. We leave it in worker_state, as this is used to
         to display past/complete workers too.
         """
-        del self._jobs[job_id]
+        # Read anything still waiting, then parse what is left after
+        # the last newline.
+        if job_id in self._jobs:
+            self.handle_stdout(job_id)
+            self.handle_stderr(job_id)
+            self._jobs.pop(job_id).deleteLater()
+
+        parsers = self._parsers.pop(job_id)
+        self.emit_results(job_id, parsers.close())
+        # The process has exited, so can't create any more.
+        release_unclaimed(array_prefix(job_id), self._claimed.pop(job_id, ()))
+
+        state = self._state[job_id]
+        state["status"] = QProcess.NotRunning
+        state["exit_code"] = exit_code
         self.layoutChanged.emit()
 
+        key = self._keys.pop(job_id, None)
+        if key is not None:
+            results = self._results.pop(job_id, None)
+            ok = exit_code == 0 and not state.get("timed_out")
+            if ok and results is not None:
+                self.store.complete(job_id, key, results)
+            else:
+                self.store.fail(job_id)
+
     def cleanup(self):
         """
         Remove any complete/failed workers from worker_state.
@@ -184,7 +465,15 @@ class JobManager(QAbstractListModel):
 
 
 
+def array_prefix(job_id):
+    # Short, as macOS limits shared memory names to 31 characters.
+    return "sa_{}".format(job_id[:16])
+
+
 class ProgressBarDelegate(QStyledItemDelegate):
+    tracer = None
+
+    @traced
     def paint(self, painter, option, index):
         # data is our status dict, containing progress, id, status
         job_id, data = index.model().data(index, Qt.DisplayRole)
@@ -204,9 +493,19 @@ class ProgressBarDelegate(QStyledItemDelegate):
 
             painter.fillRect(rect, brush)
 
+        text = job_id
+        if data.get("cached"):
+            text += "  (cached)"
+        elif data["status"] == QUEUED:
+            text += "  (queued)"
+        elif data.get("timed_out"):
+            text += "  (timed out)"
+        elif data.get("exit_code"):
+            text += "  (exit code {})".format(data["exit_code"])
+
         pen = QPen()
         pen.setColor(Qt.black)
-        painter.drawText(option.rect, Qt.AlignLeft, job_id)
+        painter.drawText(option.rect, Qt.AlignLeft, text)
 
 
 
@@ -215,16 +514,27 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
 
-        self.job = JobManager()
+        # Jobs are kept between runs, in the user's data folder (not
+        # the source folder).
+        folder = QStandardPaths.writableLocation(
+            QStandardPaths.AppLocalDataLocation
+        )
+        os.makedirs(folder, exist_ok=True)
+        self.store = JobStore(os.path.join(folder, "jobs.db"))
+        # Timings of the jobs and GUI, shown in the profiler panel.
+        self.tracer = Tracer()
+        self.job = JobManager(store=self.store, tracer=self.tracer)
 
         self.job.status.connect(self.statusBar().showMessage)
         self.job.result.connect(self.display_result)
+        self.job.array.connect(self.display_array)
 
         layout = QVBoxLayout()
 
         self.progress = QListView()
         self.progress.setModel(self.job)
         delegate = ProgressBarDelegate()
+        delegate.tracer = self.tracer
         self.progress.setItemDelegate(delegate)
 
         layout.addWidget(self.progress)
@@ -235,36 +545,104 @@ class MainWindow(QMainWindow):
         button = QPushButton("Run a command")
         button.pressed.connect(self.run_command)
 
+        array_button = QPushButton("Run an array job")
+        array_button.pressed.connect(self.run_array_command)
+
         clear = QPushButton("Clear")
         clear.pressed.connect(self.job.cleanup)
 
+        processes = QSpinBox()
+        processes.setPrefix("Processes: ")
+        processes.setRange(1, 64)
+        processes.setValue(self.job.queue.max_processes)
+        processes.valueChanged.connect(self.job.resize)
+
+        warm = QCheckBox("Use warm process pool")
+        warm.toggled.connect(self.toggle_warm)
+
+        self.timeout = QSpinBox()
+        self.timeout.setPrefix("Timeout: ")
+        self.timeout.setSuffix(" s")
+        self.timeout.setRange(0, 600)
+        self.timeout.setSpecialValueText("No timeout")
+
+        self.metrics = QTableView()
+        self.metrics.setModel(self.job.metrics)
+        self.metrics.horizontalHeader().setStretchLastSection(True)
+        self.metrics.verticalHeader().hide()
+
         layout.addWidget(self.text)
         layout.addWidget(button)
+        layout.addWidget(array_button)
         layout.addWidget(clear)
+        layout.addWidget(processes)
+        layout.addWidget(self.timeout)
+        layout.addWidget(warm)
+        layout.addWidget(self.metrics)
 
         w = QWidget()
         w.setLayout(layout)
 
         self.setCentralWidget(w)
 
+        self.profiler = ProfilerPanel(self.tracer, self)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.profiler)
+        self.profiler.hide()
+
+        view = self.menuBar().addMenu("&View")
+        view.addAction(self.profiler.toggleViewAction())
+
+        # Run any jobs still unfinished when the app last exited.
+        self.job.resume()
+
+    def toggle_warm(self, checked):
+        self.job.set_warm(checked)
+        self.metrics.setModel(self.job.metrics)
+
+    def closeEvent(self, event):
+        self.job.shutdown()
+        self.store.close()
+        super().closeEvent(event)
+
     # tag::startJob[]
     def run_command(self):
-        self.job.execute(
-            "python",
-            ["dummy_script.py"],
+        self.job.run_script(
+            "dummy_script.py",
             parsers=[
-                (simple_percent_parser, "progress"),
-                (extract_vars, "result"),
+                (PercentParser, "progress"),
+                (VarsParser, "result"),
             ],
+            timeout=self.timeout.value() or None,
         )
 
     # end::startJob[]
 
+    def run_array_command(self):
+        # The values come back in shared memory, only the name is
+        # passed in the output and parsed.
+        self.job.run_script(
+            "dummy_array_script.py",
+            ["10000000"],
+            parsers=[(SharedArrayParser, "array")],
+            timeout=self.timeout.value() or None,
+        )
+
     def display_result(self, job_id, data):
         self.text.appendPlainText("WORKER %s: %s" % (job_id, data))
 
+    def display_array(self, job_id, arrays):
+        for shared in arrays:
+            values = shared.array
+            self.text.appendPlainText(
+                "WORKER %s: %d values, mean %.4f"
+                % (job_id, values.size, values.mean())
+            )
+            del values
+            shared.release()
+
 
 app = QApplication(sys.argv)
+app.setApplicationName("qprocess_manager")  # Names its data folder.
 window = MainWindow()
 window.show()
 app.exec()
@@ -19,6 +19,9 @@ from PySide6.QtWidgets import (
 )
 import pyqtgraph as pg
 
+from lineplotter import LinePlotter
+from progressbus import ProgressBus
+
 
 class WorkerSignals(QObject):
     """
@@ -43,6 +46,7 @@ class Worker(QRunnable):
         super().__init__()
         self.worker_id = uuid.uuid4().hex  # Unique ID for this worker.
         self.signals = WorkerSignals()
+        self.progress_slot = None  # Set when registered on the bus.
 
     @Slot()
     def run(self):
@@ -58,25 +62,31 @@ class Worker(QRunnable):
             y = random.randint(0, 10)
             value += n * y2 - n * y
 
-            self.signals.data.emit((self.worker_id, n, value))  # <2>
+            self.progress_slot.data((self.worker_id, n, value))  # <2>
             time.sleep(delay)
 
+        self.progress_slot.finish()
+
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
 
         self.threadpool = QThreadPool()
-
-        self.x = {}  # Keep timepoints.
-        self.y = {}  # Keep data.
-        self.lines = {}  # Keep references to plotted lines, to update.
+        self.bus = ProgressBus()
+        self.bus.data.connect(self.receive_data)
 
         layout = QVBoxLayout()
         self.graphWidget = pg.PlotWidget()
         self.graphWidget.setBackground("w")
         layout.addWidget(self.graphWidget)
 
+        # Buffers the points for each worker's line, and updates the
+        # changed lines once per frame, keeping the last 1000 points.
+        self.plotter = LinePlotter(
+            self.graphWidget, window=1000, make_pen=self.new_pen
+        )
+
         button = QPushButton("Create New Worker")
         button.pressed.connect(self.execute)
 
@@ -91,38 +101,29 @@ class MainWindow(QMainWindow):
 
     def execute(self):
         worker = Worker()
-        worker.signals.data.connect(self.receive_data)
+        worker.progress_slot = self.bus.register(
+            worker.worker_id, worker.signals
+        )
 
         # Execute
         self.threadpool.start(worker)
 
     def receive_data(self, data):
-        worker_id, x, y = data  # <3>
-
-        if worker_id not in self.lines:
-            self.x[worker_id] = [x]
-            self.y[worker_id] = [y]
-
-            # Generate a random color.
-            pen = pg.mkPen(
-                width=2,
-                color=(
-                    random.randint(100, 255),
-                    random.randint(100, 255),
-                    random.randint(100, 255),
-                ),
-            )
-            self.lines[worker_id] = self.graphWidget.plot(
-                self.x[worker_id], self.y[worker_id], pen=pen
-            )
-            return
-
-        # Update existing plot/data
-        self.x[worker_id].append(x)
-        self.y[worker_id].append(y)
-
-        self.lines[worker_id].setData(
-            self.x[worker_id], self.y[worker_id]
+        # All points received since the last tick of the bus, from
+        # every worker, as a dict of worker_id: list of (worker_id, x, y).
+        for worker_id, points in data.items():
+            _, x, y = zip(*points)  # <3>
+            self.plotter.add(worker_id, x, y)
+
+    def new_pen(self):
+        # Generate a random color.
+        return pg.mkPen(
+            width=2,
+            color=(
+                random.randint(100, 255),
+                random.randint(100, 255),
+                random.randint(100, 255),
+            ),
         )
 
 
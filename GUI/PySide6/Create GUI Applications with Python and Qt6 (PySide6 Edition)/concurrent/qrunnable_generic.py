@@ -19,6 +19,8 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from memo import MemoExecutor
+
 
 def execute_this_fn():
     for _ in range(0, 5):
@@ -121,6 +123,11 @@ class MainWindow(QMainWindow):
             % self.threadpool.maxThreadCount()
         )
 
+        # Identical calls are run once, and their results reused for
+        # 30 seconds. Workers can still be started on the pool directly.
+        self.executor = MemoExecutor(self.threadpool, maxsize=64, ttl=30)
+        self.executor.status.connect(self.statusBar().showMessage)
+
         self.timer = QTimer()
         self.timer.setInterval(1000)
         self.timer.timeout.connect(self.recurring_timer)
@@ -140,8 +147,8 @@ class MainWindow(QMainWindow):
         worker.signals.result.connect(self.print_output)
         worker.signals.finished.connect(self.thread_complete)
 
-        # Execute
-        self.threadpool.start(worker)
+        # Execute, or take the result from the cache.
+        self.executor.start(worker)
 
     def recurring_timer(self):
         self.counter += 1
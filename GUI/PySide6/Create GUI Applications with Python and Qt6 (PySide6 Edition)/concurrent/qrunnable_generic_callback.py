@@ -19,6 +19,8 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from processworker import ProcessWorker
+
 
 def execute_this_fn(signals):
     for n in range(0, 5):
@@ -116,8 +118,12 @@ class MainWindow(QMainWindow):
         b = QPushButton("DANGER!")
         b.pressed.connect(self.oh_no)
 
+        bp = QPushButton("DANGER! (in a process)")
+        bp.pressed.connect(self.oh_no_process)
+
         layout.addWidget(self.l)
         layout.addWidget(b)
+        layout.addWidget(bp)
 
         w = QWidget()
         w.setLayout(layout)
@@ -156,12 +162,24 @@ class MainWindow(QMainWindow):
         # Execute
         self.threadpool.start(worker)
 
+    def oh_no_process(self):
+        # Same callback, run in a separate process to avoid the GIL.
+        worker = ProcessWorker(execute_this_fn)
+        worker.signals.result.connect(self.print_output)
+        worker.signals.finished.connect(self.thread_complete)
+        worker.signals.progress.connect(self.progress_fn)
+
+        # Execute
+        self.threadpool.start(worker)
+
     def recurring_timer(self):
         self.counter += 1
         self.l.setText("Counter: %d" % self.counter)
 
 
-app = QApplication(sys.argv)
-window = MainWindow()
-window.show()
-app.exec()
+# Guarded, as ProcessWorker processes re-import this script.
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    window = MainWindow()
+    window.show()
+    app.exec()
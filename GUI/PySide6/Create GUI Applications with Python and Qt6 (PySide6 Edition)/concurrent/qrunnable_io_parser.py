@@ -1,14 +1,8 @@
+import collections
 import re
 import sys
 
-import requests
-from PySide6.QtCore import (
-    QObject,
-    QRunnable,
-    QThreadPool,
-    Signal,
-    Slot,
-)
+from PySide6.QtCore import QObject, Signal
 from PySide6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -18,6 +12,9 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from dag import TaskGraph
+from fetcher import Fetcher
+
 
 class WorkerSignals(QObject):
     """
@@ -30,38 +27,25 @@ class WorkerSignals(QObject):
     data = Signal(tuple)
 
 
-class Worker(QRunnable):
+def count_words(data):
     """
-    Worker thread
-
-    Inherits from QRunnable to handle worker thread setup, signals
-    and wrap-up.
-
-    :param id: The id for this worker
-    :param url: The url to retrieve
+    Count the words in the text extracted from a page.
     """
-
-    def __init__(self, id, url, parsers):
-        super().__init__()
-        self.id = id
-        self.url = url
-        self.parsers = parsers
-
-        self.signals = WorkerSignals()
-
-    @Slot()
-    def run(self):
-        r = requests.get(self.url)
-
-        data = {}
-        for name, parser in self.parsers.items():  # <1>
-            m = parser.search(r.text)
-            if m:  # <2>
-                data[name] = m.group(1).strip()
-
-        self.signals.data.emit((self.id, data))
+    words = collections.Counter()
+    for tag, text in data.items():
+        if tag != "error":
+            words.update(re.findall(r"\w+", text.lower()))
+    return words
 
 
+def most_common(*counts):
+    """
+    Combine the word counts of all the pages, and return the top 10.
+    """
+    total = collections.Counter()
+    for words in counts:
+        total.update(words)
+    return total.most_common(10)
 
 
 class MainWindow(QMainWindow):
@@ -75,14 +59,30 @@ class MainWindow(QMainWindow):
             "https://courses.pythonguis.com/",
         ]
         # tag::init[]
-        self.parsers = {  # <1>
-            # Regular expression parsers, to extract data from the HTML.
-            "title": re.compile(
-                r"<title.*?>(.*?)<\/title>", re.M | re.S
-            ),
-            "h1": re.compile(r"<h1.*?>(.*?)<\/h1>", re.M | re.S),
-            "h2": re.compile(r"<h2.*?>(.*?)<\/h2>", re.M | re.S),
-        }
+        # One fetcher runs all the requests, on a background thread,
+        # reusing connections and extracting the title, h1 and h2 from
+        # each page as it arrives.
+        self.fetcher = Fetcher(limit_per_host=4, timeout=10, retries=2)
+        self.signals = WorkerSignals()
+        self.signals.data.connect(self.display_output)
+
+        # Fetch each page, count the words in it, then combine the
+        # counts. The fetches run on the fetcher's thread, the other
+        # steps on the thread pool, each starting as soon as the steps
+        # it needs are done, with the results passed along there.
+        self.graph = TaskGraph()
+        for n, url in enumerate(self.urls):
+            self.graph.add_future(
+                "fetch-%d" % n, self.fetcher.fetch, n, url, self.signals
+            )
+            self.graph.add("words-%d" % n, count_words, deps=["fetch-%d" % n])
+        self.graph.add(
+            "aggregate",
+            most_common,
+            deps=["words-%d" % n for n in range(len(self.urls))],
+        )
+        self.graph.result.connect(self.display_result)
+        self.graph.finished.connect(self.display_report)
         # end::init[]
 
         layout = QVBoxLayout()
@@ -101,27 +101,29 @@ class MainWindow(QMainWindow):
 
         self.setCentralWidget(w)
 
-        self.threadpool = QThreadPool()
-        print(
-            "Multithreading with maximum %d threads"
-            % self.threadpool.maxThreadCount()
-        )
-
     # tag::execute[]
     def execute(self):
-        for n, url in enumerate(self.urls):
-            worker = Worker(n, url, self.parsers)  # <1>
-            worker.signals.data.connect(self.display_output)
-
-            # Execute
-            self.threadpool.start(worker)
+        if not self.graph.running:
+            self.graph.run()  # <1>
 
     # end::execute[]
 
+    def closeEvent(self, event):
+        self.fetcher.close()
+        super().closeEvent(event)
+
     def display_output(self, data):
         id, s = data
         self.text.appendPlainText("WORKER %d: %s" % (id, s))
 
+    def display_result(self, name, result):
+        # The pages are shown as they arrive, through the signals.
+        if name == "aggregate":
+            self.text.appendPlainText("Most common words: %s" % (result,))
+
+    def display_report(self, report):
+        self.text.appendPlainText(str(report))
+
 
 app = QApplication(sys.argv)
 window = MainWindow()
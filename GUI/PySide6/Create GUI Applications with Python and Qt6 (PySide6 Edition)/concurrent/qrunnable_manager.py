@@ -1,13 +1,14 @@
+import os
 import random
 import sys
 import time
 import uuid
 
 from PySide6.QtCore import (
-    QAbstractListModel,
     QObject,
     QRect,
     QRunnable,
+    QStandardPaths,
     Qt,
     QThreadPool,
     QTimer,
@@ -21,11 +22,19 @@ from PySide6.QtWidgets import (
     QMainWindow,
     QPlainTextEdit,
     QPushButton,
+    QSpinBox,
     QStyledItemDelegate,
     QVBoxLayout,
     QWidget,
 )
 
+from jobstore import JobStore, job_key
+from jobtable import JobTableModel
+from profiler import ProfilerPanel, Tracer, traced
+from progressbus import ProgressBus
+from scheduler import DEFAULT_TAG, JobScheduler
+
+
 STATUS_WAITING = "waiting"
 STATUS_RUNNING = "running"
 STATUS_ERROR = "error"
@@ -94,13 +103,22 @@ class Worker(QRunnable):
 
         self.signals.status.emit(self.job_id, STATUS_WAITING)
 
+        # Progress is written to the bus, set when enqueued.
+        self.progress_slot = None
+        self.tracer = None
+
+    def emit_status(self, status):
+        if self.tracer is not None:
+            self.tracer.emitted(self.job_id)  # For the delivery latency.
+        self.signals.status.emit(self.job_id, status)
+
     @Slot()
     def run(self):
         """
         Initialize the runner function with passed args, kwargs.
         """
 
-        self.signals.status.emit(self.job_id, STATUS_RUNNING)
+        self.emit_status(STATUS_RUNNING)
 
         x, y = self.args
 
@@ -119,91 +137,199 @@ class Worker(QRunnable):
                 result.append(value)
 
                 # Pass out the current progress.
-                self.signals.progress.emit(self.job_id, n + 1)
+                self.progress_slot.progress(n + 1)
                 time.sleep(delay)
 
         except Exception as e:
             print(e)
             # We swallow the error and continue.
             self.signals.error.emit(self.job_id, str(e))
-            self.signals.status.emit(self.job_id, STATUS_ERROR)
+            self.emit_status(STATUS_ERROR)
 
         else:
             self.signals.result.emit(self.job_id, result)
-            self.signals.status.emit(self.job_id, STATUS_COMPLETE)
+            self.emit_status(STATUS_COMPLETE)
 
-        self.signals.finished.emit(self.job_id)
+        self.progress_slot.finish()
 
 
 
 
-class WorkerManager(QAbstractListModel):
+class WorkerManager(JobTableModel):
     """
     Manager to handle our worker queues and state.
     Also functions as a Qt data model for a view
     displaying progress for each worker.
 
-    """
+    If a JobStore is given, jobs are recorded in it as they are
+    enqueued and finish, and resume() re-queues the jobs left
+    unfinished when the app exited. Jobs enqueued with cache=True,
+    which must give the same result for the same arguments, are not
+    run again if one with matching arguments completed before: the
+    result is taken from the store. (Worker isn't such a job, its
+    result is random.)
 
-    _workers = {}
-    _state = {}
+    """
 
     status = Signal(str)
 
-    def __init__(self):
+    def __init__(self, store=None, tracer=None):
         super().__init__()
 
+        self._workers = {}
+
+        self.store = store
+        self._keys = {}  # job_id -> job key, for jobs in the store.
+        self._cached = set()  # job_ids whose results are kept.
+        self._results = {}  # job_id -> result, until status is complete.
+
         # Create a threadpool for our workers.
         self.threadpool = QThreadPool()
+        self.bus = ProgressBus()
         # self.threadpool.setMaxThreadCount(1)
         self.max_threads = self.threadpool.maxThreadCount()
         print(
             "Multithreading with maximum %d threads" % self.max_threads
         )
 
+        # Jobs wait in the scheduler until a pool thread is free.
+        self.scheduler = JobScheduler(self.threadpool)
+        self.scheduler.started.connect(self.receive_started)
+
+        # Optional profiler.Tracer, recording job and slot timings.
+        self.tracer = tracer
+        self.scheduler.tracer = tracer
+
         self.status_timer = QTimer()
         self.status_timer.setInterval(100)
         self.status_timer.timeout.connect(self.notify_status)
         self.status_timer.start()
 
     def notify_status(self):
-        n_workers = len(self._workers)
-        running = min(n_workers, self.max_threads)
-        waiting = max(0, n_workers - self.max_threads)
+        running = self.scheduler.running_count()
+        waiting = self.scheduler.waiting_count()
         self.status.emit(
             "{} running, {} waiting, {} threads".format(
                 running, waiting, self.max_threads
             )
         )
 
-    def enqueue(self, worker):
+    def resize(self, n):
         """
-        Enqueue a worker to run (at some point) by passing it to the QThreadPool.
+        Change the number of threads available to run workers.
         """
+        self.scheduler.resize(n)
+        self.max_threads = self.scheduler.max_threads
+
+    def enqueue(self, worker, priority=0, tag=DEFAULT_TAG, cache=False):
+        """
+        Enqueue a worker to run (at some point) by passing it to the
+        scheduler. Workers with a higher priority run first, and each
+        tag gets a fair share of the threads. With cache, the result
+        may be one from an earlier job with the same arguments.
+        """
+        if self.store is not None:
+            key = job_key(worker.args, worker.kwargs)
+            if cache and key in self.store.results:
+                self.skip(worker, key)
+                return
+
+            self._keys[worker.job_id] = key
+            if cache:
+                self._cached.add(worker.job_id)
+            self.store.submit(
+                worker.job_id,
+                key,
+                {
+                    "args": worker.args,
+                    "kwargs": worker.kwargs,
+                    "priority": priority,
+                    "tag": tag,
+                    "cache": cache,
+                },
+            )
+
         worker.signals.error.connect(self.receive_error)
+        worker.signals.result.connect(self.receive_result)
         worker.signals.status.connect(self.receive_status)
         worker.signals.progress.connect(self.receive_progress)
         worker.signals.finished.connect(self.done)
+        worker.progress_slot = self.bus.register(
+            worker.job_id, worker.signals
+        )
+        worker.tracer = self.tracer
 
-        self.threadpool.start(worker)
         self._workers[worker.job_id] = worker
 
         # Set default status to waiting, 0 progress.
-        self._state[worker.job_id] = DEFAULT_STATE.copy()
+        self.add_job(worker.job_id, DEFAULT_STATE.copy())
 
-        self.layoutChanged.emit()
+        self.scheduler.submit(worker.job_id, worker, priority, tag)
 
-    def receive_status(self, job_id, status):
-        self._state[job_id]["status"] = status
-        self.layoutChanged.emit()
+    def skip(self, worker, key):
+        """
+        Show a job as complete, with the result from the store, instead
+        of running it.
+        """
+        result = self.store.results[key]
+        # Also clears the job from the store, if it is being resumed.
+        self.store.complete(worker.job_id, key, result)
+
+        self.add_job(
+            worker.job_id,
+            {"progress": 100, "status": STATUS_COMPLETE, "cached": True},
+        )
+        worker.signals.result.emit(worker.job_id, result)
 
+    def resume(self, factory):
+        """
+        Re-queue the jobs in the store which were unfinished when the
+        app last exited. factory(*args, **kwargs) is called to create
+        a new worker for each. Returns the list of workers.
+        """
+        workers = []
+        for job_id, spec in self.store.unfinished():
+            worker = factory(*spec["args"], **spec["kwargs"])
+            worker.job_id = job_id
+            self.enqueue(
+                worker, spec["priority"], spec["tag"], spec.get("cache")
+            )
+            workers.append(worker)
+        return workers
+
+    @traced
+    def receive_started(self, job_id):
+        self.update_job(job_id, wait=self.scheduler.wait_time(job_id))
+
+    @traced
+    def receive_result(self, job_id, result):
+        if job_id in self._cached:
+            self._results[job_id] = result
+
+    @traced
+    def receive_status(self, job_id, status):
+        if self.tracer is not None:
+            self.tracer.delivered(job_id, "deliver status")
+        self.update_job(job_id, status=status)
+
+        # The result arrives before the complete status, so is ready.
+        if job_id in self._keys and status in (STATUS_COMPLETE, STATUS_ERROR):
+            key = self._keys.pop(job_id)
+            if status == STATUS_COMPLETE and job_id in self._cached:
+                self.store.complete(job_id, key, self._results.pop(job_id))
+            else:
+                # Finished, not to be run again, with no result to keep.
+                self.store.fail(job_id)
+            self._cached.discard(job_id)
+
+    @traced
     def receive_progress(self, job_id, progress):
-        self._state[job_id]["progress"] = progress
-        self.layoutChanged.emit()
+        self.update_job(job_id, progress=progress)
 
     def receive_error(self, job_id, message):
         print(job_id, message)
 
+    @traced
     def done(self, job_id):
         """
         Task/worker complete. Remove it from the active workers
@@ -211,32 +337,28 @@ class WorkerManager(QAbstractListModel):
         to display past/complete workers too.
         """
         del self._workers[job_id]
-        self.layoutChanged.emit()
+        if self.tracer is not None:
+            self.tracer.forget(job_id)
 
     def cleanup(self):
         """
         Remove any complete/failed workers from worker_state.
         """
-        for job_id, s in list(self._state.items()):
-            if s["status"] in (STATUS_COMPLETE, STATUS_ERROR):
-                del self._state[job_id]
-        self.layoutChanged.emit()
-
-    # Model interface
-    def data(self, index, role):
-        if role == Qt.DisplayRole:
-            # See below for the data structure.
-            job_ids = list(self._state.keys())
-            job_id = job_ids[index.row()]
-            return job_id, self._state[job_id]
-
-    def rowCount(self, index):
-        return len(self._state)
+        self.remove_jobs(
+            [
+                job_id
+                for job_id, s in self._state.items()
+                if s["status"] in (STATUS_COMPLETE, STATUS_ERROR)
+            ]
+        )
 
 
 
 
 class ProgressBarDelegate(QStyledItemDelegate):
+    tracer = None
+
+    @traced
     def paint(self, painter, option, index):
         # data is our status dict, containing progress, id, status
         job_id, data = index.model().data(index, Qt.DisplayRole)
@@ -256,9 +378,15 @@ class ProgressBarDelegate(QStyledItemDelegate):
 
             painter.fillRect(rect, brush)
 
+        text = job_id
+        if data.get("cached"):
+            text = "%s (cached)" % job_id
+        elif data.get("wait") is not None:
+            text = "%s (waited %.1fs)" % (job_id, data["wait"])
+
         pen = QPen()
         pen.setColor(Qt.black)
-        painter.drawText(option.rect, Qt.AlignLeft, job_id)
+        painter.drawText(option.rect, Qt.AlignLeft, text)
 
 
 
@@ -267,7 +395,16 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
 
-        self.workers = WorkerManager()
+        # Jobs are kept between runs, in the user's data folder (not
+        # the source folder).
+        folder = QStandardPaths.writableLocation(
+            QStandardPaths.AppLocalDataLocation
+        )
+        os.makedirs(folder, exist_ok=True)
+        self.store = JobStore(os.path.join(folder, "workers.db"))
+        # Timings of the jobs and GUI, shown in the profiler panel.
+        self.tracer = Tracer()
+        self.workers = WorkerManager(self.store, self.tracer)
 
         self.workers.status.connect(self.statusBar().showMessage)
 
@@ -276,6 +413,7 @@ class MainWindow(QMainWindow):
         self.progress = QListView()
         self.progress.setModel(self.workers)
         delegate = ProgressBarDelegate()
+        delegate.tracer = self.tracer
         self.progress.setItemDelegate(delegate)
 
         layout.addWidget(self.progress)
@@ -289,15 +427,32 @@ class MainWindow(QMainWindow):
         clear = QPushButton("Clear")
         clear.pressed.connect(self.workers.cleanup)
 
+        threads = QSpinBox()
+        threads.setPrefix("Threads: ")
+        threads.setRange(1, 64)
+        threads.setValue(self.workers.max_threads)
+        threads.valueChanged.connect(self.workers.resize)
+
         layout.addWidget(self.text)
         layout.addWidget(start)
         layout.addWidget(clear)
+        layout.addWidget(threads)
 
         w = QWidget()
         w.setLayout(layout)
 
         self.setCentralWidget(w)
 
+        self.profiler = ProfilerPanel(self.tracer, self)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.profiler)
+        self.profiler.hide()
+
+        view = self.menuBar().addMenu("&View")
+        view.addAction(self.profiler.toggleViewAction())
+
+        # Re-queue any jobs still unfinished when the app last exited.
+        self.workers.resume(self.resume_worker)
+
 
     # tag::startWorker[]
     def start_worker(self):
@@ -312,11 +467,22 @@ class MainWindow(QMainWindow):
 
     # end::startWorker[]
 
+    def resume_worker(self, x, y):
+        w = Worker(x, y)
+        w.signals.result.connect(self.display_result)
+        w.signals.error.connect(self.display_result)
+        return w
+
+    def closeEvent(self, event):
+        self.store.close()
+        super().closeEvent(event)
+
     def display_result(self, job_id, data):
         self.text.appendPlainText("WORKER %s: %s" % (job_id, data))
 
 
 app = QApplication(sys.argv)
+app.setApplicationName("qrunnable_manager")  # Names its data folder.
 window = MainWindow()
 window.show()
 app.exec()
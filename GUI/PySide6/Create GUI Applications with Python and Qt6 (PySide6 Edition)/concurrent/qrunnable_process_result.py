@@ -10,6 +10,7 @@ from PySide6.QtCore import (
 )
 from PySide6.QtWidgets import (
     QApplication,
+    QLabel,
     QLineEdit,
     QMainWindow,
     QPushButton,
@@ -18,6 +19,8 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from sharedresult import SharedArrayParser
+
 
 def extract_vars(output):
     """
@@ -35,6 +38,16 @@ def extract_vars(output):
     return data
 
 
+def extract_arrays(output):
+    """
+    Extracts variables, and attaches to the arrays the script left in
+    shared memory. Only their names are in the output, not the data.
+    """
+    data = extract_vars(output)
+    data["arrays"] = SharedArrayParser().parse(output) or []
+    return data
+
+
 class WorkerSignals(QObject):
     """
     Defines the signals available from a running worker thread.
@@ -109,6 +122,13 @@ class MainWindow(QMainWindow):
 
         layout.addWidget(btn_run)
 
+        btn_array = QPushButton("Generate data")
+        btn_array.clicked.connect(self.start_array)
+        layout.addWidget(btn_array)
+
+        self.array_summary = QLabel()
+        layout.addWidget(self.array_summary)
+
         w = QWidget()
         w.setLayout(layout)
         self.setCentralWidget(w)
@@ -132,6 +152,25 @@ class MainWindow(QMainWindow):
         self.website.setText(data["website"])
         self.number_of_lines.setValue(data["number_of_lines"])
 
+    def start_array(self):
+        self.array_runner = SubProcessWorker(
+            "python dummy_array_script.py 10000000",
+            process_result=extract_arrays,
+        )
+        self.array_runner.signals.result.connect(self.array_result)
+        self.threadpool.start(self.array_runner)
+
+    def array_result(self, data):
+        for shared in data["arrays"]:
+            # The array is a view onto the shared memory, not a copy.
+            values = shared.array
+            self.array_summary.setText(
+                "%d values, mean %.4f, max %.4f"
+                % (values.size, values.mean(), values.max())
+            )
+            del values
+            shared.release()  # Done with it, free the memory.
+
 
 app = QApplication(sys.argv)
 window = MainWindow()
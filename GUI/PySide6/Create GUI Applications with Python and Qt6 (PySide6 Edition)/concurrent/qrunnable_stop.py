@@ -1,5 +1,4 @@
 import sys
-import time
 
 from PySide6.QtCore import (
     QObject,
@@ -17,13 +16,12 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-
-class WorkerKilledException(Exception):
-    pass
+from jobcontrol import JobControl
 
 
 class WorkerSignals(QObject):
     progress = Signal(int)
+    killed = Signal(float)
 
 
 class JobRunner(QRunnable):
@@ -33,23 +31,20 @@ class JobRunner(QRunnable):
     def __init__(self):
         super().__init__()
 
-        self.is_killed = False  # <1>
+        self.control = JobControl()  # <1>
 
     @Slot()
     def run(self):
-        try:
+        with self.control:  # <3>
             for n in range(100):
                 self.signals.progress.emit(n + 1)
-                time.sleep(0.1)
-
-                if self.is_killed:  # <2>
-                    raise WorkerKilledException
+                self.control.sleep(0.1)  # <2>
 
-        except WorkerKilledException:
-            pass  # <3>
+        if self.control.kill_latency is not None:
+            self.signals.killed.emit(self.control.kill_latency)
 
     def kill(self):  # <4>
-        self.is_killed = True
+        self.control.kill()
 
 
 class MainWindow(QMainWindow):
@@ -78,6 +73,7 @@ class MainWindow(QMainWindow):
         # Create a runner
         self.runner = JobRunner()
         self.runner.signals.progress.connect(self.update_progress)
+        self.runner.signals.killed.connect(self.show_killed)
         self.threadpool.start(self.runner)
 
         btn_stop.pressed.connect(self.runner.kill)
@@ -85,6 +81,11 @@ class MainWindow(QMainWindow):
     def update_progress(self, n):
         self.progress.setValue(n)
 
+    def show_killed(self, latency):
+        self.status.showMessage(
+            "Stopped %.1f ms after kill" % (latency * 1000)
+        )
+
 
 app = QApplication(sys.argv)
 window = MainWindow()
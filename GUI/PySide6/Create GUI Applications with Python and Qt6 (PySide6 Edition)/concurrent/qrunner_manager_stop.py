@@ -1,7 +1,6 @@
 import random
 import subprocess
 import sys
-import time
 import traceback
 import uuid
 
@@ -30,6 +29,8 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from jobcontrol import JobControl, WorkerKilledException
+
 STATUS_WAITING = "waiting"
 STATUS_RUNNING = "running"
 STATUS_ERROR = "error"
@@ -73,10 +74,6 @@ class WorkerSignals(QObject):
     status = Signal(str, str)
 
 
-class WorkerKilledException(Exception):
-    pass
-
-
 class Worker(QRunnable):
     """
     Worker thread
@@ -103,7 +100,7 @@ class Worker(QRunnable):
 
         self.signals.status.emit(self.job_id, STATUS_WAITING)
 
-        self.is_killed = False
+        self.control = JobControl()
 
     @Slot()
     def run(self):
@@ -131,10 +128,7 @@ class Worker(QRunnable):
 
                 # Pass out the current progress.
                 self.signals.progress.emit(self.job_id, n + 1)
-                time.sleep(delay)
-
-                if self.is_killed:
-                    raise WorkerKilledException
+                self.control.sleep(delay)
 
         except WorkerKilledException:
             self.signals.status.emit(self.job_id, STATUS_STOPPED)
@@ -149,10 +143,11 @@ class Worker(QRunnable):
             self.signals.result.emit(self.job_id, result)
             self.signals.status.emit(self.job_id, STATUS_COMPLETE)
 
+        self.control.done()
         self.signals.finished.emit(self.job_id)
 
     def kill(self):
-        self.is_killed = True
+        self.control.kill()
 
 
 
@@ -165,14 +160,14 @@ class WorkerManager(QAbstractListModel):
 
     """
 
-    _workers = {}
-    _state = {}
-
     status = Signal(str)
 
     def __init__(self):
         super().__init__()
 
+        self._workers = {}
+        self._state = {}
+
         # Create a threadpool for our workers.
         self.threadpool = QThreadPool()
         # self.threadpool.setMaxThreadCount(1)
@@ -228,7 +223,12 @@ class WorkerManager(QAbstractListModel):
         dictionary. We leave it in worker_state, as this is used to
         to display past/complete workers too.
         """
-        del self._workers[job_id]
+        worker = self._workers.pop(job_id)
+
+        # Record how long a kill took to be acknowledged, if killed.
+        if worker.control.kill_latency is not None:
+            self._state[job_id]["kill_latency"] = worker.control.kill_latency
+
         self.layoutChanged.emit()
 
     def cleanup(self):
@@ -276,9 +276,16 @@ class ProgressBarDelegate(QStyledItemDelegate):
 
             painter.fillRect(rect, brush)
 
+        text = job_id
+        if "kill_latency" in data:
+            text = "%s (stopped in %.1f ms)" % (
+                job_id,
+                data["kill_latency"] * 1000,
+            )
+
         pen = QPen()
         pen.setColor(Qt.black)
-        painter.drawText(option.rect, Qt.AlignLeft, job_id)
+        painter.drawText(option.rect, Qt.AlignLeft, text)
 
         if option.state & QStyle.State_Selected:
             painter.drawRect(option.rect)
@@ -1,18 +1,16 @@
 import sys
-import time
 
 from PySide6.QtCore import (QObject, QRunnable, Qt, QThreadPool, Signal,
                           Slot)
 from PySide6.QtWidgets import (QApplication, QHBoxLayout, QMainWindow,
                              QProgressBar, QPushButton, QWidget)
 
-
-class WorkerKilledException(Exception):
-    pass
+from jobcontrol import JobControl
 
 
 class WorkerSignals(QObject):
     progress = Signal(int)
+    killed = Signal(float)
 
 
 class JobRunner(QRunnable):
@@ -22,29 +20,26 @@ class JobRunner(QRunnable):
     def __init__(self):
         super().__init__()
 
-        self.is_paused = False
-        self.is_killed = False
+        self.control = JobControl()
 
     @Slot()
     def run(self):
-        for n in range(100):
-            self.signals.progress.emit(n + 1)
-            time.sleep(0.1)
-
-            while self.is_paused:
-                time.sleep(0)  # <1>
+        with self.control:
+            for n in range(100):
+                self.signals.progress.emit(n + 1)
+                self.control.sleep(0.1)  # <1>
 
-            if self.is_killed:
-                raise WorkerKilledException
+        if self.control.kill_latency is not None:
+            self.signals.killed.emit(self.control.kill_latency)
 
     def pause(self):
-        self.is_paused = True
+        self.control.pause()
 
     def resume(self):
-        self.is_paused = False
+        self.control.resume()
 
     def kill(self):
-        self.is_killed = True
+        self.control.kill()
 
 
 class MainWindow(QMainWindow):
@@ -77,6 +72,7 @@ class MainWindow(QMainWindow):
         # Create a runner
         self.runner = JobRunner()
         self.runner.signals.progress.connect(self.update_progress)
+        self.runner.signals.killed.connect(self.show_killed)
         self.threadpool.start(self.runner)
 
         btn_stop.pressed.connect(self.runner.kill)
@@ -88,6 +84,11 @@ class MainWindow(QMainWindow):
     def update_progress(self, n):
         self.progress.setValue(n)
 
+    def show_killed(self, latency):
+        self.status.showMessage(
+            "Stopped %.1f ms after kill" % (latency * 1000)
+        )
+
 
 app = QApplication(sys.argv)
 w = MainWindow()
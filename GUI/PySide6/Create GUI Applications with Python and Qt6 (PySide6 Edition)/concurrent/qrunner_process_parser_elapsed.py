@@ -1,4 +1,3 @@
-import re
 import subprocess
 import sys
 import time
@@ -11,47 +10,7 @@ from PySide6.QtCore import (QObject, QRunnable, Qt, QThreadPool, QTimer,
 from PySide6.QtWidgets import (QApplication, QMainWindow, QPlainTextEdit,
                              QProgressBar, QPushButton, QVBoxLayout, QWidget)
 
-
-def timestr_to_seconds(s):
-    """
-    Convert a string in the format 00:00:00 into seconds.
-    """
-    hours, minutes, seconds = s.split(":")
-    hours = int(hours) * 3600
-    minutes = int(minutes) * 60
-    seconds = int(seconds)
-    return hours + minutes + seconds
-
-
-total_re = re.compile("Total time: (\d\d:\d\d:\d\d)")
-elapsed_re = re.compile("Elapsed time: (\d\d:\d\d:\d\d)")
-
-
-def time_to_percent_parser(l):
-    """
-    Extract the elepsed time value and the total time value,
-    and use them to calculate a % complete.
-    """
-    total_time = None
-    elapsed_time = None
-
-    output = "".join(l)  # Turn into a single string.
-
-    m = total_re.findall(output)
-    if m:
-        # Should only be one of these.
-        total_time = timestr_to_seconds(m[0])
-
-    m = elapsed_re.findall(output)
-    if m:
-        # Get the last match (latest result) using -1 on the list.
-        elapsed_time = timestr_to_seconds(m[-1])
-
-    # If we have both the latest, and the target, we can calculate %.
-    if total_time and elapsed_time:
-        return int(100 * elapsed_time / total_time)
-
-
+from parsers import TimePercentParser
 
 
 class WorkerSignals(QObject):
@@ -88,7 +47,8 @@ class SubProcessWorker(QRunnable):
         # The command to be executed.
         self.command = command
 
-        # The parser function to extract the progress information.
+        # The parser to extract the progress information. This keeps
+        # its own state, so is only passed the new lines as they arrive.
         self.parser = parser
 
     # tag::workerRun[]
@@ -111,7 +71,7 @@ class SubProcessWorker(QRunnable):
                 data = proc.stdout.readline()  # <3>
                 result.append(data)
                 if self.parser:  # <4>
-                    value = self.parser(result)
+                    value = self.parser.parse(data)
                     if value:
                         self.signals.progress.emit(value)
 
@@ -154,7 +114,7 @@ class MainWindow(QMainWindow):
     def start(self):
         # Create a runner
         self.runner = SubProcessWorker(
-            command="python dummy_script.py", parser=time_to_percent_parser
+            command="python dummy_script.py", parser=TimePercentParser()
         )
         self.runner.signals.result.connect(self.result)
         self.runner.signals.progress.connect(self.progress.setValue)
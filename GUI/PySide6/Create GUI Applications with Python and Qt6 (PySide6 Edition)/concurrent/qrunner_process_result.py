@@ -8,8 +8,10 @@ from collections import namedtuple
 from PySide6.QtCore import (QObject, QRunnable, Qt, QThreadPool, QTimer,
                           Signal, Slot)
 from PySide6.QtWidgets import (
-    QApplication, QLineEdit, QMainWindow, QPushButton, QSpinBox, QVBoxLayout,
-    QWidget)
+    QApplication, QLabel, QLineEdit, QMainWindow, QPushButton, QSpinBox,
+    QVBoxLayout, QWidget)
+
+from sharedresult import SharedArrayParser
 
 
 def extract_vars(l):
@@ -25,6 +27,16 @@ def extract_vars(l):
 
     data['number_of_lines'] = len(l)
     return data
+
+
+def extract_arrays(l):
+    """
+    Extracts variables, and attaches to the arrays the script left in
+    shared memory. Only their names are in the output, not the data.
+    """
+    data = extract_vars(l)
+    data['arrays'] = SharedArrayParser().parse(l) or []
+    return data
     
 
 class WorkerSignals(QObject):
@@ -101,6 +113,13 @@ class MainWindow(QMainWindow):
 
         layout.addWidget(btn_run)
 
+        btn_array = QPushButton("Generate data")
+        btn_array.clicked.connect(self.start_array)
+        layout.addWidget(btn_array)
+
+        self.array_summary = QLabel()
+        layout.addWidget(self.array_summary)
+
         w = QWidget()
         w.setLayout(layout)
         self.setCentralWidget(w)
@@ -125,6 +144,25 @@ class MainWindow(QMainWindow):
         self.website.setText(data['website'])
         self.number_of_lines.setValue(data['number_of_lines'])
 
+    def start_array(self):
+        self.array_runner = SubProcessWorker(
+            "python dummy_array_script.py 10000000",
+            process_result=extract_arrays,
+        )
+        self.array_runner.signals.result.connect(self.array_result)
+        self.threadpool.start(self.array_runner)
+
+    def array_result(self, data):
+        for shared in data['arrays']:
+            # The array is a view onto the shared memory, not a copy.
+            values = shared.array
+            self.array_summary.setText(
+                "%d values, mean %.4f, max %.4f"
+                % (values.size, values.mean(), values.max())
+            )
+            del values
+            shared.release()  # Done with it, free the memory.
+
 
 app = QApplication(sys.argv)
 w = MainWindow()
@@ -14,6 +14,8 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from progressbus import ProgressBus
+
 
 class WorkerSignals(QObject):
     """
@@ -39,6 +41,7 @@ class Worker(QRunnable):
         super().__init__()
         self.job_id = uuid.uuid4().hex  # <1>
         self.signals = WorkerSignals()
+        self.progress_slot = None  # Set when registered on the bus.
 
     @Slot()
     def run(self):
@@ -46,10 +49,10 @@ class Worker(QRunnable):
         delay = random.random() / 100  # Random delay value.
         for n in range(total_n):
             progress_pc = int(100 * float(n + 1) / total_n)  # <2>
-            self.signals.progress.emit(self.job_id, progress_pc)
+            self.progress_slot.progress(progress_pc)
             time.sleep(delay)
 
-        self.signals.finished.emit(self.job_id)
+        self.progress_slot.finish()
 
 
 class MainWindow(QMainWindow):
@@ -80,6 +83,7 @@ class MainWindow(QMainWindow):
         self.show()
 
         self.threadpool = QThreadPool()
+        self.bus = ProgressBus()
         print(
             "Multithreading with maximum %d threads" % self.threadpool.maxThreadCount()
         )
@@ -93,6 +97,9 @@ class MainWindow(QMainWindow):
         worker = Worker()
         worker.signals.progress.connect(self.update_progress)
         worker.signals.finished.connect(self.cleanup)  # <3>
+        worker.progress_slot = self.bus.register(
+            worker.job_id, worker.signals
+        )
 
         # Execute
         self.threadpool.start(worker)
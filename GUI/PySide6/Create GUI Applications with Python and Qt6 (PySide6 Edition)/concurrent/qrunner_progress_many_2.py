@@ -14,6 +14,8 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from progresstracker import ProgressTracker
+
 
 class WorkerSignals(QObject):
     """
@@ -38,11 +40,13 @@ class Worker(QRunnable):
     def __init__(self):
         super().__init__()
         self.job_id = uuid.uuid4().hex  # <1>
+        # Jobs do different amounts of work, used as their weight.
+        self.total_n = random.randint(500, 2000)
         self.signals = WorkerSignals()
 
     @Slot()
     def run(self):
-        total_n = 1000
+        total_n = self.total_n
         delay = random.random() / 100  # Random delay value.
         for n in range(total_n):
             progress_pc = int(100 * float(n + 1) / total_n)  # <2>
@@ -72,8 +76,8 @@ class MainWindow(QMainWindow):
         w = QWidget()
         w.setLayout(layout)
 
-        # Dictionary holds the progress of current workers.
-        self.worker_progress = {}
+        # Running total of the progress of current workers.
+        self.tracker = ProgressTracker()
 
         self.setCentralWidget(w)
 
@@ -93,32 +97,34 @@ class MainWindow(QMainWindow):
         worker = Worker()
         worker.signals.progress.connect(self.update_progress)
         worker.signals.finished.connect(self.cleanup)  # <3>
+        self.tracker.add(worker.job_id, weight=worker.total_n)
 
         # Execute
         self.threadpool.start(worker)
 
     def cleanup(self, job_id):
-        if all(v == 100 for v in self.worker_progress.values()):
-            self.worker_progress.clear()  # Empty the dict.
-
-            # Update the progress bar if we've removed a value.
-            self.refresh_progress()
+        # Finished jobs still count as complete, so the bar doesn't
+        # jump back when they are removed.
+        self.tracker.finish(job_id)
+        self.refresh_progress()
 
     def update_progress(self, job_id, progress):
-        self.worker_progress[job_id] = progress
+        self.tracker.update(job_id, progress)
 
     def calculate_progress(self):
-        if not self.worker_progress:
-            return 0
-
-        return sum(v for v in self.worker_progress.values()) / len(self.worker_progress)
+        return self.tracker.progress
 
     def refresh_progress(self):
         # Calculate total progress.
         progress = self.calculate_progress()
-        print(self.worker_progress)
         self.progress.setValue(progress)
-        self.status.setText("%d workers" % len(self.worker_progress))
+
+        eta = self.tracker.eta()
+        if eta is None:
+            eta = "..."
+        else:
+            eta = "%ds" % round(eta)
+        self.status.setText("%d workers, ETA %s" % (len(self.tracker), eta))
 
 
 app = QApplication(sys.argv)
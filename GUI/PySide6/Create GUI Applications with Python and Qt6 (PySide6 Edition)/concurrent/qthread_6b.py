@@ -1,5 +1,6 @@
+import collections
 import sys
-import time
+import threading
 
 from PySide6.QtCore import QThread, Signal, Slot
 from PySide6.QtWidgets import (
@@ -20,10 +21,20 @@ class Thread(QThread):
     """
 
     result = Signal(str)
+    processed = Signal(int)
 
-    def __init__(self, initial_counter):
+    def __init__(self, initial_counter, capacity=1000, max_batch=100):
         super().__init__()
         self.counter = initial_counter
+        self.capacity = capacity  # Max inputs waiting at once.
+        self.max_batch = max_batch  # Max inputs handled per result.
+
+        self.input_add = 0
+        self.input_multiply = 1
+
+        self._inputs = collections.deque()
+        self._condition = threading.Condition()
+        self._stopping = False
 
     @Slot()
     def run(self):
@@ -31,19 +42,39 @@ class Thread(QThread):
         Your code goes in this method
         """
         print("Thread start")
-        self.is_running = True
-        self.waiting_for_data = True
         while True:
-            while self.waiting_for_data:
-                if not self.is_running:
-                    return  # Exit thread.
-                time.sleep(0.1)  # wait for data <1>.
+            with self._condition:
+                while not self._inputs and not self._stopping:
+                    self._condition.wait()  # wait for data <1>.
+
+                if not self._inputs:
+                    return  # Stopped, and all inputs handled. Exit thread.
+
+                # Take everything waiting (up to max_batch) at once.
+                batch = [
+                    self._inputs.popleft()
+                    for _ in range(min(len(self._inputs), self.max_batch))
+                ]
+
+            for add, multiply in batch:
+                self.counter += add
+                self.counter *= multiply
 
             # Output the number as a formatted string.
-            self.counter += self.input_add
-            self.counter *= self.input_multiply
             self.result.emit(f"The cumulative total is {self.counter}")
-            self.waiting_for_data = True
+            self.processed.emit(len(batch))
+
+    def put(self, add, multiply):
+        """
+        Queue an input, waking the thread. Returns False if the queue is
+        full, or the thread is stopping (see is_stopping).
+        """
+        with self._condition:
+            if self._stopping or len(self._inputs) >= self.capacity:
+                return False
+            self._inputs.append((add, multiply))
+            self._condition.notify()
+        return True
 
     # tag::data_methods[]
     def send_add(self, add):
@@ -53,11 +84,22 @@ class Thread(QThread):
         self.input_multiply = multiply
 
     def calculate(self):
-        self.waiting_for_data = False  # Release the lock & calculate.
+        return self.put(self.input_add, self.input_multiply)  # Queue & wake.
 
     # end::data_methods[]
+    @property
+    def is_stopping(self):
+        # Once set, never cleared, so no lock is needed to read it.
+        return self._stopping
+
     def stop(self):
-        self.is_running = False
+        """
+        Stop accepting inputs. The thread exits once it has handled
+        those already queued.
+        """
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
 
 
 class MainWindow(QMainWindow):
@@ -100,13 +142,22 @@ class MainWindow(QMainWindow):
         # Submit the value in the numeric_input widget to the thread.
         self.thread.send_add(self.add_input.value())
         self.thread.send_multiply(self.mult_input.value())
-        self.thread.calculate()
+        if not self.thread.calculate():
+            if self.thread.is_stopping:
+                self.statusBar().showMessage("Thread stopped", 1000)
+            else:
+                self.statusBar().showMessage("Input queue full", 1000)
 
     # end::submit_data[]
 
     def thread_has_finished(self):
         print("Thread has finished.")
 
+    def closeEvent(self, event):
+        self.thread.stop()
+        self.thread.wait()
+        super().closeEvent(event)
+
 
 app = QApplication(sys.argv)
 window = MainWindow()
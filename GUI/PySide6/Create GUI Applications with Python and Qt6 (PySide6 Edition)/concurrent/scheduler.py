@@ -0,0 +1,184 @@
+import heapq
+import itertools
+import time
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+DEFAULT_TAG = "default"
+
+
+class ScheduledRunnable(QRunnable):
+    """
+    Wraps a job's runnable, to tell the scheduler when it starts and
+    finishes on the pool thread.
+    """
+
+    def __init__(self, scheduler, job_id, runnable):
+        super().__init__()
+        self.scheduler = scheduler
+        self.job_id = job_id
+        self.runnable = runnable
+
+    @Slot()
+    def run(self):
+        self.scheduler.job_started(self.job_id)
+        tracer = self.scheduler.tracer
+        if tracer is not None:
+            start = tracer.now()
+        try:
+            self.runnable.run()
+        finally:
+            if tracer is not None:
+                end = tracer.now()
+                tracer.record("run", "job", start, end, job=self.job_id)
+            self.scheduler.finished.emit(self.job_id)
+
+
+class JobScheduler(QObject):
+    """
+    Scheduler layer on top of QThreadPool.
+
+    Jobs are held in our own queues, and only handed to the pool when a
+    thread is free, so we always know what is running and what is
+    waiting. Each job has a tag (e.g. the user who submitted it) and a
+    priority. When a thread becomes free, the tag with the smallest
+    share of the running jobs (relative to its weight) goes next, and
+    within a tag the highest priority job (then the oldest) is run.
+
+    Supported signals are:
+
+    started
+        `str` job_id, the job has started running on the pool
+
+    finished
+        `str` job_id, the job has finished running
+
+    """
+
+    started = Signal(str)
+    finished = Signal(str)
+
+    def __init__(self, threadpool=None):
+        super().__init__()
+
+        self.threadpool = threadpool or QThreadPool()
+
+        self._queues = {}  # tag -> heap of (-priority, seq, job_id)
+        self._jobs = {}  # job_id -> (tag, runnable), waiting jobs only.
+        self._running_jobs = {}  # job_id -> tag, running jobs only.
+        self._running = {}  # tag -> number of running jobs.
+        self._weights = {}  # tag -> weight, default 1.
+        self._limits = {}  # tag -> max running jobs, default no limit.
+
+        self._enqueued_at = {}
+        self._started_at = {}
+        self._counter = itertools.count()
+
+        # Optional profiler.Tracer, to record queue wait and run times.
+        self.tracer = None
+
+        self.finished.connect(self.job_finished)
+
+    @property
+    def max_threads(self):
+        return self.threadpool.maxThreadCount()
+
+    def resize(self, n):
+        """
+        Change the number of pool threads. Extra waiting jobs are
+        started immediately if the pool grows; if it shrinks, running
+        jobs are left to finish.
+        """
+        self.threadpool.setMaxThreadCount(max(1, n))
+        self.dispatch()
+
+    def set_share(self, tag, weight=1, limit=None):
+        """
+        Set the fair-share weight for a tag, and optionally a hard limit
+        on the number of its jobs running at once.
+        """
+        self._weights[tag] = weight
+        self._limits[tag] = limit
+        self.dispatch()
+
+    def submit(self, job_id, runnable, priority=0, tag=DEFAULT_TAG):
+        """
+        Queue a runnable. Higher priority jobs run first within a tag.
+        """
+        queue = self._queues.setdefault(tag, [])
+        heapq.heappush(queue, (-priority, next(self._counter), job_id))
+        self._jobs[job_id] = tag, runnable
+        self._enqueued_at[job_id] = time.monotonic()
+        self.dispatch()
+
+    def _next_tag(self):
+        best, best_key = None, None
+        for tag, queue in self._queues.items():
+            if not queue:
+                continue
+
+            running = self._running.get(tag, 0)
+            limit = self._limits.get(tag)
+            if limit is not None and running >= limit:
+                continue
+
+            # Lowest share of running jobs first, then the best job.
+            share = running / self._weights.get(tag, 1)
+            key = (share, queue[0])
+            if best_key is None or key < best_key:
+                best, best_key = tag, key
+        return best
+
+    def dispatch(self):
+        """
+        Start waiting jobs while there are free threads.
+        """
+        while self.running_count() < self.max_threads:
+            tag = self._next_tag()
+            if tag is None:
+                break
+
+            _, _, job_id = heapq.heappop(self._queues[tag])
+            _, runnable = self._jobs.pop(job_id)
+            self._running_jobs[job_id] = tag
+            self._running[tag] = self._running.get(tag, 0) + 1
+            self.threadpool.start(ScheduledRunnable(self, job_id, runnable))
+
+    def job_started(self, job_id):
+        # Called on the pool thread, the moment the job actually starts.
+        now = self._started_at[job_id] = time.monotonic()
+        if self.tracer is not None:
+            end = self.tracer.now()
+            wait = now - self._enqueued_at[job_id]
+            self.tracer.record(
+                "queue wait", "job", end - wait, end, job=job_id
+            )
+        self.started.emit(job_id)
+
+    def job_finished(self, job_id):
+        tag = self._running_jobs.pop(job_id)
+        self._running[tag] -= 1
+        self._enqueued_at.pop(job_id, None)
+        self._started_at.pop(job_id, None)
+        self.dispatch()
+
+    # Introspection
+    def running_count(self):
+        return len(self._running_jobs)
+
+    def waiting_count(self):
+        return len(self._jobs)
+
+    def waiting_by_tag(self):
+        return {tag: len(queue) for tag, queue in self._queues.items()}
+
+    def wait_time(self, job_id):
+        """
+        Seconds the job spent waiting before it started, or has waited
+        so far if it is still queued. Returns None for finished jobs.
+        """
+        enqueued = self._enqueued_at.get(job_id)
+        if enqueued is None:
+            return None
+        started = self._started_at.get(job_id, time.monotonic())
+        return started - enqueued
@@ -0,0 +1,176 @@
+import collections
+import itertools
+import json
+import os
+import re
+import struct
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+MAGIC = b"SHRA"
+# Magic, then the length of the JSON header which follows.
+PREFIX = struct.Struct("<4sI")
+# The array data starts on a multiple of this, after the header.
+ALIGN = 64
+# Set by the GUI process (see JobManager) to the prefix for the names
+# of the blocks a job creates, so it can find any left behind.
+PREFIX_ENV = "SHARED_ARRAY_PREFIX"
+
+shared_array_re = re.compile(r"^shared_array=(\S+)$", re.M)
+
+
+class SharedArray:
+    """
+    A NumPy array in a block of shared memory, to pass large results
+    from a worker process to the GUI process without copying, or
+    converting them to text and back.
+
+    The block starts with a small header (magic, the dtype and shape as
+    JSON) followed by the array data. The worker creates the block,
+    fills the array in place and prints `shared_array=<name>` (see
+    line()); the GUI attaches to it by name, and the array is a view
+    straight onto the shared memory.
+
+    The block belongs to the GUI process once handed over: call
+    release() when finished with it, after dropping any references to
+    the array (or views of it).
+
+    Until then, nothing frees the block if the worker dies (or is
+    killed) before printing its name. So if PREFIX_ENV is set, blocks
+    are named <prefix>_0, <prefix>_1, ... in the order they are created,
+    and the GUI process frees any it wasn't handed when the job ends
+    with release_unclaimed(). Blocks from a worker started without it,
+    or those the GUI process holds when it is itself killed, are still
+    left in shared memory (/dev/shm on Linux) until a reboot.
+    """
+
+    def __init__(self, shm):
+        self.shm = shm
+        self.name = shm.name
+
+        magic, length = PREFIX.unpack_from(shm.buf)
+        if magic != MAGIC:
+            raise ValueError("{} is not a shared array".format(shm.name))
+        start = PREFIX.size
+        header = json.loads(bytes(shm.buf[start : start + length]))
+
+        self.array = np.ndarray(
+            header["shape"],
+            dtype=np.dtype(header["dtype"]),
+            buffer=shm.buf,
+            offset=data_offset(length),
+        )
+
+    @classmethod
+    def create(cls, shape, dtype=np.float64):
+        """
+        Create a shared block for an array of the given shape and dtype
+        (in the worker process). Fill in .array, then print line().
+        """
+        prefix = os.environ.get(PREFIX_ENV)
+        name = None
+        if prefix:
+            # Counted per prefix, as a warm worker runs many jobs.
+            name = block_name(prefix, _created[prefix])
+            _created[prefix] += 1
+
+        dtype = np.dtype(dtype)
+        header = json.dumps({"dtype": dtype.str, "shape": list(shape)})
+        header = header.encode("utf8")
+        offset = data_offset(len(header))
+        size = offset + int(np.prod(shape)) * dtype.itemsize
+
+        shm = shared_memory.SharedMemory(
+            name=name, create=True, size=max(size, 1)
+        )
+        # The GUI process takes ownership, so don't let this process's
+        # resource tracker remove the block when it exits.
+        resource_tracker.unregister(shm._name, "shared_memory")
+
+        PREFIX.pack_into(shm.buf, 0, MAGIC, len(header))
+        shm.buf[PREFIX.size : PREFIX.size + len(header)] = header
+        return cls(shm)
+
+    @classmethod
+    def from_array(cls, array):
+        """
+        Copy an existing array into a new shared block.
+        """
+        shared = cls.create(array.shape, array.dtype)
+        shared.array[...] = array
+        return shared
+
+    @classmethod
+    def attach(cls, name):
+        """
+        Attach to a block created by another process.
+        """
+        return cls(shared_memory.SharedMemory(name=name))
+
+    def line(self):
+        """
+        The line to print, for the GUI to find the block.
+        """
+        return "shared_array={}".format(self.name)
+
+    def close(self):
+        """
+        Detach from the block, leaving it for the other process.
+        """
+        self.array = None
+        self.shm.close()
+
+    def release(self):
+        """
+        Detach from the block and free it.
+        """
+        self.close()
+        self.shm.unlink()
+
+
+# Number of blocks created in this process, by name prefix.
+_created = collections.Counter()
+
+
+def data_offset(header_length):
+    end = PREFIX.size + header_length
+    return (end + ALIGN - 1) // ALIGN * ALIGN
+
+
+def block_name(prefix, n):
+    return "{}_{}".format(prefix, n)
+
+
+def release_unclaimed(prefix, claimed=()):
+    """
+    Free the blocks a job created with PREFIX_ENV set to prefix, other
+    than those named in claimed (which were handed over), once it has
+    ended. Blocks are named in order, so this stops at the first
+    missing one. Returns the number freed.
+    """
+    freed = 0
+    for n in itertools.count():
+        name = block_name(prefix, n)
+        if name in claimed:
+            continue  # Handed over, and maybe already released.
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            return freed
+        shm.close()
+        shm.unlink()
+        freed += 1
+
+
+class SharedArrayParser:
+    """
+    Parser for JobManager: finds the `shared_array=<name>` lines in a
+    job's output, and returns a list of SharedArray attached to them.
+    Only the names go through the output as text, not the data.
+    """
+
+    def parse(self, output):
+        names = shared_array_re.findall(output)
+        if names:
+            return [SharedArray.attach(name) for name in names]
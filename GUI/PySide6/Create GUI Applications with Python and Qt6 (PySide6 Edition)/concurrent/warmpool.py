@@ -0,0 +1,337 @@
+import collections
+import json
+import os
+import sys
+import time
+
+from PySide6.QtCore import QObject, QProcess, QTimer, Signal
+
+from processqueue import KILL_GRACE, ProcessMetrics
+
+WORKER_SCRIPT = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "warmworker.py"
+)
+DONE_MARKER = b"\0done "
+
+
+class WarmProcess:
+    """
+    A long-lived worker process, and the job it is currently running.
+    """
+
+    def __init__(self, process):
+        self.process = process
+        self.retired = False
+        self.reset()
+
+    def reset(self, job_id=None):
+        self.job_id = job_id
+        self.exit_code = None
+        self.held = {"stdout": b"", "stderr": b""}  # Partial done markers.
+        self.done_channels = set()
+
+
+class WarmPool(QObject):
+    """
+    Runs Python job scripts in a pool of long-lived worker processes
+    (warmworker.py), instead of starting a new interpreter for each job.
+    This removes interpreter startup and import time from short jobs.
+
+    Each worker runs one job at a time; other jobs wait in a FIFO pending
+    queue. Job output is passed on through the output signal as it
+    arrives, just as from a QProcess. A job which runs over its timeout
+    has its worker process stopped (and a new one is started to replace
+    it), as do jobs whose worker crashes.
+
+    Jobs share the worker's interpreter (one after another), so they
+    should not read stdin, write NUL bytes or rely on fresh module state.
+
+    Supported signals are the same as ProcessQueue, plus:
+
+    output
+        `str` job_id, `bytes` data, `str` channel ("stdout" or "stderr")
+
+    """
+
+    started = Signal(str)
+    finished = Signal(str, int, object)
+    timed_out = Signal(str)
+    output = Signal(str, object, str)
+
+    def __init__(self, max_processes=None, preload=None):
+        super().__init__()
+
+        self.max_processes = max_processes or os.cpu_count() or 1
+        self.preload = preload or []  # Modules imported by each worker.
+
+        # (job_id, script, arguments, timeout, env)
+        self._pending = collections.deque()
+        self._workers = []
+        self._timers = {}  # job_id -> timeout QTimer
+        self._enqueued_at = {}
+        self._started_at = {}  # Tracer times, only while tracing.
+        self._shutting_down = False
+
+        # Optional profiler.Tracer, to record queue wait and run times.
+        self.tracer = None
+
+        self._n_started = 0
+        self._total_wait = 0.0
+        self._max_depth = 0
+        self._exit_codes = collections.Counter()  # metric name -> count
+
+        self.metrics = ProcessMetrics()
+        for name in [
+            "Pending",
+            "Running",
+            "Worker processes",
+            "Max queue depth",
+            "Started",
+            "Queue wait (ms, mean)",
+            "Timed out",
+            "Worker restarts",
+        ]:
+            self.metrics.set(name, 0)
+
+        for _ in range(self.max_processes):
+            self.spawn()
+        self.update_metrics()
+
+    def spawn(self):
+        process = QProcess(self)
+        worker = WarmProcess(process)
+        process.readyReadStandardOutput.connect(
+            lambda: self.read(worker, "stdout")
+        )
+        process.readyReadStandardError.connect(
+            lambda: self.read(worker, "stderr")
+        )
+        process.finished.connect(
+            lambda exit_code, exit_status: self.worker_exited(
+                worker, exit_code, exit_status
+            )
+        )
+        process.start(sys.executable, [WORKER_SCRIPT] + self.preload)
+        self._workers.append(worker)
+
+    def retire(self, worker):
+        # Closing stdin tells the worker to exit, once it is idle.
+        worker.retired = True
+        self._workers.remove(worker)
+        worker.process.closeWriteChannel()
+
+    def resize(self, n):
+        """
+        Change the number of worker processes. If it shrinks, idle
+        workers are stopped now, and busy ones when their job finishes.
+        """
+        self.max_processes = max(1, n)
+        while len(self._workers) < self.max_processes:
+            self.spawn()
+
+        idle = [w for w in self._workers if w.job_id is None]
+        while idle and len(self._workers) > self.max_processes:
+            self.retire(idle.pop())
+
+        self.dispatch()
+
+    def submit(self, job_id, script, arguments, timeout=None, env=None):
+        """
+        Queue a Python script to run with arguments, as if started with
+        `python script arguments...` in the current directory, with any
+        environment variables in env set while it runs.
+        """
+        self._pending.append(
+            (job_id, script, list(arguments), timeout, env or {})
+        )
+        self._enqueued_at[job_id] = time.monotonic()
+        self._max_depth = max(self._max_depth, len(self._pending))
+        self.dispatch()
+
+    def dispatch(self):
+        """
+        Hand pending jobs to idle workers.
+        """
+        idle = [w for w in self._workers if w.job_id is None]
+        while self._pending and idle:
+            worker = idle.pop()
+            job_id, script, arguments, timeout, env = self._pending.popleft()
+            worker.reset(job_id)
+
+            request = json.dumps(
+                {
+                    "script": script,
+                    "args": arguments,
+                    "cwd": os.getcwd(),
+                    "env": env,
+                }
+            )
+            worker.process.write(request.encode("utf8") + b"\n")
+
+            if timeout:
+                timer = QTimer()
+                timer.setSingleShot(True)
+                timer.timeout.connect(
+                    lambda job_id=job_id: self.expire(job_id)
+                )
+                timer.start(int(timeout * 1000))
+                self._timers[job_id] = timer
+
+            enqueued = self._enqueued_at.pop(job_id)
+            wait = time.monotonic() - enqueued
+            self._n_started += 1
+            self._total_wait += wait
+            if self.tracer is not None:
+                end = self._started_at[job_id] = self.tracer.now()
+                self.tracer.record(
+                    "queue wait", "job", end - wait, end, job=job_id
+                )
+            self.started.emit(job_id)
+
+        self.update_metrics()
+
+    def read(self, worker, channel):
+        process = worker.process
+        if channel == "stdout":
+            data = bytes(process.readAllStandardOutput())
+        else:
+            data = bytes(process.readAllStandardError())
+
+        data = worker.held[channel] + data
+        worker.held[channel] = b""
+
+        # The done marker is the last thing written for a job, but may be
+        # split across reads, so hold on to it until we have all of it.
+        i = data.find(DONE_MARKER[:1])
+        if i != -1:
+            end = data.find(b"\n", i)
+            if end == -1:
+                worker.held[channel] = data[i:]
+            else:
+                worker.exit_code = int(data[i + len(DONE_MARKER) : end])
+                worker.done_channels.add(channel)
+            data = data[:i]
+
+        if data and worker.job_id is not None:
+            self.output.emit(worker.job_id, data, channel)
+
+        if len(worker.done_channels) == 2:
+            self.job_finished(worker, worker.exit_code, QProcess.NormalExit)
+
+    def job_finished(self, worker, exit_code, exit_status):
+        job_id = worker.job_id
+        worker.reset()
+
+        timer = self._timers.pop(job_id, None)
+        if timer:
+            timer.stop()
+
+        start = self._started_at.pop(job_id, None)
+        if self.tracer is not None and start is not None:
+            end = self.tracer.now()
+            self.tracer.record("run", "job", start, end, job=job_id)
+
+        if exit_status == QProcess.CrashExit:
+            self._exit_codes["Crashed"] += 1
+        else:
+            self._exit_codes["Exit code {}".format(exit_code)] += 1
+
+        self.finished.emit(job_id, exit_code, exit_status)
+
+        if not worker.retired and len(self._workers) > self.max_processes:
+            self.retire(worker)
+        self.dispatch()
+
+    def worker_exited(self, worker, exit_code, exit_status):
+        respawn = not (worker.retired or self._shutting_down)
+        if not worker.retired:
+            self._workers.remove(worker)
+            worker.retired = True
+
+        if worker.job_id is not None:
+            # Died (or was killed) part way through a job.
+            self.read(worker, "stdout")
+            self.read(worker, "stderr")
+            if worker.job_id is not None:
+                self.job_finished(worker, exit_code, QProcess.CrashExit)
+
+        worker.process.deleteLater()
+
+        if respawn:
+            self.metrics.set(
+                "Worker restarts", self.metrics.value("Worker restarts") + 1
+            )
+            self.spawn()
+            self.dispatch()
+
+    def expire(self, job_id):
+        if not any(w.job_id == job_id for w in self._workers):
+            return
+
+        self.metrics.set("Timed out", self.metrics.value("Timed out") + 1)
+        self.timed_out.emit(job_id)
+        self.kill(job_id)
+
+    def kill(self, job_id):
+        """
+        Stop a job. A pending job is dropped from the queue, a running
+        job has its worker process terminated, then killed if it is
+        hung. A new worker is started to replace it.
+        """
+        for n, job in enumerate(self._pending):
+            if job[0] == job_id:
+                del self._pending[n]
+                self._enqueued_at.pop(job_id, None)
+                self.finished.emit(job_id, -1, QProcess.CrashExit)
+                self.update_metrics()
+                return
+
+        for worker in self._workers:
+            if worker.job_id == job_id:
+                break
+        else:
+            return
+
+        worker.process.terminate()
+
+        def kill_if_hung():
+            if worker.job_id == job_id:
+                worker.process.kill()
+
+        QTimer.singleShot(KILL_GRACE, kill_if_hung)
+
+    def shutdown(self, msecs=1000):
+        """
+        Stop all the worker processes, waiting up to msecs for each.
+        """
+        self._shutting_down = True
+        # Copied, as exiting workers remove themselves from the list.
+        workers = list(self._workers)
+        for worker in workers:
+            worker.process.closeWriteChannel()
+        for worker in workers:
+            if not worker.process.waitForFinished(msecs):
+                worker.process.kill()
+                worker.process.waitForFinished(msecs)
+
+    # Introspection
+    def running_count(self):
+        return sum(1 for w in self._workers if w.job_id is not None)
+
+    def waiting_count(self):
+        return len(self._pending)
+
+    def update_metrics(self):
+        metrics = self.metrics
+        metrics.set("Pending", len(self._pending))
+        metrics.set("Running", self.running_count())
+        metrics.set("Worker processes", len(self._workers))
+        metrics.set("Max queue depth", self._max_depth)
+        metrics.set("Started", self._n_started)
+        if self._n_started:
+            metrics.set(
+                "Queue wait (ms, mean)",
+                1000 * self._total_wait / self._n_started,
+            )
+        for name, count in self._exit_codes.items():
+            metrics.set(name, count)
@@ -0,0 +1,78 @@
+"""
+Long-lived worker process for WarmPool.
+
+Reads one job per line from stdin, as JSON {"script", "args", "cwd",
+"env"}, and runs the script in this interpreter as __main__, with the
+variables in env set, and its output going to our stdout and stderr
+as if it had been started on its own.
+When the job ends, a done marker with the exit code is written to both
+stdout and stderr, so the pool knows it has all the job's output.
+
+Any module names given on the command line are imported at startup,
+so jobs using them don't pay for the import.
+"""
+import json
+import os
+import runpy
+import sys
+import traceback
+
+DONE_MARKER = "\0done {}\n"
+
+
+def run_job(job):
+    script = os.path.join(job["cwd"], job["script"])
+    argv, path, cwd = sys.argv, sys.path[:], os.getcwd()
+    env = job.get("env", {})
+    environ = {name: os.environ.get(name) for name in env}
+
+    sys.argv = [job["script"]] + job["args"]
+    os.environ.update(env)
+    sys.path.insert(0, os.path.dirname(script))
+    os.chdir(job["cwd"])
+    try:
+        runpy.run_path(script, run_name="__main__")
+
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        if isinstance(e.code, int):
+            return e.code
+        print(e.code, file=sys.stderr)
+        return 1
+
+    except Exception:
+        traceback.print_exc()
+        return 1
+
+    finally:
+        sys.argv, sys.path[:] = argv, path
+        os.chdir(cwd)
+        for name, value in environ.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        # In case the script replaced them.
+        sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+
+    return 0
+
+
+def main():
+    for module in sys.argv[1:]:
+        __import__(module)
+
+    while True:
+        line = sys.stdin.readline()
+        if not line:
+            break  # stdin closed, the pool is shutting us down.
+
+        exit_code = run_job(json.loads(line))
+        for stream in (sys.stdout, sys.stderr):
+            stream.write(DONE_MARKER.format(exit_code))
+            stream.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Sort and filter a table of N_ROWS rows (id, name, value, category),
+from a NumPy-backed source model, with QSortFilterProxyModel and with
+ArraySortFilterProxyModel:
+
+  filter   setFilterFixedString("ab") over all columns.
+  sort     sort by name, ascending.
+  typing   five keystrokes, one every TYPING_INTERVAL ms, building
+           up a search string (as when typing in the search box).
+
+Each proxy is shown in a QTableView. For each, "blocked" is the
+longest the GUI thread went without processing events (measured with
+a heartbeat timer) and "done" the time until the view shows the final
+rows. For ArraySortFilterProxyModel, "updates" is how many results
+were applied: results made stale by a newer keystroke are dropped.
+
+QSortFilterProxyModel calls data() for every cell it filters and
+every comparison it sorts, so it is run on fewer rows.
+
+Run with QT_QPA_PLATFORM=offscreen to benchmark without a display.
+"""
+import sys
+from functools import partial
+
+import numpy as np
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QElapsedTimer,
+    QModelIndex,
+    QSortFilterProxyModel,
+    Qt,
+    QTimer,
+)
+from PySide6.QtWidgets import QApplication, QTableView
+
+from sortfilterproxy import ArraySortFilterProxyModel
+
+DisplayRole = Qt.ItemDataRole.DisplayRole
+
+QT_ROWS = 50_000
+ARRAY_ROWS = [50_000, 5_000_000]
+TYPING = ["a", "ab", "abc", "abcd", "abcde"]
+TYPING_INTERVAL = 30
+
+
+class ArrayModel(QAbstractTableModel):
+    def __init__(self, columns, names):
+        super().__init__()
+        self._columns = columns
+        self._names = names
+
+    def data(self, index, role):
+        if role == DisplayRole:
+            return self._columns[index.column()][index.row()].item()
+
+    def rowCount(self, index=QModelIndex()):
+        return len(self._columns[0])
+
+    def columnCount(self, index=QModelIndex()):
+        return len(self._columns)
+
+    def column_values(self, column):
+        return self._columns[column]
+
+
+def make_model(n_rows):
+    rng = np.random.default_rng(0)
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    names = letters[rng.integers(0, 26, (n_rows, 8))].view("U8")[:, 0]
+    categories = np.array(["red", "green", "blue", "black"])
+    return ArrayModel(
+        [
+            np.arange(n_rows),
+            names,
+            rng.random(n_rows),
+            categories[rng.integers(0, 4, n_rows)],
+        ],
+        ["id", "name", "value", "category"],
+    )
+
+
+def measure(app, proxy, actions):
+    """
+    Run actions (a list of (delay ms, fn)), and the event loop until
+    the proxy is idle, returning (blocked ms, done ms, updates).
+    """
+    updates = []
+    proxy.layoutChanged.connect(lambda: updates.append(1))
+    gaps = []
+    clock = QElapsedTimer()
+    last = [0]
+
+    def beat():
+        now = clock.elapsed()
+        gaps.append(now - last[0])
+        last[0] = now
+
+    heartbeat = QTimer()
+    heartbeat.setInterval(1)
+    heartbeat.timeout.connect(beat)
+    clock.start()
+    heartbeat.start()
+    for delay, fn in actions:
+        QTimer.singleShot(delay, fn)
+    end = max(delay for delay, _ in actions) + 1
+    while clock.elapsed() < end or getattr(proxy, "busy", False):
+        app.processEvents()
+    app.processEvents()  # Repaint with the final rows.
+    done = clock.elapsed()
+    heartbeat.stop()
+    beat()
+    proxy.layoutChanged.disconnect()
+    return max(gaps), done, len(updates)
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+
+    runs = [("QSortFilterProxy", QSortFilterProxyModel, QT_ROWS)]
+    runs += [
+        ("ArraySortFilter", ArraySortFilterProxyModel, n)
+        for n in ARRAY_ROWS
+    ]
+    for name, proxy_class, n_rows in runs:
+        source = make_model(n_rows)
+        proxy = proxy_class()
+        proxy.setFilterKeyColumn(-1)
+        proxy.setSourceModel(source)
+        view = QTableView()
+        view.setModel(proxy)
+        view.resize(800, 600)
+        view.show()
+
+        typing = [
+            (i * TYPING_INTERVAL, partial(proxy.setFilterFixedString, text))
+            for i, text in enumerate(TYPING)
+        ]
+        for test, actions in [
+            ("filter", [(0, partial(proxy.setFilterFixedString, "ab"))]),
+            ("sort", [(0, partial(proxy.sort, 1, Qt.AscendingOrder))]),
+            ("typing", typing),
+        ]:
+            proxy.setFilterFixedString("")
+            proxy.sort(-1)
+            measure(app, proxy, [(0, lambda: None)])
+
+            blocked, done, updates = measure(app, proxy, actions)
+            if proxy_class is QSortFilterProxyModel:
+                updates = "-"
+            print(
+                "%-16s %9d rows  %-6s  blocked %6.0f ms  done %6.0f ms"
+                "  updates %s  rows %d"
+                % (
+                    name,
+                    n_rows,
+                    test,
+                    blocked,
+                    done,
+                    updates,
+                    proxy.rowCount(),
+                )
+            )
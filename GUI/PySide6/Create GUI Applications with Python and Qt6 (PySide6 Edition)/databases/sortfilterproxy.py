@@ -0,0 +1,415 @@
+import numpy as np
+from PySide6.QtCore import (
+    QAbstractProxyModel,
+    QModelIndex,
+    QObject,
+    QRunnable,
+    QThreadPool,
+    Qt,
+    Signal,
+    Slot,
+)
+
+DisplayRole = Qt.ItemDataRole.DisplayRole
+CaseSensitive = Qt.CaseSensitivity.CaseSensitive
+DescendingOrder = Qt.SortOrder.DescendingOrder
+
+# Rows converted to text and matched at a time, between checks for a
+# newer filter. Converting holds the GIL, so this keeps each step short
+# enough not to hold up the GUI thread.
+CHUNK_ROWS = 16_384
+
+
+def to_array(values):
+    """
+    Column values as read from a model: a numeric array if they're all
+    numbers, otherwise their text (with None, e.g. SQL NULL, as "").
+    """
+    array = np.array(values)
+    if array.dtype.kind in "iufU":
+        return array
+    return np.array(["" if v is None else str(v) for v in values], str)
+
+
+def argsort(keys):
+    """
+    Stable argsort; for text, empty values (e.g. NULL) go last, as
+    missing values do in QSortFilterProxyModel.
+    """
+    if keys.dtype.kind == "U":
+        return np.lexsort((keys, keys == ""))
+    return np.argsort(keys, kind="stable")
+
+
+def to_text(values, case_sensitive):
+    strings = values.astype(str)
+    return strings if case_sensitive else np.char.lower(strings)
+
+
+def sort_filter(
+    columns,
+    text,
+    needle,
+    filter_column,
+    case_sensitive,
+    sort_column,
+    order,
+    cancelled=lambda: False,
+):
+    """
+    The source rows to show, in order: those with needle in the text of
+    filter_column (or any column, for -1), sorted by sort_column (if not
+    -1). Ties keep their source order, either way up, as with
+    QSortFilterProxyModel.
+
+    text is a cache of the text to match against, for each chunk of
+    rows of each column, filled in as needed. Returns None if
+    cancelled() becomes true on the way.
+    """
+    n_rows = len(columns[0]) if columns else 0
+    rows = None
+
+    if needle:
+        if not case_sensitive:
+            needle = needle.lower()
+        searched = range(len(columns))
+        if filter_column >= 0:
+            searched = [filter_column]
+
+        mask = np.zeros(n_rows, bool)
+        for column in searched:
+            for start in range(0, n_rows, CHUNK_ROWS):
+                if cancelled():
+                    return None
+                end = start + CHUNK_ROWS
+                key = column, case_sensitive, start
+                strings = text.get(key)
+                if strings is None:
+                    values = columns[column][start:end]
+                    strings = text[key] = to_text(values, case_sensitive)
+                mask[start:end] |= np.char.find(strings, needle) >= 0
+        rows = np.flatnonzero(mask)
+
+    if cancelled():
+        return None
+
+    if 0 <= sort_column < len(columns):
+        keys = columns[sort_column]
+        if rows is not None:
+            keys = keys[rows]
+        if order == DescendingOrder:
+            # Sort reversed and reverse back, to keep ties in order.
+            ordered = len(keys) - 1 - argsort(keys[::-1])[::-1]
+        else:
+            ordered = argsort(keys)
+        rows = ordered if rows is None else rows[ordered]
+
+    if rows is None:
+        rows = np.arange(n_rows)
+    return rows
+
+
+class SortFilterSignals(QObject):
+    """
+    Defines the signals available from a running sort/filter job.
+
+    result
+        `int` generation, `numpy.ndarray` source rows to show in order
+    """
+
+    result = Signal(int, object)
+
+
+class SortFilterJob(QRunnable):
+    """
+    Runs sort_filter on the thread pool, for one request. Set cancelled
+    to make it stop early, and send nothing.
+    """
+
+    def __init__(self, generation, *args):
+        super().__init__()
+        self.generation = generation
+        self.args = args
+        self.cancelled = False
+        self.signals = SortFilterSignals()
+
+    @Slot()
+    def run(self):
+        if self.cancelled:
+            return  # Replaced before it started.
+        rows = sort_filter(*self.args, cancelled=lambda: self.cancelled)
+        if rows is not None:
+            self.signals.result.emit(self.generation, rows)
+
+
+class ArraySortFilterProxyModel(QAbstractProxyModel):
+    """
+    Sorts and filters a flat table model, like QSortFilterProxyModel,
+    but without calling back into the source model for every row: the
+    source columns are read once into NumPy arrays, and each sort or
+    filter is a mask (np.char.find) and an argsort over those, run on
+    the thread pool. The result replaces the mapping in one go, with
+    layoutChanged, keeping selections and current indexes.
+
+    Only the latest request counts. Each new filter or sort cancels the
+    job before it (which stops between chunks of rows), and a result
+    from a job that has been replaced is dropped. busy is True while a
+    job is outstanding.
+
+    Sources with a column_values(column) method (e.g. NumpyTableModel)
+    provide their arrays directly; for any other model the DisplayRole
+    of every cell is read (fetching all rows first, for SQL models).
+    After a source reset the rows are sorted and filtered straight
+    away, as the views are being rebuilt anyway.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.threadpool = QThreadPool.globalInstance()
+
+        self._columns = []  # NumPy array of each source column.
+        self._text = {}  # (column, case_sensitive, start) -> text.
+        self._rows = np.arange(0)  # Source row of each row.
+        self._inverse = np.arange(0)  # Row of each source row, or -1.
+
+        self._needle = ""
+        self._filter_column = -1
+        self._case_sensitive = True
+        self._sort_column = -1
+        self._order = Qt.AscendingOrder
+
+        self._generation = 0
+        self._job = None
+        self.busy = False
+        self._fetching = False
+
+    # Configuration, as QSortFilterProxyModel.
+
+    def setSourceModel(self, model):
+        self.beginResetModel()
+        super().setSourceModel(model)
+        model.modelAboutToBeReset.connect(self.beginResetModel)
+        model.modelReset.connect(self._source_reset)
+        model.layoutAboutToBeChanged.connect(self.beginResetModel)
+        model.layoutChanged.connect(self._source_reset)
+        model.dataChanged.connect(self._source_data_changed)
+        model.rowsAboutToBeInserted.connect(self._source_rows_changing)
+        model.rowsInserted.connect(self._source_rows_inserted)
+        model.rowsAboutToBeRemoved.connect(self._source_rows_changing)
+        model.rowsRemoved.connect(self._source_rows_removed)
+        self._source_reset()
+
+    def setFilterFixedString(self, text):
+        self._needle = text
+        self._schedule()
+
+    def setFilterKeyColumn(self, column):
+        self._filter_column = column
+        self._schedule()
+
+    def setFilterCaseSensitivity(self, sensitivity):
+        self._case_sensitive = sensitivity == CaseSensitive
+        self._schedule()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self._sort_column = column
+        self._order = order
+        self._schedule()
+
+    # Sorting and filtering.
+
+    def _arguments(self):
+        return (
+            self._columns,
+            self._text,
+            self._needle,
+            self._filter_column,
+            self._case_sensitive,
+            self._sort_column,
+            self._order,
+        )
+
+    def _schedule(self):
+        if self._job is not None:
+            self._job.cancelled = True
+        self._generation += 1
+        self._job = SortFilterJob(self._generation, *self._arguments())
+        self._job.signals.result.connect(self._receive_result)
+        self.busy = True
+        self.threadpool.start(self._job)
+
+    def _receive_result(self, generation, rows):
+        if generation != self._generation:
+            return  # Stale, there's a newer job.
+        self._job = None
+        self.busy = False
+        self._apply(rows)
+
+    def _apply(self, rows):
+        # Swap in the new mapping, moving persistent indexes (selection,
+        # current index, mapper) to where their source rows are now.
+        self.layoutAboutToBeChanged.emit()
+        old = self.persistentIndexList()
+        sources = [self.mapToSource(index) for index in old]
+        self._set_rows(rows)
+        new = [self.mapFromSource(index) for index in sources]
+        self.changePersistentIndexList(old, new)
+        self.layoutChanged.emit()
+
+    def _set_rows(self, rows):
+        self._rows = rows
+        self._inverse = np.full(len(self._columns[0]), -1, np.intp)
+        self._inverse[rows] = np.arange(len(rows))
+
+    # Reading the source.
+
+    def _read_column(self, column):
+        source = self.sourceModel()
+        if hasattr(source, "column_values"):
+            return np.asarray(source.column_values(column))
+        index = source.index
+        data = source.data
+        return to_array(
+            [
+                data(index(row, column), DisplayRole)
+                for row in range(source.rowCount())
+            ]
+        )
+
+    def _read(self):
+        source = self.sourceModel()
+        # The rows this adds are read below, not as inserts.
+        self._fetching = True
+        while source.canFetchMore(QModelIndex()):
+            n_rows = source.rowCount()
+            source.fetchMore(QModelIndex())
+            if source.rowCount() == n_rows:
+                break  # e.g. a QSqlTableModel with no query yet.
+        self._fetching = False
+        self._columns = [
+            self._read_column(column)
+            for column in range(source.columnCount())
+        ]
+        if not self._columns:
+            self._columns = [np.arange(0)]
+        # A new dict, so running jobs fill in the old one.
+        self._text = {}
+
+    def _source_reset(self):
+        if self._job is not None:
+            self._job.cancelled = True
+            self._job = None
+        self._generation += 1
+        self.busy = False
+        self._read()
+        self._set_rows(sort_filter(*self._arguments()))
+        self.endResetModel()
+
+    def _source_data_changed(self, top_left, bottom_right, roles=()):
+        # New list and dict, as running jobs may be reading the old.
+        changed = range(top_left.column(), bottom_right.column() + 1)
+        columns = list(self._columns)
+        for column in changed:
+            columns[column] = self._read_column(column)
+        self._columns = columns
+        self._text = {
+            key: text
+            for key, text in self._text.items()
+            if key[0] not in changed
+        }
+
+        # Pass it on for the rows shown, then sort and filter again.
+        shown = self._inverse[top_left.row() : bottom_right.row() + 1]
+        shown = shown[shown >= 0]
+        if len(shown):
+            self.dataChanged.emit(
+                self.index(int(shown.min()), top_left.column()),
+                self.index(int(shown.max()), bottom_right.column()),
+            )
+        if self._needle or self._sort_column >= 0:
+            self._schedule()
+
+    def _source_rows_changing(self, parent, first, last):
+        if self._fetching:
+            return
+        self.layoutAboutToBeChanged.emit()
+        self._persistent = self.persistentIndexList()
+        self._persistent_rows = [
+            (int(self._rows[i.row()]), i.column()) for i in self._persistent
+        ]
+
+    def _source_rows_changed(self, rows, moved):
+        # moved maps each old source row to its new one, or -1.
+        self._read()
+        self._set_rows(rows)
+        new = []
+        for row, column in self._persistent_rows:
+            row = moved(row)
+            proxy_row = self._inverse[row] if row >= 0 else -1
+            new.append(
+                self.index(int(proxy_row), column)
+                if proxy_row >= 0
+                else QModelIndex()
+            )
+        self.changePersistentIndexList(self._persistent, new)
+        self._persistent = self._persistent_rows = None
+        self.layoutChanged.emit()
+        self._schedule()  # Place the changed rows.
+
+    def _source_rows_inserted(self, parent, first, last):
+        # Existing rows move down; new rows appear once sorted/filtered.
+        if self._fetching:
+            return
+        count = last - first + 1
+        rows = self._rows.copy()
+        rows[rows >= first] += count
+        self._source_rows_changed(
+            rows, lambda row: row + count if row >= first else row
+        )
+
+    def _source_rows_removed(self, parent, first, last):
+        if self._fetching:
+            return
+        count = last - first + 1
+        rows = self._rows[(self._rows < first) | (self._rows > last)]
+        rows[rows > last] -= count
+
+        def moved(row):
+            if row > last:
+                return row - count
+            return -1 if row >= first else row
+
+        self._source_rows_changed(rows, moved)
+
+    # Mapping.
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not 0 <= row < len(self._rows):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        source = self.sourceModel()
+        if parent.isValid() or source is None:
+            return 0
+        return source.columnCount()
+
+    def mapToSource(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        row = int(self._rows[index.row()])
+        return self.sourceModel().index(row, index.column())
+
+    def mapFromSource(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        row = self._inverse[index.row()]
+        if row < 0:
+            return QModelIndex()
+        return self.createIndex(int(row), index.column())
@@ -1,7 +1,7 @@
 import os
 import sys
 
-from PySide6.QtCore import QSize, QSortFilterProxyModel, Qt
+from PySide6.QtCore import QSize, Qt
 from PySide6.QtSql import QSqlDatabase, QSqlTableModel
 
 from PySide6.QtWidgets import (
@@ -21,6 +21,7 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from sortfilterproxy import ArraySortFilterProxyModel
 
 basedir = os.path.dirname(__file__)
 
@@ -82,7 +83,9 @@ class MainWindow(QMainWindow):
 
         self.model = QSqlTableModel(db=self.db)
 
-        self.proxy_model = QSortFilterProxyModel()
+        # Sorts and filters on NumPy arrays of the columns, in the
+        # thread pool, so typing in the search box never blocks.
+        self.proxy_model = ArraySortFilterProxyModel()
         self.proxy_model.setSourceModel(self.model)
         self.proxy_model.sort(1, Qt.AscendingOrder)
         self.proxy_model.setFilterKeyColumn(-1)  # all columns
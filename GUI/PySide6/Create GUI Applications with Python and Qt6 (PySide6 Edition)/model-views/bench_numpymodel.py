@@ -0,0 +1,104 @@
+"""
+Scroll a QTableView over a 10,000,000 x 20 float64 array (1.6 GB),
+offscreen at 1200 x 800, painting the viewport after each step:
+
+  page    down one page at a time, as with Page Down or the wheel.
+  jump    to random rows, as when dragging the scroll bar.
+  repaint the same rows again, e.g. after hovering or selection.
+
+with the original tableview_numpy.py model (str() of each cell on
+every paint) against NumpyTableModel.
+
+Run with QT_QPA_PLATFORM=offscreen to benchmark without a display.
+"""
+import sys
+import time
+
+import numpy as np
+from PySide6.QtCore import QAbstractTableModel, Qt
+from PySide6.QtWidgets import QApplication, QTableView
+
+from numpymodel import NumpyTableModel
+
+N_ROWS = 10_000_000
+N_COLUMNS = 20
+STEPS = 200
+
+
+class TableModel(QAbstractTableModel):
+    # As in tableview_numpy.py before NumpyTableModel.
+    def __init__(self, data):
+        super().__init__()
+        self._data = data
+
+    def data(self, index, role):
+        if role == Qt.DisplayRole:
+            value = self._data[index.row(), index.column()]
+            return str(value)
+
+    def rowCount(self, index):
+        return self._data.shape[0]
+
+    def columnCount(self, index):
+        return self._data.shape[1]
+
+
+def scroll(view, values):
+    scrollbar = view.verticalScrollBar()
+    times = []
+    for value in values:
+        start = time.perf_counter()
+        scrollbar.setValue(value)
+        view.viewport().repaint()
+        times.append(time.perf_counter() - start)
+    return np.array(times)
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+
+    start = time.perf_counter()
+    data = np.random.default_rng(0).standard_normal((N_ROWS, N_COLUMNS))
+    print(
+        "%d x %d float64, %.1f GB (%.1fs to generate)"
+        % (
+            N_ROWS,
+            N_COLUMNS,
+            data.nbytes / 1e9,
+            time.perf_counter() - start,
+        )
+    )
+
+    rng = np.random.default_rng(1)
+    for name, model in [
+        ("str per cell", TableModel(data)),
+        ("NumpyTableModel", NumpyTableModel(data)),
+    ]:
+        view = QTableView()
+        view.resize(1200, 800)
+        view.setModel(model)
+        view.show()
+        app.processEvents()
+
+        page = view.verticalScrollBar().pageStep()
+        maximum = view.verticalScrollBar().maximum()
+        jumps = rng.integers(0, maximum, STEPS)
+        for mode, values in [
+            ("page", np.arange(STEPS) * page),
+            ("jump", jumps),
+            ("repaint", np.full(STEPS, jumps[-1])),
+        ]:
+            times = scroll(view, values) * 1000
+            print(
+                "%-16s %-8s %6.2f ms mean  %6.2f ms max  %5.0f fps"
+                % (
+                    name,
+                    mode,
+                    times.mean(),
+                    times.max(),
+                    1000 / times.mean(),
+                )
+            )
+        view.close()
+        view.deleteLater()
+        app.processEvents()
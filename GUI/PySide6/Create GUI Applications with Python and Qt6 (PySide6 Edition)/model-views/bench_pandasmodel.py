@@ -0,0 +1,246 @@
+"""
+Open and scroll a 50,000,000 row CSV file (4 columns, ~1.4 GB; a
+1,000,000 row block of random values repeated), in a QTableView
+offscreen at 1200 x 800:
+
+  open     DataFrameModel.from_csv, which reads the first CHUNK_ROWS,
+           against pandas.read_csv of the whole file (timed on the
+           first 5,000,000 rows and scaled, as all of it would not fit
+           in memory here).
+  scroll   page / jump / repaint over the rows loaded, painting the
+           viewport after each step, with the original
+           tableview_pandas.py model (.iloc per cell) against
+           DataFrameModel.
+  fetch    scrolling to the end of what's loaded, which reads the next
+           chunk with fetchMore.
+
+The file is written to the temporary directory, and removed after.
+First, check_chunks() checks that cells and row labels read across
+the end of a chunk are the same as for the whole DataFrame at once,
+and check_editing() that cells and columns of an editable model can
+be changed, leaving the DataFrame as it was.
+
+Run with QT_QPA_PLATFORM=offscreen to benchmark without a display.
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtWidgets import QApplication, QTableView
+
+from pandasmodel import CHUNK_ROWS, DataFrameModel
+
+N_ROWS = 50_000_000
+BLOCK_ROWS = 1_000_000
+EAGER_ROWS = 5_000_000
+STEPS = 100
+FETCHES = 20
+
+
+class TableModel(QAbstractTableModel):
+    # As in tableview_pandas.py before DataFrameModel.
+    def __init__(self, data):
+        super().__init__()
+        self._data = data
+
+    def data(self, index, role):
+        if role == Qt.DisplayRole:
+            value = self._data.iloc[index.row(), index.column()]
+            return str(value)
+
+    def rowCount(self, index):
+        return self._data.shape[0]
+
+    def columnCount(self, index):
+        return self._data.shape[1]
+
+    def headerData(self, section, orientation, role):
+        if role == Qt.DisplayRole:
+            if orientation == Qt.Horizontal:
+                return str(self._data.columns[section])
+
+            if orientation == Qt.Vertical:
+                return str(self._data.index[section])
+
+
+def write_csv(path):
+    rng = np.random.default_rng(0)
+    block = pd.DataFrame(
+        {
+            "a": rng.standard_normal(BLOCK_ROWS).round(6),
+            "b": rng.random(BLOCK_ROWS).round(6),
+            "label": np.array(["red", "green", "blue", "black"])[
+                rng.integers(0, 4, BLOCK_ROWS)
+            ],
+            "count": rng.integers(0, 1000, BLOCK_ROWS),
+        }
+    )
+    header, rows = block.to_csv(index=False).split("\n", 1)
+    with open(path, "w") as f:
+        f.write(header + "\n")
+        for _ in range(N_ROWS // BLOCK_ROWS):
+            f.write(rows)
+
+
+def cells(model, rows):
+    # The text of each cell in the rows, and the row's label.
+    role = Qt.DisplayRole
+    return [
+        [model.data(model.index(row, c), role) for c in range(4)]
+        + [model.headerData(row, Qt.Vertical, role)]
+        for row in rows
+    ]
+
+
+def check_chunks(chunk_rows=1000, n_rows=3000):
+    """
+    Read a small CSV (with an index) in chunks that don't end on a
+    block boundary, reading rows at the end of the first chunk before
+    fetching the rest, and compare with the whole DataFrame.
+    """
+    path = os.path.join(tempfile.gettempdir(), "bench_pandasmodel_check.csv")
+    df = pd.DataFrame(
+        {
+            "a": np.arange(n_rows) / 3,
+            "label": ["row %d" % n for n in range(n_rows)],
+            "count": np.arange(n_rows),
+            "b": np.arange(n_rows) * 2.5,
+        },
+        index=pd.Index(["r%d" % n for n in range(n_rows)], name="key"),
+    )
+    df.to_csv(path)
+    try:
+        model = DataFrameModel.from_csv(
+            path, chunk_rows=chunk_rows, index_col=0
+        )
+        cells(model, range(chunk_rows - 10, chunk_rows))
+        while model.canFetchMore(QModelIndex()):
+            model.fetchMore(QModelIndex())
+        whole = DataFrameModel(df)
+        assert cells(model, range(n_rows)) == cells(whole, range(n_rows))
+    finally:
+        os.remove(path)
+    print("check    chunks read across boundaries match")
+
+
+def check_editing():
+    """
+    Edit a cell and replace a column of an editable model, whose
+    DataFrame's columns are read-only with copy-on-write.
+    """
+    df = pd.DataFrame({"a": [1.5, 2.5], "b": [1, 2], "c": ["x", "y"]})
+    model = DataFrameModel(df, editable=True)
+    role = Qt.DisplayRole
+    assert model.setData(model.index(0, 0), "5.5", Qt.EditRole)
+    assert model.data(model.index(0, 0), role) == "5.5"
+    model.set_column("b", [7, 8])
+    assert [model.data(model.index(r, 1), role) for r in range(2)] == [
+        "7",
+        "8",
+    ]
+    assert model.setData(model.index(1, 2), "z", Qt.EditRole)
+    assert model.data(model.index(1, 2), role) == "z"
+    assert df.equals(
+        pd.DataFrame({"a": [1.5, 2.5], "b": [1, 2], "c": ["x", "y"]})
+    )
+    print("check    cells and columns of a DataFrame can be edited")
+
+
+def make_view(model):
+    view = QTableView()
+    view.resize(1200, 800)
+    view.setModel(model)
+    view.show()
+    QApplication.processEvents()
+    return view
+
+
+def scroll(view, values):
+    scrollbar = view.verticalScrollBar()
+    times = []
+    for value in values:
+        start = time.perf_counter()
+        scrollbar.setValue(value)
+        view.viewport().repaint()
+        times.append(time.perf_counter() - start)
+    return np.array(times) * 1000
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    check_chunks()
+    check_editing()
+    path = os.path.join(tempfile.gettempdir(), "bench_pandasmodel.csv")
+
+    start = time.perf_counter()
+    write_csv(path)
+    print(
+        "%d rows, %.2f GB (%.0fs to write)"
+        % (
+            N_ROWS,
+            os.path.getsize(path) / 1e9,
+            time.perf_counter() - start,
+        )
+    )
+
+    try:
+        start = time.perf_counter()
+        eager = pd.read_csv(path, nrows=EAGER_ROWS)
+        elapsed = time.perf_counter() - start
+        print(
+            "open     read_csv        %8.2fs  (%.2fs for %d rows, scaled)"
+            % (elapsed * N_ROWS / EAGER_ROWS, elapsed, EAGER_ROWS)
+        )
+
+        start = time.perf_counter()
+        model = DataFrameModel.from_csv(path)
+        print(
+            "open     DataFrameModel  %8.2fs  (first %d rows)"
+            % (time.perf_counter() - start, model.rowCount())
+        )
+
+        # Both on the same rows: what the lazy model has loaded.
+        rng = np.random.default_rng(1)
+        first = eager.iloc[:CHUNK_ROWS]
+        del eager
+        for name, table_model in [
+            (".iloc per cell", TableModel(first)),
+            ("DataFrameModel", model),
+        ]:
+            view = make_view(table_model)
+            scrollbar = view.verticalScrollBar()
+            page = scrollbar.pageStep()
+            jumps = rng.integers(0, scrollbar.maximum(), STEPS)
+            for mode, values in [
+                ("page", np.arange(STEPS) * page),
+                ("jump", jumps),
+                ("repaint", np.full(STEPS, jumps[-1])),
+            ]:
+                times = scroll(view, values)
+                print(
+                    "scroll   %-15s %-8s %6.2f ms mean  %6.2f ms max"
+                    % (name, mode, times.mean(), times.max())
+                )
+            if table_model is not model:
+                view.close()
+                view.deleteLater()
+
+        # Scrolling to the end of what's loaded fetches the next chunk.
+        times = []
+        for _ in range(FETCHES):
+            start = time.perf_counter()
+            scrollbar.setValue(scrollbar.maximum())
+            view.viewport().repaint()
+            times.append(time.perf_counter() - start)
+        times = np.array(times) * 1000
+        print(
+            "fetch    DataFrameModel  %6.1f ms mean  %6.1f ms max"
+            "  per %d rows, %d rows loaded"
+            % (times.mean(), times.max(), CHUNK_ROWS, model.rowCount())
+        )
+    finally:
+        os.remove(path)
@@ -0,0 +1,154 @@
+"""
+Time for a QListView of 100,000 todos to update after a change, made
+either as todo_complete.py used to (changing the list, then emitting
+layoutChanged) or with TodoModel's insert_todos(), removeRows() and
+moveRows():
+
+  add     one todo added at the end.
+  delete  one todo removed near the top.
+  bulk    BULK_TODOS todos added at once.
+  move    one todo moved from the top to the bottom.
+
+Each is timed as the longest the GUI thread was blocked, from the
+change until the view has been laid out again and repainted.
+"selection" is whether the selected todo was still selected after the
+delete (with layoutChanged, the selection stays on the same row
+number, so moves to the next todo).
+
+QListView lays out every row again after either change, so it's run
+with the default settings, which ask the model for each row's size;
+with uniformItemSizes; and with uniformItemSizes and the Batched
+layout mode, which lays out a batch of rows at a time between events,
+as todo_complete.py now does.
+
+Run with QT_QPA_PLATFORM=offscreen to benchmark without a display.
+"""
+import sys
+import time
+
+from PySide6.QtCore import QItemSelectionModel, QModelIndex
+from PySide6.QtWidgets import QApplication, QListView
+
+from todomodel import TodoModel
+
+N_TODOS = 100_000
+BULK_TODOS = 10_000
+SELECTED = 10
+# Events are processed for this long after each change.
+SETTLE_SECONDS = 2.0
+
+VIEWS = {
+    "default": (False, QListView.SinglePass),
+    "uniform": (True, QListView.SinglePass),
+    "batched": (True, QListView.Batched),
+}
+
+
+def add_layout(model):
+    model.todos.append((False, "One more"))
+    model.layoutChanged.emit()
+
+
+def add_rows(model):
+    model.insert_todos(model.rowCount(), [(False, "One more")])
+
+
+def delete_layout(model):
+    del model.todos[5]
+    model.layoutChanged.emit()
+
+
+def delete_rows(model):
+    model.removeRows(5, 1)
+
+
+def bulk_layout(model):
+    model.todos.extend([(False, "Bulk")] * BULK_TODOS)
+    model.layoutChanged.emit()
+
+
+def bulk_rows(model):
+    model.insert_todos(model.rowCount(), [(False, "Bulk")] * BULK_TODOS)
+
+
+def move_layout(model):
+    model.todos.append(model.todos.pop(0))
+    model.layoutChanged.emit()
+
+
+def move_rows(model):
+    model.moveRows(QModelIndex(), 0, 1, QModelIndex(), model.rowCount())
+
+
+APPROACHES = {
+    "layoutChanged": [
+        ("add", add_layout),
+        ("delete", delete_layout),
+        ("bulk", bulk_layout),
+        ("move", move_layout),
+    ],
+    "rows": [
+        ("add", add_rows),
+        ("delete", delete_rows),
+        ("bulk", bulk_rows),
+        ("move", move_rows),
+    ],
+}
+
+
+def blocked(app, change, model):
+    """
+    Make the change and process events until the view settles,
+    returning the longest time (ms) the GUI thread was blocked.
+    """
+    start = last = time.perf_counter()
+    change(model)
+    longest = 0
+    while last - start < SETTLE_SECONDS:
+        app.processEvents()
+        now = time.perf_counter()
+        longest = max(longest, now - last)
+        last = now
+    return 1e3 * longest
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+
+    for view_name, (uniform, layout_mode) in VIEWS.items():
+        for approach, changes in APPROACHES.items():
+            model = TodoModel(
+                [(False, "Todo number %d" % n) for n in range(N_TODOS)]
+            )
+            view = QListView()
+            view.setUniformItemSizes(uniform)
+            view.setLayoutMode(layout_mode)
+            view.setModel(model)
+            view.resize(300, 400)
+            view.show()
+            blocked(app, lambda model: None, model)
+
+            view.selectionModel().select(
+                model.index(SELECTED), QItemSelectionModel.ClearAndSelect
+            )
+            selected = model.todos[SELECTED]
+
+            times = []
+            for name, change in changes:
+                ms = blocked(app, change, model)
+                times.append("%s %7.1f ms" % (name, ms))
+                if name == "delete":
+                    rows = view.selectionModel().selectedRows()
+                    kept = [model.todos[i.row()] for i in rows] == [selected]
+
+            print(
+                "%-8s %-14s %s  selection %s"
+                % (
+                    view_name,
+                    approach,
+                    "  ".join(times),
+                    "kept" if kept else "lost",
+                ),
+                flush=True,
+            )
+            view.close()
@@ -0,0 +1,96 @@
+"""
+Cost of adding 100,000 todos, saving each change as it's made:
+
+  json   the whole list written to data.json with json.dump after
+         every add (as todo_complete.py used to), run for the first
+         N_JSON adds only, as each add gets slower as the list grows.
+  store  each add recorded with TodoStore.insert(), written and
+         compacted on a background thread.
+
+For each, the time spent on the calling (GUI) thread, and the time of
+a single add once there are 100,000 todos. For the store, also the
+time until everything has been written, and to open it again.
+"""
+import json
+import os
+import tempfile
+import time
+
+from todostore import TodoStore
+
+N_TODOS = 100_000
+N_JSON = 2_000
+
+
+def save_json(path, todos):
+    with open(path, "w") as f:
+        json.dump(todos, f)
+
+
+if __name__ == "__main__":
+    folder = tempfile.mkdtemp()
+    texts = ["Todo number %d" % n for n in range(N_TODOS)]
+
+    path = os.path.join(folder, "data.json")
+    todos = []
+    start = time.perf_counter()
+    for text in texts[:N_JSON]:
+        todos.append((False, text))
+        save_json(path, todos)
+    json_calls = time.perf_counter() - start
+
+    todos = [(False, text) for text in texts]
+    start = time.perf_counter()
+    save_json(path, todos)
+    json_one = time.perf_counter() - start
+
+    path = os.path.join(folder, "todos.db")
+    store = TodoStore(path)
+    todos = []
+    start = time.perf_counter()
+    for text in texts:
+        todos.append((False, text))
+        store.insert(len(todos) - 1, [(False, text)])
+    store_calls = time.perf_counter() - start
+
+    start = time.perf_counter()
+    store.insert(len(todos), [(False, "One more")])
+    store_one = time.perf_counter() - start
+
+    start = time.perf_counter()
+    store.close()
+    written = store_calls + time.perf_counter() - start
+
+    start = time.perf_counter()
+    store = TodoStore(path)
+    loaded = time.perf_counter() - start
+    n_loaded = len(store.todos())
+    store.close()
+
+    print(
+        "json:  %d adds, GUI thread %.2fs (%.0f us per add);"
+        " one add at %d todos %.1f ms"
+        % (
+            N_JSON,
+            json_calls,
+            1e6 * json_calls / N_JSON,
+            N_TODOS,
+            1e3 * json_one,
+        )
+    )
+    print(
+        "store: %d adds, GUI thread %.2fs (%.1f us per add);"
+        " one add at %d todos %.1f us"
+        % (
+            N_TODOS,
+            store_calls,
+            1e6 * store_calls / N_TODOS,
+            N_TODOS,
+            1e6 * store_one,
+        )
+    )
+    print(
+        "store: written and compacted after %.2fs, reopened in %.2fs"
+        " (%d todos, %.1f MB)"
+        % (written, loaded, n_loaded, os.path.getsize(path) / 1e6)
+    )
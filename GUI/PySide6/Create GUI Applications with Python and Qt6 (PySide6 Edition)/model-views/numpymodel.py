@@ -0,0 +1,192 @@
+from collections import OrderedDict
+
+import numpy as np
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+# Rows formatted together, when any cell in them is first shown.
+BLOCK_ROWS = 256
+# Formatted blocks kept, least recently used dropped first.
+MAX_BLOCKS = 2048
+
+# Default formats by dtype kind, for % formatting.
+FORMATS = {"f": "%.6g", "i": "%d", "u": "%d", "b": "%s"}
+
+# data() is called for several roles for every cell painted, so look
+# these up once: the short forms (Qt.DisplayRole) are slow to resolve.
+DisplayRole = Qt.ItemDataRole.DisplayRole
+EditRole = Qt.ItemDataRole.EditRole
+TextAlignmentRole = Qt.ItemDataRole.TextAlignmentRole
+ALIGN_NUMBERS = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+Horizontal = Qt.Orientation.Horizontal
+Vertical = Qt.Orientation.Vertical
+
+
+def format_block(values, fmt):
+    """
+    Format an array of values to a list of strings: with fmt if it's
+    callable, else as fmt % value. tolist() converts all the values to
+    Python objects in one call, which is much quicker than formatting
+    NumPy scalars one by one.
+    """
+    if callable(fmt):
+        return list(fmt(values))
+    if fmt is None:
+        kind = values.dtype.kind
+        if kind == "S":
+            return [v.decode("utf8", "replace") for v in values.tolist()]
+        if kind in "Mm":
+            # As NumPy shows them; tolist() may give plain integers.
+            return values.astype(str).tolist()
+        return [str(v) for v in values.tolist()]
+    return [fmt % v for v in values.tolist()]
+
+
+class NumpyTableModel(QAbstractTableModel):
+    """
+    Table model for a NumPy array: either 2D, with a column for each
+    column of the array, or a structured (or record) array, with a
+    column for each field, named after it:
+
+        data = np.zeros(10, dtype=[("name", "U10"), ("value", "f8")])
+        model = NumpyTableModel(data)
+
+    Cells aren't formatted one at a time as they're painted. The first
+    time a cell is needed, its column is formatted for the BLOCK_ROWS
+    rows around it in one go and cached, so scrolling and repainting
+    mostly just look up strings. Change the data with setData() or
+    set_column(), which clear the cache for what they change; if the
+    array is changed directly, call invalidate() with the column.
+
+    formats maps column numbers or names to a % format (e.g. "%.2f")
+    or a callable taking an array of values and returning strings.
+    """
+
+    def __init__(self, data, columns=None, formats=None, editable=False):
+        super().__init__()
+        self._data = data
+
+        self._flags = Qt.ItemIsSelectable | Qt.ItemIsEnabled
+        if editable:
+            self._flags |= Qt.ItemIsEditable
+
+        names, self._values = self._split_columns(data)
+        self._columns = list(columns) if columns is not None else names
+        # Header strings, made once rather than on every paint.
+        self._headers = [str(name) for name in self._columns]
+
+        self._format_options = formats or {}
+        self._formats = [None] * len(self._values)
+        self._alignments = [None] * len(self._values)
+        for column in range(len(self._values)):
+            self._set_format(column)
+
+        # (column, block) -> list of strings.
+        self._cache = OrderedDict()
+
+    def _split_columns(self, data):
+        """
+        The column names, and an array of values for each column.
+        """
+        if data.dtype.names is not None:
+            names = list(data.dtype.names)
+            return names, [data[name] for name in names]
+        names = list(range(data.shape[1]))
+        return names, [data[:, c] for c in names]
+
+    def _set_format(self, column):
+        values = self._values[column]
+        numeric = values.dtype.kind in "iuf" and values.ndim == 1
+        self._alignments[column] = ALIGN_NUMBERS if numeric else None
+        fmt = FORMATS.get(values.dtype.kind)
+        if values.ndim > 1:
+            fmt = None  # Sub-arrays, as str.
+        options = self._format_options
+        fmt = options.get(column, options.get(self._columns[column], fmt))
+        self._formats[column] = fmt
+
+    def data(self, index, role):
+        if role == DisplayRole or role == EditRole:
+            return self._text(index.column(), index.row())
+
+        if role == TextAlignmentRole:
+            return self._alignments[index.column()]
+
+    def _text(self, column, row):
+        block, offset = divmod(row, BLOCK_ROWS)
+        key = column, block
+        strings = self._cache.get(key)
+        if strings is None:
+            values, fmt = self._source(column)
+            start = block * BLOCK_ROWS
+            strings = format_block(values[start : start + BLOCK_ROWS], fmt)
+            self._cache[key] = strings
+            if len(self._cache) > MAX_BLOCKS:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        return strings[offset]
+
+    def _source(self, column):
+        """
+        The values and format for a column, by its key in the cache.
+        """
+        return self._values[column], self._formats[column]
+
+    def rowCount(self, index=QModelIndex()):
+        return len(self._data)
+
+    def columnCount(self, index=QModelIndex()):
+        return len(self._columns)
+
+    def headerData(self, section, orientation, role):
+        if role == DisplayRole:
+            if orientation == Horizontal:
+                return self._headers[section]
+
+            if orientation == Vertical:
+                return str(section)
+
+    def flags(self, index):
+        return self._flags
+
+    def setData(self, index, value, role):
+        if role == EditRole:
+            row, column = index.row(), index.column()
+            try:
+                self._values[column][row] = value
+            except (TypeError, ValueError):
+                return False
+            self._cache.pop((column, row // BLOCK_ROWS), None)
+            self.dataChanged.emit(index, index)
+            return True
+        return False
+
+    def set_column(self, column, values):
+        """
+        Replace all the values of a column (number or name).
+        """
+        if not isinstance(column, int):
+            column = self._columns.index(column)
+        self._values[column][:] = values
+        self.invalidate(column)
+        self.dataChanged.emit(
+            self.index(0, column),
+            self.index(self.rowCount() - 1, column),
+        )
+
+    def column_values(self, column):
+        """
+        All the values of a column, as an array (e.g. to sort or filter
+        it with NumPy, see ArraySortFilterProxyModel).
+        """
+        return self._values[column][:]
+
+    def invalidate(self, column=None):
+        """
+        Drop the formatted strings for a column, or all columns.
+        """
+        if column is None:
+            self._cache.clear()
+            return
+        for key in [key for key in self._cache if key[0] == column]:
+            del self._cache[key]
@@ -0,0 +1,207 @@
+from bisect import bisect_right
+
+import numpy as np
+import pandas as pd
+from PySide6.QtCore import QModelIndex, Qt
+
+from numpymodel import BLOCK_ROWS, DisplayRole, NumpyTableModel, Vertical
+
+# Rows read at a time from a file, when the view scrolls to the end:
+# small enough to read in about a frame or two.
+CHUNK_ROWS = 20_000
+
+# Cache key for the index (row labels), alongside the column numbers.
+INDEX = "index"
+
+
+class ChunkedColumn:
+    """
+    One column of a table read in chunks: a list of arrays, one per
+    chunk, sliced and indexed as if they were a single array. Adding a
+    chunk doesn't copy what's there already.
+    """
+
+    def __init__(self, values):
+        self.chunks = [values]
+        self.starts = [0]
+        self.length = len(values)
+        self.dtype = values.dtype
+        self.ndim = 1
+
+    def append(self, values):
+        self.chunks.append(values)
+        self.starts.append(self.length)
+        self.length += len(values)
+        try:
+            self.dtype = np.result_type(self.dtype, values.dtype)
+        except TypeError:
+            self.dtype = np.dtype(object)
+
+    def __len__(self):
+        return self.length
+
+    def _pieces(self, start, stop):
+        # (chunk, start, stop) for each chunk in the range.
+        i = bisect_right(self.starts, start) - 1
+        while start < stop:
+            chunk_start = self.starts[i]
+            chunk = self.chunks[i]
+            end = min(stop, chunk_start + len(chunk))
+            yield chunk, start - chunk_start, end - chunk_start
+            start = end
+            i += 1
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, _ = key.indices(self.length)
+            pieces = [c[a:b] for c, a, b in self._pieces(start, stop)]
+            if len(pieces) == 1:
+                return pieces[0]
+            if not pieces:
+                return np.empty(0, self.dtype)
+            return np.concatenate(pieces).astype(self.dtype, copy=False)
+        ((chunk, offset, _),) = self._pieces(key, key + 1)
+        return chunk[offset]
+
+    def __setitem__(self, key, value):
+        if isinstance(key, slice):
+            start, stop, _ = key.indices(self.length)
+            value = np.broadcast_to(value, (stop - start,))
+            done = 0
+            for chunk, a, b in self._pieces(start, stop):
+                chunk[a:b] = value[done : done + b - a]
+                done += b - a
+            return
+        ((chunk, offset, _),) = self._pieces(key, key + 1)
+        chunk[offset] = value
+
+
+def column_arrays(df, copy=False):
+    # By position, as column names in a DataFrame needn't be unique.
+    # With copy-on-write (pandas 3), the arrays are read-only views
+    # unless copied.
+    return [df.iloc[:, i].to_numpy(copy=copy) for i in range(df.shape[1])]
+
+
+def is_default_index(index):
+    return (
+        isinstance(index, pd.RangeIndex)
+        and index.start == 0
+        and index.step == 1
+    )
+
+
+class DataFrameModel(NumpyTableModel):
+    """
+    Table model for a pandas DataFrame. Each column is taken out of the
+    DataFrame as a NumPy array once, rather than read with .iloc for
+    every cell painted, and formatted a block of rows at a time as in
+    NumpyTableModel. The index, if not just row numbers, is shown in
+    the vertical header in the same way.
+
+    from_csv() and from_parquet() read a file lazily, CHUNK_ROWS rows
+    at a time: the first chunk when opened, the next when the view
+    scrolls to the end (through canFetchMore/fetchMore), so even a very
+    large file opens immediately and only what has been looked at is
+    held in memory.
+
+    If editable, the columns are copied out of the DataFrame, which is
+    left as it was: edits are made to the model's copy.
+    """
+
+    def __init__(self, data, chunks=None, formats=None, editable=False):
+        super().__init__(data, formats=formats, editable=editable)
+        self._chunks = chunks
+        self._rows = len(data)
+        # Known up front for Parquet, not for CSV.
+        self.total_rows = None if chunks is not None else len(data)
+        self._index = None
+        if not is_default_index(data.index):
+            self._index = ChunkedColumn(data.index.to_numpy())
+
+    @property
+    def editable(self):
+        return bool(self._flags & Qt.ItemIsEditable)
+
+    def _split_columns(self, data):
+        names = list(data.columns)
+        arrays = column_arrays(data, copy=self.editable)
+        return names, [ChunkedColumn(v) for v in arrays]
+
+    @classmethod
+    def from_csv(cls, path, chunk_rows=CHUNK_ROWS, **kwargs):
+        """
+        Open a CSV file; kwargs are passed to pandas.read_csv.
+        """
+        reader = pd.read_csv(path, chunksize=chunk_rows, **kwargs)
+        return cls._from_chunks(iter(reader))
+
+    @classmethod
+    def from_parquet(cls, path, chunk_rows=CHUNK_ROWS, **kwargs):
+        """
+        Open a Parquet file, with pyarrow; kwargs are passed to
+        ParquetFile.iter_batches (e.g. columns=[...]).
+        """
+        import pyarrow.parquet as pq  # Only needed for Parquet files.
+
+        parquet = pq.ParquetFile(path)
+        batches = parquet.iter_batches(batch_size=chunk_rows, **kwargs)
+        model = cls._from_chunks(batch.to_pandas() for batch in batches)
+        model.total_rows = parquet.metadata.num_rows
+        return model
+
+    @classmethod
+    def _from_chunks(cls, chunks):
+        first = next(chunks, None)
+        if first is None:
+            return cls(pd.DataFrame())
+        return cls(first, chunks=chunks)
+
+    def rowCount(self, index=QModelIndex()):
+        return self._rows
+
+    def headerData(self, section, orientation, role):
+        if (
+            role == DisplayRole
+            and orientation == Vertical
+            and self._index is not None
+        ):
+            return self._text(INDEX, section)
+        return super().headerData(section, orientation, role)
+
+    def _source(self, column):
+        if column == INDEX:
+            return self._index, None
+        return super()._source(column)
+
+    def canFetchMore(self, parent):
+        return self._chunks is not None and not parent.isValid()
+
+    def fetchMore(self, parent):
+        chunk = next(self._chunks, None)
+        while chunk is not None and not len(chunk):
+            chunk = next(self._chunks, None)
+        if chunk is None:
+            self._chunks = None  # All read.
+            self.total_rows = self._rows
+            return
+
+        first = self._rows
+        self.beginInsertRows(QModelIndex(), first, first + len(chunk) - 1)
+        if first % BLOCK_ROWS:
+            # The last block was formatted short, without the new rows.
+            block = first // BLOCK_ROWS
+            for column in [*range(len(self._values)), INDEX]:
+                self._cache.pop((column, block), None)
+        arrays = column_arrays(chunk, copy=self.editable)
+        for column, values in enumerate(arrays):
+            dtype = self._values[column].dtype
+            self._values[column].append(values)
+            if self._values[column].dtype != dtype:
+                # e.g. a column of ints with a gap, becoming floats.
+                self._set_format(column)
+                self.invalidate(column)
+        if self._index is not None:
+            self._index.append(chunk.index.to_numpy())
+        self._rows += len(chunk)
+        self.endInsertRows()
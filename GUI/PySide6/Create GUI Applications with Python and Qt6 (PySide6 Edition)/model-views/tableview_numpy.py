@@ -2,25 +2,8 @@ import sys
 
 import numpy as np
 from PySide6.QtWidgets import QMainWindow, QApplication, QTableView
-from PySide6.QtCore import Qt, QAbstractTableModel
 
-
-class TableModel(QAbstractTableModel):
-    def __init__(self, data):
-        super().__init__()
-        self._data = data
-
-    def data(self, index, role):
-        if role == Qt.DisplayRole:
-            # Note: self._data[index.row()][index.column()] will also work
-            value = self._data[index.row(), index.column()]
-            return str(value)
-
-    def rowCount(self, index):
-        return self._data.shape[0]
-
-    def columnCount(self, index):
-        return self._data.shape[1]
+from numpymodel import NumpyTableModel
 
 
 class MainWindow(QMainWindow):
@@ -39,7 +22,9 @@ class MainWindow(QMainWindow):
             ]
         )
 
-        self.model = TableModel(data)
+        # Cells are formatted a block of rows at a time, and cached, so
+        # this works just as well for millions of rows.
+        self.model = NumpyTableModel(data, columns=["A", "B", "C"])
         self.table.setModel(self.model)
 
         self.setCentralWidget(self.table)
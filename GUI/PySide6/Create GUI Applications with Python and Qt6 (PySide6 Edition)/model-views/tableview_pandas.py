@@ -2,32 +2,8 @@ import sys
 
 import pandas as pd
 from PySide6.QtWidgets import QMainWindow, QApplication, QTableView
-from PySide6.QtCore import Qt, QAbstractTableModel
 
-
-class TableModel(QAbstractTableModel):
-    def __init__(self, data):
-        super().__init__()
-        self._data = data
-
-    def data(self, index, role):
-        if role == Qt.DisplayRole:
-            value = self._data.iloc[index.row(), index.column()]
-            return str(value)
-
-    def rowCount(self, index):
-        return self._data.shape[0]
-
-    def columnCount(self, index):
-        return self._data.shape[1]
-
-    def headerData(self, section, orientation, role):
-        if role == Qt.DisplayRole:
-            if orientation == Qt.Horizontal:
-                return str(self._data.columns[section])
-
-            if orientation == Qt.Vertical:
-                return str(self._data.index[section])
+from pandasmodel import DataFrameModel
 
 
 class MainWindow(QMainWindow):
@@ -48,7 +24,10 @@ class MainWindow(QMainWindow):
             index=["Row 1", "Row 2", "Row 3", "Row 4", "Row 5"],
         )
 
-        self.model = TableModel(data)
+        # Takes each column out of the DataFrame once, and formats rows
+        # in blocks. For large files, DataFrameModel.from_csv(path) or
+        # .from_parquet(path) read more rows as you scroll down.
+        self.model = DataFrameModel(data)
         self.table.setModel(self.model)
 
         self.setCentralWidget(self.table)
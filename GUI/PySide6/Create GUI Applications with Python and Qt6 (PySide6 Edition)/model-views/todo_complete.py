@@ -2,35 +2,14 @@ import json
 import os
 import sys
 
-from PySide6.QtCore import QAbstractListModel, Qt
-from PySide6.QtGui import QImage
-from PySide6.QtWidgets import QApplication, QMainWindow
+from PySide6.QtWidgets import QApplication, QListView, QMainWindow
 
 from MainWindow import Ui_MainWindow
+from todomodel import TodoModel
+from todostore import TodoStore
 
 basedir = os.path.dirname(__file__)
 
-tick = QImage(os.path.join(basedir, "tick.png"))
-
-
-class TodoModel(QAbstractListModel):
-    def __init__(self, todos=None):
-        super().__init__()
-        self.todos = todos or []
-
-    def data(self, index, role):
-        if role == Qt.DisplayRole:
-            status, text = self.todos[index.row()]
-            return text
-
-        if role == Qt.DecorationRole:
-            status, text = self.todos[index.row()]
-            if status:
-                return tick
-
-    def rowCount(self, index):
-        return len(self.todos)
-
 
 class MainWindow(QMainWindow, Ui_MainWindow):
     def __init__(self):
@@ -38,6 +17,11 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.setupUi(self)
         self.model = TodoModel()
         self.load()
+        # Every row is a line of text (and a tick), so the view needn't
+        # ask for the size of each, and lays them out a batch at a time
+        # so a long list never holds up the window.
+        self.todoView.setUniformItemSizes(True)
+        self.todoView.setLayoutMode(QListView.Batched)
         self.todoView.setModel(self.model)
         self.addButton.pressed.connect(self.add)
         self.deleteButton.pressed.connect(self.delete)
@@ -52,25 +36,24 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         # Remove whitespace from the ends of the string.
         text = text.strip()
         if text:  # Don't add empty strings.
-            # Access the list via the model.
-            self.model.todos.append((False, text))
-            # Trigger refresh.
-            self.model.layoutChanged.emit()
+            # Add it at the end, through the model, which tells the view.
+            row = self.model.rowCount()
+            self.model.insert_todos(row, [(False, text)])
             # Empty the input
             self.todoEdit.setText("")
-            self.save()
+            self.store.insert(row, [(False, text)])
 
     def delete(self):
         indexes = self.todoView.selectedIndexes()
         if indexes:
             # Indexes is a single-item list in single-select mode.
             index = indexes[0]
-            # Remove the item and refresh.
-            del self.model.todos[index.row()]
-            self.model.layoutChanged.emit()
+            row = index.row()
+            # Remove the item, through the model, which tells the view.
+            self.model.removeRows(row, 1)
             # Clear the selection (as it is no longer valid).
             self.todoView.clearSelection()
-            self.save()
+            self.store.remove(row)
 
     def complete(self):
         indexes = self.todoView.selectedIndexes()
@@ -78,24 +61,35 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             index = indexes[0]
             row = index.row()
             status, text = self.model.todos[row]
-            self.model.todos[row] = (True, text)
-            # .dataChanged takes top-left and bottom right, which are equal
-            # for a single selection.
-            self.model.dataChanged.emit(index, index)
+            # Emits .dataChanged for the row.
+            self.model.set_todo(row, (True, text))
             # Clear the selection (as it is no longer valid).
             self.todoView.clearSelection()
-            self.save()
+            self.store.set(row, (True, text))
 
     def load(self):
+        # Each change is saved as it's made, in the background.
+        path = os.path.join(basedir, "todos.db")
+        first_run = not os.path.exists(path)
+        self.store = TodoStore(path)
+        self.model.todos = self.store.todos()
+        if first_run:
+            # Only then: an empty list may just be all todos deleted.
+            self.import_json(os.path.join(basedir, "data.json"))
+
+    def import_json(self, path):
+        # Todos saved as a whole list, by earlier versions.
         try:
-            with open("data.json", "r") as f:
-                self.model.todos = json.load(f)
+            with open(path, "r") as f:
+                todos = [tuple(item) for item in json.load(f)]
         except Exception:
-            pass
+            return
+        self.model.todos = todos
+        self.store.insert(0, todos)
 
-    def save(self):
-        with open("data.json", "w") as f:
-            data = json.dump(self.model.todos, f)
+    def closeEvent(self, event):
+        self.store.close()  # Wait for the last changes to be written.
+        super().closeEvent(event)
 
 
 app = QApplication(sys.argv)
@@ -0,0 +1,97 @@
+import os
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+from PySide6.QtGui import QImage
+
+basedir = os.path.dirname(__file__)
+
+tick = QImage(os.path.join(basedir, "tick.png"))
+
+DisplayRole = Qt.ItemDataRole.DisplayRole
+DecorationRole = Qt.ItemDataRole.DecorationRole
+
+
+class TodoModel(QAbstractListModel):
+    """
+    List model for todos, each a (done, text) tuple.
+
+    Change the list through insert_todos(), removeRows(), moveRows()
+    and set_todo() rather than directly: they tell the view exactly
+    which rows changed, so it keeps its selection and current item,
+    and any number of todos can be added with a single notification.
+    """
+
+    def __init__(self, todos=None):
+        super().__init__()
+        self.todos = todos or []
+
+    def data(self, index, role):
+        if role == DisplayRole:
+            status, text = self.todos[index.row()]
+            return text
+
+        if role == DecorationRole:
+            status, text = self.todos[index.row()]
+            if status:
+                return tick
+
+    def rowCount(self, index=QModelIndex()):
+        return len(self.todos)
+
+    def insert_todos(self, row, todos):
+        """
+        Insert a list of todos at row (rowCount() to append).
+        """
+        if not todos or not 0 <= row <= len(self.todos):
+            return False
+        self.beginInsertRows(QModelIndex(), row, row + len(todos) - 1)
+        self.todos[row:row] = todos
+        self.endInsertRows()
+        return True
+
+    def insertRows(self, row, count, parent=QModelIndex()):
+        # New todos, not done and with no text (e.g. to edit in place).
+        if parent.isValid():
+            return False
+        return self.insert_todos(row, [(False, "")] * count)
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if parent.isValid() or count < 1:
+            return False
+        if row < 0 or row + count > len(self.todos):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self.todos[row : row + count]
+        self.endRemoveRows()
+        return True
+
+    def moveRows(self, source_parent, row, count, parent, destination):
+        """
+        Move count todos from row to before destination (as numbered
+        before the move).
+        """
+        if source_parent.isValid() or parent.isValid() or count < 1:
+            return False
+        if row < 0 or row + count > len(self.todos):
+            return False
+        if not 0 <= destination <= len(self.todos):
+            return False
+        last = row + count - 1
+        # False for moves to within the rows themselves.
+        if not self.beginMoveRows(parent, row, last, parent, destination):
+            return False
+        moved = self.todos[row : row + count]
+        del self.todos[row : row + count]
+        if destination > row:
+            destination -= count
+        self.todos[destination:destination] = moved
+        self.endMoveRows()
+        return True
+
+    def set_todo(self, row, todo):
+        """
+        Replace the todo at row, e.g. to mark it done.
+        """
+        self.todos[row] = todo
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
@@ -0,0 +1,190 @@
+import json
+import queue
+import sqlite3
+import threading
+
+# Compact the log once it holds this many changes, or as many as there
+# are todos if that's more (so compacting stays cheap per change).
+COMPACT_EVERY = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    change TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS todos (
+    row INTEGER PRIMARY KEY,
+    done INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+"""
+
+
+def apply_change(todos, change, data):
+    """
+    Apply a change, as recorded in the log, to a list of todos.
+    """
+    if change == "insert":
+        row, items = data
+        todos[row:row] = [tuple(item) for item in items]
+    elif change == "remove":
+        row, count = data
+        del todos[row : row + count]
+    elif change == "set":
+        row, item = data
+        todos[row] = tuple(item)
+    elif change == "move":
+        row, count, destination = data
+        moved = todos[row : row + count]
+        del todos[row : row + count]
+        if destination > row:
+            destination -= count
+        todos[destination:destination] = moved
+    else:
+        raise ValueError("Unknown change %r" % change)
+
+
+class TodoStore:
+    """
+    Persistent list of todos, each a (done, text) tuple, in an SQLite
+    database.
+
+    Changes are recorded by position, as they are made to the model's
+    list: insert() for new todos, remove(), set() and move(). Each is
+    appended to a log table on a background thread, with everything
+    waiting written together in one transaction, so the GUI thread
+    never waits on the disk and adding a todo costs the same however
+    many there are. Once the log holds COMPACT_EVERY changes (or as
+    many as there are todos, if more) the same thread replays it onto
+    the todos table and empties it, in one transaction, so a crash
+    never loses or repeats a change.
+    """
+
+    def __init__(self, path, compact_every=COMPACT_EVERY):
+        self.path = path
+        self.compact_every = compact_every
+
+        conn = self.connect()
+        conn.executescript(SCHEMA)
+        self._todos = compact(conn)
+        conn.close()
+
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self.write_loop, daemon=True)
+        self._thread.start()
+
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        # Lets compaction return the space freed from the log to the OS
+        # (only takes effect when the database is created).
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        # SQLite's own write-ahead log, so writes only append to a file,
+        # and without a sync on every commit (still safe if we crash).
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def todos(self):
+        """
+        List of the todos when the store was opened.
+        """
+        return list(self._todos)
+
+    def insert(self, row, items):
+        """
+        Record todos inserted at row (len(todos) to append).
+        """
+        self._queue.put(("insert", [row, list(items)]))
+
+    def remove(self, row, count=1):
+        """
+        Record count todos removed, starting at row.
+        """
+        self._queue.put(("remove", [row, count]))
+
+    def set(self, row, item):
+        """
+        Record the todo at row being replaced, e.g. marked done.
+        """
+        self._queue.put(("set", [row, item]))
+
+    def move(self, row, count, destination):
+        """
+        Record count todos moved from row to before destination (as
+        numbered before the move, as in QAbstractItemModel.moveRows).
+        """
+        self._queue.put(("move", [row, count, destination]))
+
+    def close(self):
+        """
+        Write everything waiting, compact the log and stop the thread.
+        """
+        self._queue.put(None)
+        self._thread.join()
+
+    def write_loop(self):
+        conn = self.connect()
+        (logged,) = conn.execute("SELECT COUNT(*) FROM log").fetchone()
+        n_todos = len(self._todos)
+
+        running = True
+        while running:
+            changes = [self._queue.get()]
+            # Take everything else waiting, to write in one transaction.
+            while True:
+                try:
+                    changes.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if None in changes:
+                running = False
+                changes = [c for c in changes if c is not None]
+
+            with conn:
+                conn.executemany(
+                    "INSERT INTO log (change, data) VALUES (?, ?)",
+                    [(change, json.dumps(data)) for change, data in changes],
+                )
+            logged += len(changes)
+
+            if logged >= max(self.compact_every, n_todos) or not running:
+                n_todos = len(compact(conn))
+                logged = 0
+
+        conn.close()
+
+
+def compact(conn):
+    """
+    Apply the changes in the log to the todos table, and empty the log,
+    in one transaction, returning the todos. Then frees the space the
+    log used, and shrinks SQLite's WAL file.
+    """
+    with conn:
+        todos = [
+            (bool(done), text)
+            for done, text in conn.execute(
+                "SELECT done, text FROM todos ORDER BY row"
+            )
+        ]
+        changes = conn.execute(
+            "SELECT seq, change, data FROM log ORDER BY seq"
+        ).fetchall()
+        for seq, change, data in changes:
+            apply_change(todos, change, json.loads(data))
+
+        if changes:
+            # Positions shift with every insert or remove, so rewrite.
+            conn.execute("DELETE FROM todos")
+            conn.executemany(
+                "INSERT INTO todos (row, done, text) VALUES (?, ?, ?)",
+                [(row, done, text) for row, (done, text) in enumerate(todos)],
+            )
+            conn.execute("DELETE FROM log WHERE seq <= ?", (changes[-1][0],))
+
+    # With execute() this would only free one page.
+    conn.executescript("PRAGMA incremental_vacuum;")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    return todos
@@ -0,0 +1,101 @@
+"""
+Frames per second for a live matplotlib plot, updating the y data of
+its lines and redrawing, with a full draw() (as matplotlib_4.py did)
+against MplCanvas(blit=True).redraw(), on an offscreen 800 x 500
+canvas. Events are processed after every frame, so the canvas is
+painted each time.
+
+Halfway through the y limits are changed, which drops the cached
+background, and at the end the blitted image is checked against a
+full draw of the same data.
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PySide6.QtWidgets import QApplication
+
+import matplotlib  # import matplotlib after PySide6
+
+from mpl import MplCanvas
+
+matplotlib.use("QtAgg")
+
+N_POINTS = 1000
+DURATION = 3.0  # Seconds per run.
+
+
+def signal(x, frame, line):
+    return np.sin(x / 50 + frame / 10 + line) + line
+
+
+def run(blit, n_lines, n_frames=None):
+    """
+    Animate for DURATION, or n_frames, returning the frame count, time
+    taken and final image.
+    """
+    canvas = MplCanvas(width=8, height=5, dpi=100, blit=blit)
+    canvas.show()
+    x = np.arange(N_POINTS)
+    lines = [
+        canvas.add_animated(canvas.axes.plot(x, signal(x, 0, i))[0])
+        for i in range(n_lines)
+    ]
+    canvas.axes.set_title("%d lines" % n_lines)
+    canvas.axes.set_xlabel("Sample")
+    canvas.axes.set_ylabel("Value")
+    canvas.redraw()
+    QApplication.processEvents()
+
+    frames = 0
+    start = time.perf_counter()
+    while True:
+        elapsed = time.perf_counter() - start
+        if n_frames is None and elapsed >= DURATION or frames == n_frames:
+            break
+        frames += 1
+        for i, line in enumerate(lines):
+            line.set_ydata(signal(x, frames, i))
+        if n_frames and frames == n_frames // 2:
+            canvas.axes.set_ylim(-2, n_lines + 1)
+        canvas.redraw()
+        QApplication.processEvents()
+
+    image = np.asarray(canvas.buffer_rgba()).copy()
+    canvas.close()
+    canvas.deleteLater()
+    return frames, elapsed, image
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    print("%d points per line, offscreen 800x500" % N_POINTS)
+    for n_lines in (1, 4):
+        results = {}
+        for blit in (False, True):
+            frames, elapsed, _ = run(blit, n_lines)
+            results[blit] = frames / elapsed
+            print(
+                "%d line(s)  %-10s %7.1f fps  (%5.1f ms per frame)"
+                % (
+                    n_lines,
+                    "blit" if blit else "full draw",
+                    frames / elapsed,
+                    elapsed / frames * 1000,
+                )
+            )
+        print(
+            "%d line(s)  speedup    %7.1fx"
+            % (n_lines, results[True] / results[False])
+        )
+
+        # Same frames both ways, including the change of limits.
+        _, _, full = run(False, n_lines, n_frames=20)
+        _, _, blitted = run(True, n_lines, n_frames=20)
+        print(
+            "%d line(s)  blitted image matches full draw: %s"
+            % (n_lines, np.array_equal(full, blitted))
+        )
@@ -0,0 +1,141 @@
+"""
+Zooming into a 10,000,000 sample series, from all of it down to 1,000
+samples, on an offscreen 1000 x 600 plot. Each step sets the visible
+range, updates the line and draws the plot (grab() for pyqtgraph,
+draw() for matplotlib). Timed per step:
+
+  full        all the samples given to the line once; pyqtgraph and
+              matplotlib clip and simplify them on every draw.
+  pg-builtin  pyqtgraph's own setClipToView + peak auto-downsampling,
+              which rescans the visible samples on every change.
+  pyramid     PlotDecimator / AxesDecimator over a Pyramid, built once.
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PySide6.QtWidgets import QApplication
+
+import pyqtgraph as pg  # import PyQtGraph after PySide6
+import matplotlib  # import matplotlib after PySide6
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
+
+from decimate import AxesDecimator, PlotDecimator, Pyramid
+
+N_SAMPLES = 10_000_000
+WIDTH, HEIGHT = 1000, 600
+STEPS = 12
+
+matplotlib.use("QtAgg")
+
+
+def zoom_ranges(x):
+    """
+    Ranges centred on the middle, each a quarter narrower (ish) than the
+    one before, from the whole series to 1000 samples.
+    """
+    mid = (x[0] + x[-1]) / 2
+    widths = np.geomspace(x[-1] - x[0], x[1000] - x[0], STEPS)
+    return [(mid - w / 2, mid + w / 2) for w in widths]
+
+
+def time_steps(ranges, step):
+    times = []
+    for x0, x1 in ranges:
+        start = time.perf_counter()
+        step(x0, x1)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def pyqtgraph_plot():
+    widget = pg.PlotWidget()
+    widget.resize(WIDTH, HEIGHT)
+    widget.show()
+    QApplication.processEvents()
+    return widget
+
+
+def bench_pyqtgraph(x, y, ranges, method):
+    widget = pyqtgraph_plot()
+    viewbox = widget.getPlotItem().getViewBox()
+
+    start = time.perf_counter()
+    if method == "pyramid":
+        curve = widget.plot()
+        PlotDecimator(widget, curve, Pyramid(x, y))
+    else:
+        if method == "pg-builtin":
+            widget.setClipToView(True)
+            widget.setDownsampling(auto=True, mode="peak")
+        curve = widget.plot(x, y)
+        viewbox.enableAutoRange(x=False)
+    widget.grab()
+    setup = time.perf_counter() - start
+
+    def step(x0, x1):
+        viewbox.setXRange(x0, x1, padding=0)
+        widget.grab()
+
+    times = time_steps(ranges, step)
+    widget.close()
+    widget.deleteLater()
+    return setup, times
+
+
+def bench_matplotlib(x, y, ranges, method):
+    fig = Figure(figsize=(WIDTH / 100, HEIGHT / 100), dpi=100)
+    canvas = FigureCanvasQTAgg(fig)
+    axes = fig.add_subplot(111)
+
+    start = time.perf_counter()
+    if method == "pyramid":
+        (line,) = axes.plot([], [])
+        AxesDecimator(axes, line, Pyramid(x, y))
+    else:
+        axes.plot(x, y)
+    canvas.draw()
+    setup = time.perf_counter() - start
+
+    def step(x0, x1):
+        axes.set_xlim(x0, x1)
+        canvas.draw()
+
+    return setup, time_steps(ranges, step)
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    x = np.arange(N_SAMPLES) / 1000
+    y = np.cumsum(np.random.default_rng(0).standard_normal(N_SAMPLES))
+    ranges = zoom_ranges(x)
+
+    print(
+        "%d samples, %d zoom steps, %dx%d"
+        % (N_SAMPLES, STEPS, WIDTH, HEIGHT)
+    )
+    print(
+        "%-23s %9s %9s %9s %9s"
+        % ("", "setup", "mean step", "max step", "first")
+    )
+    for library, bench, methods in [
+        ("pyqtgraph", bench_pyqtgraph, ["full", "pg-builtin", "pyramid"]),
+        ("matplotlib", bench_matplotlib, ["full", "pyramid"]),
+    ]:
+        for method in methods:
+            setup, times = bench(x, y, ranges, method)
+            print(
+                "%-11s %-11s %8.3fs %8.1fms %8.1fms %8.1fms"
+                % (
+                    library,
+                    method,
+                    setup,
+                    np.mean(times) * 1000,
+                    np.max(times) * 1000,
+                    times[0] * 1000,
+                )
+            )
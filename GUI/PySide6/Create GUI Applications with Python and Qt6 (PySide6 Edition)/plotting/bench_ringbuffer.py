@@ -0,0 +1,87 @@
+"""
+Cost of each update of a live plot holding 1,000,000 points, with new
+points arriving at 1 kHz (one per update): the original pyqtgraph_6.py
+approach (slice off the first item of Python lists, append, setData
+with the lists) against a RingBuffer (append, setData with a view).
+
+Both the buffer operations alone and with setData on a PlotDataItem
+are timed (not painting, which costs the same either way). At 1 kHz,
+an update has 1 ms.
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PySide6.QtWidgets import QApplication
+
+import pyqtgraph as pg  # import PyQtGraph after PySide6
+
+from ringbuffer import RingBuffer
+
+N_POINTS = 1_000_000
+RATE = 1000  # Updates (points) per second.
+
+
+def time_updates(update, n):
+    start = time.perf_counter()
+    for i in range(n):
+        update(i)
+    return (time.perf_counter() - start) / n
+
+
+def lists(n_updates, line):
+    x = list(range(N_POINTS))
+    y = [float(v) for v in np.random.random(N_POINTS)]
+    state = {"x": x, "y": y}
+
+    def update(i):
+        state["x"] = state["x"][1:]
+        state["x"].append(state["x"][-1] + 1)
+        state["y"] = state["y"][1:]
+        state["y"].append(i / n_updates)
+        if line is not None:
+            line.setData(state["x"], state["y"])
+
+    return time_updates(update, n_updates)
+
+
+def ring(n_updates, line):
+    data = RingBuffer(N_POINTS, channels=2)
+    data.extend([np.arange(N_POINTS), np.random.random(N_POINTS)])
+
+    def update(i):
+        x = data.view(0)
+        data.append(x[-1] + 1, i / n_updates)
+        if line is not None:
+            line.setData(*data.view())
+
+    return time_updates(update, n_updates)
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    plot = pg.PlotWidget()
+    line = plot.plot()
+
+    print(
+        "%d points, %d Hz updates (%.1f ms per update)"
+        % (N_POINTS, RATE, 1000 / RATE)
+    )
+    for name, fn, n_updates in [
+        ("lists", lists, 20),
+        ("RingBuffer", ring, RATE),
+    ]:
+        for with_plot in (False, True):
+            per_update = fn(n_updates, line if with_plot else None)
+            print(
+                "%-10s %-16s %9.3f ms per update, max %8.1f updates/s"
+                % (
+                    name,
+                    "+ setData" if with_plot else "buffer only",
+                    per_update * 1000,
+                    1 / per_update,
+                )
+            )
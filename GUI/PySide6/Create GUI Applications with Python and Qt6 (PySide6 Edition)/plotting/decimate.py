@@ -0,0 +1,211 @@
+import numpy as np
+
+
+def _arg_bins(values, size, arg):
+    """
+    Index of the min (arg=np.argmin) or max (np.argmax) of each run of
+    `size` values. The last run may be shorter.
+    """
+    n = len(values)
+    full = n // size * size
+    found = arg(values[:full].reshape(-1, size), axis=1)
+    found += np.arange(0, full, size)
+    if full < n:
+        found = np.append(found, full + arg(values[full:]))
+    return found
+
+
+def _interleave(lo, hi):
+    """
+    Indexes of the min and max of each bin, in the order they occur, so
+    the line between them is drawn the way it goes.
+    """
+    return np.column_stack(
+        (np.minimum(lo, hi), np.maximum(lo, hi))
+    ).ravel()
+
+
+def minmax(x, y, n_bins):
+    """
+    Downsample to the min and max of each of n_bins bins of samples
+    (e.g. one per pixel column), keeping every peak: at most 2 * n_bins
+    points, drawn identically to the full data at that width.
+    """
+    size = -(-len(y) // n_bins)  # Round up.
+    if size <= 2:
+        return x, y
+    y = np.asarray(y)
+    idx = _interleave(
+        _arg_bins(y, size, np.argmin), _arg_bins(y, size, np.argmax)
+    )
+    return np.asarray(x)[idx], y[idx]
+
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: downsample to n_out points, picking
+    from each bucket the point making the largest triangle with the
+    point picked before and the mean of the next bucket. Keeps the
+    shape of the line better than min/max at a few points per pixel,
+    but is not exact: use minmax where peaks must not be lost.
+    """
+    x = np.asarray(x, np.float64)
+    y = np.asarray(y, np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    # First and last points are kept, the rest split into buckets.
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    mean_x = np.add.reduceat(x[1:-1], edges[:-1] - 1) / np.diff(edges)
+    mean_y = np.add.reduceat(y[1:-1], edges[:-1] - 1) / np.diff(edges)
+    mean_x = np.append(mean_x[1:], x[-1])
+    mean_y = np.append(mean_y[1:], y[-1])
+
+    idx = np.empty(n_out, np.intp)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Twice the triangle areas, for each point in the bucket.
+        area = np.abs(
+            (x[a] - mean_x[i]) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (mean_y[i] - y[a])
+        )
+        a = start + area.argmax()
+        idx[i + 1] = a
+    return x[idx], y[idx]
+
+
+class Pyramid:
+    """
+    Multi-resolution min/max summary of a long series, for drawing
+    only what can be seen. Level 1 holds the index of the min and max
+    of each `factor` samples, level 2 of each factor ** 2, and so on
+    down to a few bins, each built from the one before in a single
+    pass. Together they take about 2 / (factor - 1) indexes per sample.
+
+    get() picks the coarsest level that still has at least one bin per
+    pixel over the visible range, and returns just those bins: so the
+    cost of a zoom or pan depends on the width of the plot, not the
+    number of samples. x must be sorted (e.g. time).
+    """
+
+    def __init__(self, x, y, factor=4, min_bins=256):
+        self.x = np.asarray(x)
+        self.y = np.asarray(y)
+        self.factor = factor
+
+        # levels[k] is (lo, hi) for bins of factor ** (k + 1) samples.
+        self.levels = []
+        lo = hi = None
+        size = factor
+        while len(self.y) // size >= min_bins:
+            if lo is None:
+                lo = _arg_bins(self.y, factor, np.argmin)
+                hi = _arg_bins(self.y, factor, np.argmax)
+            else:
+                lo = lo[_arg_bins(self.y[lo], factor, np.argmin)]
+                hi = hi[_arg_bins(self.y[hi], factor, np.argmax)]
+            self.levels.append((lo, hi))
+            size *= factor
+
+    def __len__(self):
+        return len(self.y)
+
+    def nbytes(self):
+        return sum(lo.nbytes + hi.nbytes for lo, hi in self.levels)
+
+    def get(self, x0=None, x1=None, pixels=1000):
+        """
+        Points to draw x0 to x1 (default all of it) at a width of
+        `pixels`: the raw samples if there are few enough, otherwise
+        the min/max of between 1 and `factor` bins per pixel. One point
+        either side of the range is included, for the lines leaving it.
+        """
+        x = self.x
+        start = 0
+        end = len(x)
+        if x0 is not None:
+            start = max(np.searchsorted(x, x0, "left") - 1, 0)
+        if x1 is not None:
+            end = min(np.searchsorted(x, x1, "right") + 1, len(x))
+        count = end - start
+        if count <= 0:
+            return x[:0], self.y[:0]
+
+        level = -1
+        size = 1
+        while (
+            level + 1 < len(self.levels)
+            and count // (size * self.factor) >= pixels
+        ):
+            level += 1
+            size *= self.factor
+        if level < 0:
+            return x[start:end], self.y[start:end]
+
+        lo, hi = self.levels[level]
+        first = start // size
+        last = -(-end // size)  # Round up.
+        idx = _interleave(lo[first:last], hi[first:last])
+        return x[idx], self.y[idx]
+
+
+class PlotDecimator:
+    """
+    Keeps a pyqtgraph curve showing a Pyramid at the resolution of the
+    view, recomputing whenever it's zoomed, panned or resized.
+
+        curve = plot_widget.plot(pen=pen)
+        PlotDecimator(plot_widget, curve, Pyramid(x, y))
+
+    X auto-range is turned off (the data set on the curve is only the
+    visible part) and the view starts showing the whole series.
+    """
+
+    def __init__(self, plot_widget, curve, pyramid):
+        self.curve = curve
+        self.pyramid = pyramid
+        self.viewbox = plot_widget.getPlotItem().getViewBox()
+        self.viewbox.enableAutoRange(x=False)
+        self.viewbox.setXRange(
+            pyramid.x[0], pyramid.x[-1], padding=0.02
+        )
+        self.viewbox.sigXRangeChanged.connect(self.update)
+        self.viewbox.sigResized.connect(self.update)
+        self.update()
+
+    def update(self, *args):
+        x0, x1 = self.viewbox.viewRange()[0]
+        pixels = max(int(self.viewbox.width()), 1)
+        self.curve.setData(*self.pyramid.get(x0, x1, pixels))
+
+
+class AxesDecimator:
+    """
+    The same for a matplotlib Line2D, on its axes' xlim_changed (sent
+    on zoom and pan, e.g. from the NavigationToolbar) and the canvas
+    resize_event.
+
+        (line,) = canvas.axes.plot([], [], "r")
+        AxesDecimator(canvas.axes, line, Pyramid(x, y))
+    """
+
+    def __init__(self, axes, line, pyramid):
+        self.axes = axes
+        self.line = line
+        self.pyramid = pyramid
+        line.set_data(*pyramid.get(pixels=self.pixels()))
+        axes.relim()
+        axes.autoscale_view()
+        axes.callbacks.connect("xlim_changed", self.update)
+        axes.figure.canvas.mpl_connect("resize_event", self.update)
+
+    def pixels(self):
+        return max(int(self.axes.bbox.width), 1)
+
+    def update(self, *args):
+        x0, x1 = self.axes.get_xlim()
+        self.line.set_data(*self.pyramid.get(x0, x1, self.pixels()))
+        self.axes.figure.canvas.draw_idle()
@@ -5,25 +5,22 @@ from PySide6.QtWidgets import QMainWindow, QApplication
 from PySide6.QtCore import QTimer
 
 import matplotlib # import matplotlib after PySide6
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
-from matplotlib.figure import Figure
 
-
-matplotlib.use("QtAgg")
+from mpl import MplCanvas
 
 
-class MplCanvas(FigureCanvasQTAgg):
-    def __init__(self, parent=None, width=5, height=4, dpi=100):
-        fig = Figure(figsize=(width, height), dpi=dpi)
-        self.axes = fig.add_subplot(111)
-        super().__init__(fig)
+matplotlib.use("QtAgg")
 
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
 
-        self.canvas = MplCanvas(self, width=5, height=4, dpi=100)
+        # With blit=True only the line is redrawn on each update, over
+        # a saved image of the axes, ticks and labels.
+        self.canvas = MplCanvas(
+            self, width=5, height=4, dpi=100, blit=True
+        )
         self.setCentralWidget(self.canvas)
 
         n_data = 50
@@ -53,13 +50,13 @@ class MainWindow(QMainWindow):
             plot_refs = self.canvas.axes.plot(
                 self.xdata, self.ydata, "r"
             )
-            self._plot_ref = plot_refs[0]
+            self._plot_ref = self.canvas.add_animated(plot_refs[0])
         else:
             # We have a reference, we can use it to update the data for that line.
             self._plot_ref.set_ydata(self.ydata)
 
-        # Trigger the canvas to update and redraw.
-        self.canvas.draw()
+        # Trigger the canvas to update and redraw the line.
+        self.canvas.redraw()
 
 
 
@@ -0,0 +1,58 @@
+import sys
+
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QApplication, QMainWindow # import PySide6 before matplotlib
+
+import matplotlib # import matplotlib after PySide6
+import numpy as np
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+from matplotlib.backends.backend_qtagg import (
+    NavigationToolbar2QT as NavigationToolbar,
+)
+from matplotlib.figure import Figure
+
+from decimate import AxesDecimator, Pyramid
+
+
+matplotlib.use("QtAgg")
+
+
+class MplCanvas(FigureCanvasQTAgg):
+    def __init__(self, parent=None, width=5, height=4, dpi=100):
+        fig = Figure(figsize=(width, height), dpi=dpi)
+        self.axes = fig.add_subplot(111)
+        super().__init__(fig)
+
+
+class MainWindow(QMainWindow):
+    def __init__(self):
+        super().__init__()
+
+        sc = MplCanvas(self, width=5, height=4, dpi=100)
+
+        # 10 million samples, far more than can be drawn at once.
+        n_samples = 10_000_000
+        time = np.arange(n_samples) / 1000  # 1 kHz, in seconds.
+        signal = np.cumsum(np.random.standard_normal(n_samples))
+
+        # Plot an empty line, and let the decimator fill in the
+        # min/max of each pixel column of the visible range. Zoom
+        # and pan with the toolbar to recalculate it.
+        (line,) = sc.axes.plot([], [], "r")
+        sc.axes.set_xlabel("Time (s)")
+        self.decimator = AxesDecimator(sc.axes, line, Pyramid(time, signal))
+
+        toolbar = NavigationToolbar(sc, self)
+
+        layout = QVBoxLayout()
+        layout.addWidget(toolbar)
+        layout.addWidget(sc)
+
+        widget = QWidget()
+        widget.setLayout(layout)
+        self.setCentralWidget(widget)
+
+
+app = QApplication(sys.argv)
+window = MainWindow()
+window.show()
+app.exec()
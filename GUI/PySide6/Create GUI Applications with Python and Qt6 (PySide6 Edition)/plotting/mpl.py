@@ -0,0 +1,77 @@
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
+
+
+class MplCanvas(FigureCanvasQTAgg):
+    """
+    Matplotlib figure canvas, with a single set of axes as self.axes.
+
+    With blit=True, artists registered with add_animated() (e.g. lines
+    updated by a timer) are left out of the normal draw, and redraw()
+    paints only them over a cached copy of everything else (axes,
+    ticks, labels), instead of rendering the whole figure. The cache
+    is refreshed by the next full draw, which happens automatically
+    when the canvas is resized or the axis limits change.
+
+    Without blit, redraw() is a full draw(), so the same code works
+    either way.
+    """
+
+    def __init__(self, parent=None, width=5, height=4, dpi=100, blit=False):
+        fig = Figure(figsize=(width, height), dpi=dpi)
+        self.axes = fig.add_subplot(111)
+        super().__init__(fig)
+
+        self.use_blit = blit
+        self.animated = []
+        self._background = None
+        self._watched_axes = []
+        if blit:
+            self.mpl_connect("draw_event", self._on_draw)
+            self.mpl_connect("resize_event", self.invalidate)
+            self._watch(self.axes)
+
+    def add_animated(self, artist):
+        """
+        Register an artist to be updated by redraw(), returning it.
+        """
+        self.animated.append(artist)
+        if self.use_blit:
+            artist.set_animated(True)
+            self._watch(artist.axes)
+            self.invalidate()
+        return artist
+
+    def _watch(self, axes):
+        if axes is None or axes in self._watched_axes:
+            return
+        self._watched_axes.append(axes)
+        axes.callbacks.connect("xlim_changed", self.invalidate)
+        axes.callbacks.connect("ylim_changed", self.invalidate)
+
+    def invalidate(self, *args):
+        """
+        Drop the cached background; the next redraw() is a full draw.
+        """
+        self._background = None
+
+    def _on_draw(self, event):
+        # After every full draw, cache it without the animated artists,
+        # then draw them on top.
+        self._background = self.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for artist in self.animated:
+            self.figure.draw_artist(artist)
+
+    def redraw(self):
+        """
+        Show the current state of the animated artists.
+        """
+        if not self.use_blit or self._background is None:
+            self.draw()
+            return
+        self.restore_region(self._background)
+        self._draw_animated()
+        self.blit(self.figure.bbox)
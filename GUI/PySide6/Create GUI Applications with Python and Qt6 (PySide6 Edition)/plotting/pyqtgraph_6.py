@@ -5,6 +5,8 @@ from PySide6.QtWidgets import QMainWindow, QApplication
 from PySide6.QtCore import QTimer
 import pyqtgraph as pg  # import PyQtGraph after PySide6
 
+from ringbuffer import RingBuffer
+
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -13,17 +15,18 @@ class MainWindow(QMainWindow):
         self.graphWidget = pg.PlotWidget()
         self.setCentralWidget(self.graphWidget)
 
-        self.x = list(range(100))  # 100 time points
-        self.y = [
-            randint(0, 100) for _ in range(100)
-        ]  # 100 data points
+        # Window of the last 100 time points (channel 0) and data
+        # points (channel 1). Old values drop out as new ones arrive.
+        self.data = RingBuffer(100, channels=2)
+        self.data.extend(
+            [range(100), [randint(0, 100) for _ in range(100)]]
+        )
 
         self.graphWidget.setBackground("w")
 
         pen = pg.mkPen(color=(255, 0, 0))
-        self.data_line = self.graphWidget.plot(
-            self.x, self.y, pen=pen
-        )  # <1>
+        x, y = self.data.view()
+        self.data_line = self.graphWidget.plot(x, y, pen=pen)  # <1>
 
         self.timer = QTimer()
         self.timer.setInterval(50)
@@ -31,16 +34,13 @@ class MainWindow(QMainWindow):
         self.timer.start()
 
     def update_plot_data(self):
+        x = self.data.view(0)
+        # Add a time value 1 higher than the last, and a new random
+        # value. The oldest of each is dropped, without copying.
+        self.data.append(x[-1] + 1, randint(0, 100))
 
-        self.x = self.x[1:]  # Remove the first y element.
-        self.x.append(
-            self.x[-1] + 1
-        )  # Add a new value 1 higher than the last.
-
-        self.y = self.y[1:]  # Remove the first
-        self.y.append(randint(0, 100))  # Add a new random value.
-
-        self.data_line.setData(self.x, self.y)  # Update the data.
+        x, y = self.data.view()
+        self.data_line.setData(x, y)  # Update the data.
 
 
 app = QApplication(sys.argv)
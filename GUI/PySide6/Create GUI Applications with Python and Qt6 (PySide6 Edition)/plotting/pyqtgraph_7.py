@@ -0,0 +1,37 @@
+import sys
+
+import numpy as np
+from PySide6.QtWidgets import QMainWindow, QApplication
+import pyqtgraph as pg  # import PyQtGraph after PySide6
+
+from decimate import PlotDecimator, Pyramid
+
+
+class MainWindow(QMainWindow):
+    def __init__(self):
+        super().__init__()
+
+        self.graphWidget = pg.PlotWidget()
+        self.setCentralWidget(self.graphWidget)
+
+        # 10 million samples, far more than can be drawn at once.
+        n_samples = 10_000_000
+        time = np.arange(n_samples) / 1000  # 1 kHz, in seconds.
+        signal = np.cumsum(np.random.standard_normal(n_samples))
+
+        self.graphWidget.setBackground("w")
+        self.graphWidget.setLabel("bottom", "Time (s)")
+
+        pen = pg.mkPen(color=(255, 0, 0))
+        self.data_line = self.graphWidget.plot(pen=pen)
+        # Only the min/max of each pixel column of the visible range
+        # is sent to the line, recalculated as you zoom and pan.
+        self.decimator = PlotDecimator(
+            self.graphWidget, self.data_line, Pyramid(time, signal)
+        )
+
+
+app = QApplication(sys.argv)
+window = MainWindow()
+window.show()
+app.exec()
@@ -0,0 +1,88 @@
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Fixed-length window onto a stream of samples, for live plots. Holds
+    the last `length` samples of one or more channels (e.g. time, and
+    the values of each line) in a NumPy array.
+
+    Every sample is stored twice, at i and i + length, in an array of
+    twice the length. Appending writes both, in O(1), and the window is
+    then always one contiguous slice: view() returns it as a view onto
+    the buffer, with no copying or reallocation, ready for setData.
+
+    A view is only valid until the next append, which writes over its
+    oldest sample, so pass it to setData straight away.
+    """
+
+    def __init__(self, length, channels=1, dtype=np.float64):
+        self.channels = channels
+        self.dtype = np.dtype(dtype)
+        self._allocate(length)
+
+    def _allocate(self, length):
+        self.length = length
+        self._data = np.zeros((self.channels, 2 * length), self.dtype)
+        self._pos = 0  # Where the next sample goes.
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, *values):
+        """
+        Add one sample, with a value for each channel.
+        """
+        pos = self._pos
+        self._data[:, pos] = values
+        self._data[:, pos + self.length] = values
+        self._pos = (pos + 1) % self.length
+        if self._count < self.length:
+            self._count += 1
+
+    def extend(self, values):
+        """
+        Add a block of samples, as an array of shape (channels, n) (or
+        (n,) for a single channel).
+        """
+        values = np.asarray(values, self.dtype).reshape(self.channels, -1)
+        length = self.length
+        n = values.shape[1]
+        if n > length:
+            values = values[:, -length:]
+            n = length
+
+        # Up to the end of the buffer, then the rest from the start.
+        data = self._data
+        pos = self._pos
+        first = min(n, length - pos)
+        for offset in (0, length):
+            data[:, offset + pos : offset + pos + first] = values[:, :first]
+            data[:, offset : offset + n - first] = values[:, first:]
+
+        self._pos = (pos + n) % length
+        self._count = min(self._count + n, length)
+
+    def view(self, channel=None):
+        """
+        The samples in the window, oldest first, for all channels (as an
+        array of shape (channels, len)) or the given channel.
+        """
+        end = self._pos + self.length
+        start = end - self._count
+        if channel is None:
+            return self._data[:, start:end]
+        return self._data[channel, start:end]
+
+    def resize(self, length):
+        """
+        Change the window length, keeping the most recent samples.
+        """
+        values = self.view().copy()
+        self._allocate(length)
+        self.extend(values)
+
+    def clear(self):
+        self._pos = 0
+        self._count = 0